@@ -1,32 +1,53 @@
+import json
+import os
+
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
 
-# Page config
-st.set_page_config(page_title="Premier League Dashboard", page_icon="⚽", layout="wide")
+from premstats import instrument
+from premstats.aggregates import aggregate_cube
+from premstats.charts import bar_chart, comparison_chart, minutes_distribution_chart, radar_chart, top_five_chart, xg_chart
+from premstats.fetch import COMPETITIONS, FetchJob
+from premstats.filters import filter_index
+from premstats.instrument import span
+from premstats.leaderboards import leaderboards
+from premstats.loader import DEFAULT_PATH
+from premstats.metrics import comparison_table
+from premstats.percentiles import LABELS, percentile_ranks
+from premstats.partitions import DEFAULT_LEAGUE, catalog, league_label, load_partition, load_partitions, season_label
+from premstats.search import search_index
+from premstats.similarity import similarity_index
 
-df = pd.read_csv("premier_league_stats.csv")
+# Longest shortlist the Compare Players tab accepts
+MAX_COMPARE = 20
 
-# Calculate advanced statistics (per 90 minutes)
-df["Goals_per_90"] = (df["Goals"] / df["Minutes"] * 90).round(2)
-df["Assists_per_90"] = (df["Assists"] / df["Minutes"] * 90).round(2)
-df["G+A_per_90"] = ((df["Goals"] + df["Assists"]) / df["Minutes"] * 90).round(2)
+# Widget keys inside the tabs, with their initial value (None: chosen by the
+# widget from its options)
+VIEW_STATE = {
+    "search": "",
+    "player": None,
+    "rank_metric": None,
+    "rank_min_minutes": 0,
+    "rank_n": 10,
+    "compare_search": "",
+    "compare_players": None,
+    "similar_to": None,
+    "similar_min_minutes": 450,
+    "similar_n": 10,
+    "similar_same_position": True,
+    "compare_seasons": None,
+    "compare_teams": None,
+}
 
-# Calculate efficiency metrics
-df["Minutes_per_Goal"] = (df["Minutes"] / df["Goals"]).replace([np.inf, -np.inf], 0).round(0)
-df["Minutes_per_Contribution"] = (df["Minutes"] / (df["Goals"] + df["Assists"])).replace([np.inf, -np.inf], 0).round(0)
+# Page config
+st.set_page_config(page_title="Premier League Dashboard", page_icon="⚽", layout="wide")
 
-# Replace NaN and inf values with 0
-df = df.fillna(0)
+# Timing spans and cache counters for this rerun
+trace = instrument.start_trace("rerun")
 
-# Header
-st.markdown("# ⚽ Premier League Dashboard")
-st.markdown("### 2024-25 Season Player Statistics")
-st.markdown("---")
-
-# Create tabs for different views
-tab1, tab2, tab3 = st.tabs(["📊 Player Stats", "🏆 Leaderboards", "⚖️ Compare Players"])
+# Performance panel for operators: ?admin=1 or PREMSTATS_ADMIN=1
+show_admin = st.query_params.get("admin") == "1" or os.environ.get("PREMSTATS_ADMIN") == "1"
 
 # Sidebar with better styling
 with st.sidebar:
@@ -37,431 +58,621 @@ with st.sidebar:
         </div>
     """, unsafe_allow_html=True)
     
+    # League / season partitions listed in the manifest; nothing is parsed yet
+    available = catalog()
+    if not available:
+        st.error("No player data found. Run `python scrape_fbref.py` first.")
+        st.stop()
+    
+    st.markdown("## 🗂️ Dataset")
+    leagues = sorted({league for league, _ in available})
+    selected_league = st.selectbox("🌍 League", leagues, format_func=league_label,
+                                   index=leagues.index(DEFAULT_LEAGUE) if DEFAULT_LEAGUE in leagues else 0)
+    
+    # Most recent season first
+    seasons = sorted((season for league, season in available if league == selected_league), reverse=True)
+    selected_season = st.selectbox("📅 Season", seasons, format_func=season_label)
+    
+    st.markdown("---")
+
+# Only the selected partition is parsed, once per process; each rerun gets a cheap read-only view
+with span("load"):
+    dataset = load_partition(selected_league, selected_season)
+    df = dataset.view()
+
+with span("indexes"):
+    # Player-name search index shared by every search box
+    player_search = search_index(dataset)
+    
+    # Team / position row sets shared by every session; filtering never copies the frame
+    engine = filter_index(dataset)
+    
+    # Team x position totals behind the sidebar summary and team comparison
+    cube = aggregate_cube(dataset)
+
+# Header
+st.markdown(f"# ⚽ {league_label(selected_league)} Dashboard")
+st.markdown(f"### {season_label(selected_season)} Season Player Statistics")
+st.markdown("---")
+
+# Only the open tab runs: its body is skipped entirely otherwise, so a rerun
+# costs what the current view needs. Streamlit forgets the value of a widget
+# that was not rendered, so each tab's selections are written back here to
+# survive a visit to another tab
+for key, default in VIEW_STATE.items():
+    if key in st.session_state or default is not None:
+        st.session_state[key] = st.session_state.get(key, default)
+
+# Create tabs for different views
+tab1, tab2, tab3, tab4 = st.tabs(["📊 Player Stats", "🏆 Leaderboards", "⚖️ Compare Players", "🏟️ Compare Teams"],
+                                 key="view", on_change="rerun")
+
+# Sidebar filters within the selected dataset
+with st.sidebar:
     st.markdown("## 🎯 Filters")
     st.markdown("")
     
     # Team filter
-    teams = ["All Teams"] + sorted(df["Team"].unique().tolist())
+    teams = ["All Teams"] + engine.teams
     selected_team = st.selectbox("⚽ Team", teams)
     
-    # Position filter with specific order
-    position_order = ["GK", "DF", "MF", "FW"]
-    available_positions = [pos for pos in position_order if pos in df["Position"].unique()]
-    positions = ["All Positions"] + available_positions
+    # Position filter in GK, DF, MF, FW order
+    positions = ["All Positions"] + engine.positions
     selected_position = st.selectbox("📍 Position", positions)
     
     st.markdown("---")
     
-    # Filter dataframe by team and position
-    filtered_df = df.copy()
-    
-    if selected_team != "All Teams":
-        filtered_df = filtered_df[filtered_df["Team"] == selected_team]
-    
-    if selected_position != "All Positions":
-        filtered_df = filtered_df[filtered_df["Position"] == selected_position]
+    # Resolve the filters to row positions; positions match primary and
+    # secondary roles (e.g. a FW,MF winger under MF)
+    team_filter = None if selected_team == "All Teams" else selected_team
+    position_filter = None if selected_position == "All Positions" else selected_position
+    with span("filter"):
+        filtered_rows = engine.rows(team=team_filter, position=position_filter)
+        summary = cube.summary(team_filter, position_filter)
     
     # Show filtered stats summary with better formatting
     st.markdown("### 📈 Summary")
     
     col1, col2 = st.columns(2)
     with col1:
-        st.metric("Players", len(filtered_df))
+        st.metric("Players", summary["players"])
     with col2:
-        st.metric("Teams", filtered_df["Team"].nunique())
+        st.metric("Teams", summary["teams"])
     
-    if len(filtered_df) > 0:
+    if summary["players"] > 0:
         col1, col2 = st.columns(2)
         with col1:
-            st.metric("Goals", int(filtered_df["Goals"].sum()))
+            st.metric("Goals", summary["goals"])
         with col2:
-            st.metric("Assists", int(filtered_df["Assists"].sum()))
+            st.metric("Assists", summary["assists"])
     
     st.markdown("---")
     
-    # Data Attribution
+    # Data Attribution: the FBref page of the selected league season; only
+    # the bundled single-file CSV came through Kaggle
+    if selected_league in COMPETITIONS:
+        source = f"[FBref]({FetchJob(selected_league, selected_season, 'stats').url})"
+    else:
+        source = "[FBref](https://fbref.com/)"
+    if dataset.path == os.path.abspath(DEFAULT_PATH):
+        source += " via [Kaggle](https://www.kaggle.com/datasets/siddhrajthakor/fbref-premier-league-202425-player-stats-dataset)"
     st.markdown("### 📊 Data Source")
-    st.markdown("""
-        **Season:** 2024-25  
-        **Source:** [FBref](https://fbref.com/) via [Kaggle](https://www.kaggle.com/datasets/siddhrajthakor/fbref-premier-league-202425-player-stats-dataset)
+    st.markdown(f"""
+        **League:** {league_label(selected_league)}  
+        **Season:** {season_label(selected_season)}  
+        **Source:** {source}
         
         Stats provided by FBref.com and Opta. Advanced metrics include Expected Goals (xG), Expected Assists (xAG), and Progressive actions.
     """)
-
-# TAB 1: PLAYER STATS
-with tab1:
-    # Search bar with better styling
-    col1, col2 = st.columns([3, 1])
-    with col1:
-        search_term = st.text_input("🔍 Search for a player", "", placeholder="e.g., Haaland, Salah, De Bruyne...").strip()
     
-    # Filter players based on search term
-    if search_term:
-        search_filtered_df = filtered_df[filtered_df["Player"].str.contains(search_term, case=False, na=False)]
-        if len(search_filtered_df) == 0:
-            st.error(f"❌ No players found matching '{search_term}'")
-            st.stop()
-    else:
-        search_filtered_df = filtered_df
-    
-    with col2:
-        st.metric("📋 Results", len(search_filtered_df))
-    
-    st.markdown("")
-    
-    # Player selection
-    player = st.selectbox("Select a player to view detailed stats", search_filtered_df["Player"].unique(), label_visibility="collapsed")
-    player_data = search_filtered_df[search_filtered_df["Player"] == player].iloc[0]
+    # Filled in once the rest of the script has run
+    admin_panel = st.empty() if show_admin else None
 
-    st.markdown("")
-    
-    # Player Card Header
-    st.markdown(f"# {player}")
-    
-    # Player info in a clean card-style layout
-    info_col1, info_col2, info_col3, info_col4 = st.columns(4)
-    with info_col1:
-        st.markdown(f"**🎽 Position**")
-        st.markdown(f"### {player_data['Position']}")
-    with info_col2:
-        st.markdown(f"**⚽ Team**")
-        st.markdown(f"### {player_data['Team']}")
-    with info_col3:
-        st.markdown(f"**🌍 Nation**")
-        st.markdown(f"### {player_data['Nationality']}")
-    with info_col4:
-        st.markdown(f"**📅 Age**")
-        st.markdown(f"### {int(player_data['Age'])}")
-    
-    st.markdown("---")
-    
-    # Key metrics row
-    metric_col1, metric_col2, metric_col3, metric_col4 = st.columns(4)
-    with metric_col1:
-        st.metric("🏃 Appearances", int(player_data["Appearances"]))
-    with metric_col2:
-        st.metric("⏱️ Minutes", int(player_data["Minutes"]))
-    with metric_col3:
-        if player_data["Appearances"] > 0:
-            avg_mins = int(player_data["Minutes"] / player_data["Appearances"])
-            st.metric("📊 Mins/Game", avg_mins)
-        else:
-            st.metric("📊 Mins/Game", "N/A")
-    with metric_col4:
-        if player_data["Position"] != "GK":
-            st.metric("🎯 G+A", int(player_data["Goals"] + player_data["Assists"]))
-        else:
-            if 'Clean_Sheets' in player_data.index and player_data["Clean_Sheets"] > 0:
-                st.metric("🧤 Clean Sheets", int(player_data["Clean_Sheets"]))
-            else:
-                st.metric("🧤 Clean Sheets", "N/A")
-    
-    st.markdown("")
-    
-    # Check if player is a goalkeeper
-    is_goalkeeper = player_data["Position"] == "GK"
-    
-    if is_goalkeeper:
-        # GOALKEEPER LAYOUT
-        has_gk_stats = 'Clean_Sheets' in player_data.index and pd.notna(player_data["Clean_Sheets"])
+# TAB 1: PLAYER STATS
+if tab1.open:
+    with tab1, span("tab.player_stats"):
+        # Built on first use, once per dataset version
+        percentiles = percentile_ranks(dataset)
         
-        if has_gk_stats:
-            # Two column layout for GK
-            left_col, right_col = st.columns([1, 1])
-            
-            with left_col:
-                st.markdown("### 🧤 Goalkeeper Performance")
-                
-                perf_col1, perf_col2 = st.columns(2)
-                with perf_col1:
-                    st.metric("Clean Sheets", int(player_data["Clean_Sheets"]))
-                    clean_sheet_pct = (player_data["Clean_Sheets"] / player_data["Appearances"] * 100) if player_data["Appearances"] > 0 else 0
-                    st.metric("Clean Sheet %", f"{clean_sheet_pct:.1f}%")
-                with perf_col2:
-                    st.metric("Goals Conceded", int(player_data["Goals_Against"]))
-                    goals_per_game = player_data["Goals_Against"] / player_data["Appearances"] if player_data["Appearances"] > 0 else 0
-                    st.metric("Conceded/Game", f"{goals_per_game:.2f}")
-                
-                st.markdown("")
-                
-                if 'Save_Percentage' in player_data.index and player_data["Save_Percentage"] > 0:
-                    st.metric("💪 Save Percentage", f"{player_data['Save_Percentage']:.1f}%")
-            
-            with right_col:
-                st.markdown("### 📊 Performance Chart")
-                fig, ax = plt.subplots(figsize=(6, 4))
-                ax.bar(["Clean Sheets", "Goals Conceded"], 
-                       [int(player_data["Clean_Sheets"]), int(player_data["Goals_Against"])],
-                       color=['#2ecc71', '#e74c3c'])
-                ax.set_ylabel("Count", fontsize=11)
-                ax.grid(axis='y', alpha=0.3)
-                st.pyplot(fig)
+        # Search bar with better styling
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            search_term = st.text_input("🔍 Search for a player", placeholder="e.g., Haaland, Salah, De Bruyne...", key="search").strip()
+        
+        # Filter players based on search term (accent-insensitive, best match first)
+        if search_term:
+            search_rows = player_search.filter_rows(filtered_rows, search_term)
         else:
-            st.info("⚠️ Detailed goalkeeper stats not available for this player")
-    
-    else:
-        # OUTFIELD PLAYER LAYOUT
-        is_midfielder = player_data["Position"] == "MF"
+            search_rows = filtered_rows
         
-        # Main stats in two columns
-        left_col, right_col = st.columns([1, 1])
+        with col2:
+            st.metric("📋 Results", len(search_rows))
         
-        with left_col:
-            st.markdown("### ⚽ Attacking Stats")
+        # Branch rather than st.stop(), so the trace and admin panel below still run
+        if len(search_rows) == 0:
+            if search_term:
+                st.error(f"❌ No players found matching '{search_term}'")
+            else:
+                st.warning("No players match the current filters")
+        else:
+            st.markdown("")
+            
+            # Player selection
+            player_names, player_first_rows = engine.player_options(search_rows)
+            if st.session_state.get("player") not in player_names:
+                # Remembered player filtered out (or from another dataset): start from the top
+                st.session_state.pop("player", None)
+            player = st.selectbox("Select a player to view detailed stats", player_names, label_visibility="collapsed", key="player")
+            player_row = player_first_rows[player_names.index(player)]
+            player_data = df.iloc[player_row]
+
+            st.markdown("")
+            
+            # Player Card Header
+            st.markdown(f"# {player}")
             
-            stat_col1, stat_col2, stat_col3 = st.columns(3)
-            with stat_col1:
-                st.metric("Goals", int(player_data["Goals"]))
-            with stat_col2:
-                st.metric("Assists", int(player_data["Assists"]))
-            with stat_col3:
-                st.metric("G+A", int(player_data["Goals"] + player_data["Assists"]))
+            # Player info in a clean card-style layout
+            info_col1, info_col2, info_col3, info_col4 = st.columns(4)
+            with info_col1:
+                st.markdown(f"**🎽 Position**")
+                st.markdown(f"### {player_data['Position']}")
+            with info_col2:
+                st.markdown(f"**⚽ Team**")
+                st.markdown(f"### {player_data['Team']}")
+            with info_col3:
+                st.markdown(f"**🌍 Nation**")
+                st.markdown(f"### {player_data['Nationality']}")
+            with info_col4:
+                st.markdown(f"**📅 Age**")
+                st.markdown(f"### {int(player_data['Age'])}")
+            
+            st.markdown("---")
+            
+            # Key metrics row
+            metric_col1, metric_col2, metric_col3, metric_col4 = st.columns(4)
+            with metric_col1:
+                st.metric("🏃 Appearances", int(player_data["Appearances"]))
+            with metric_col2:
+                st.metric("⏱️ Minutes", int(player_data["Minutes"]))
+            with metric_col3:
+                if player_data["Appearances"] > 0:
+                    st.metric("📊 Mins/Game", int(player_data["Minutes_per_Game"]))
+                else:
+                    st.metric("📊 Mins/Game", "N/A")
+            with metric_col4:
+                if player_data["Position"] != "GK":
+                    st.metric("🎯 G+A", int(player_data["Goals"] + player_data["Assists"]))
+                else:
+                    if 'Clean_Sheets' in player_data.index and player_data["Clean_Sheets"] > 0:
+                        st.metric("🧤 Clean Sheets", int(player_data["Clean_Sheets"]))
+                    else:
+                        st.metric("🧤 Clean Sheets", "N/A")
             
             st.markdown("")
             
-            # Per 90 stats
-            st.markdown("**📈 Per 90 Minutes**")
-            per90_col1, per90_col2, per90_col3 = st.columns(3)
-            with per90_col1:
-                st.metric("G/90", f"{player_data['Goals_per_90']:.2f}")
-            with per90_col2:
-                st.metric("A/90", f"{player_data['Assists_per_90']:.2f}")
-            with per90_col3:
-                st.metric("G+A/90", f"{player_data['G+A_per_90']:.2f}")
-        
-        with right_col:
-            st.markdown("### 📊 Performance Chart")
-            fig, ax = plt.subplots(figsize=(6, 4))
-            ax.bar(["Goals", "Assists"], [int(player_data["Goals"]), int(player_data["Assists"])],
-                   color=['#e74c3c', '#3498db'])
-            ax.set_ylabel("Count", fontsize=11)
-            ax.grid(axis='y', alpha=0.3)
-            st.pyplot(fig)
-        
-        st.markdown("")
-        
-        # Midfielder-specific stats in expandable section
-        if is_midfielder and 'xG' in player_data.index and player_data['Progressive_Passes'] > 0:
-            with st.expander("🎯 **Advanced Midfielder Stats**", expanded=False):
-                adv_col1, adv_col2, adv_col3 = st.columns(3)
+            # Check if player is a goalkeeper
+            is_goalkeeper = player_data["Position"] == "GK"
+            
+            if is_goalkeeper:
+                # GOALKEEPER LAYOUT
+                has_gk_stats = 'Clean_Sheets' in player_data.index and pd.notna(player_data["Clean_Sheets"])
                 
-                with adv_col1:
-                    st.markdown("**Expected Stats**")
-                    st.metric("xG", f"{player_data['xG']:.1f}")
-                    st.metric("xAG", f"{player_data['xAG']:.1f}")
+                if has_gk_stats:
+                    # Two column layout for GK
+                    left_col, right_col = st.columns([1, 1])
+                    
+                    with left_col:
+                        st.markdown("### 🧤 Goalkeeper Performance")
+                        
+                        perf_col1, perf_col2 = st.columns(2)
+                        with perf_col1:
+                            st.metric("Clean Sheets", int(player_data["Clean_Sheets"]))
+                            st.metric("Clean Sheet %", f"{player_data['Clean_Sheet_%']:.1f}%")
+                        with perf_col2:
+                            st.metric("Goals Conceded", int(player_data["Goals_Against"]))
+                            st.metric("Conceded/Game", f"{player_data['Goals_Against_per_Game']:.2f}")
+                        
+                        st.markdown("")
+                        
+                        if 'Save_Percentage' in player_data.index and player_data["Save_Percentage"] > 0:
+                            st.metric("💪 Save Percentage", f"{player_data['Save_Percentage']:.1f}%")
+                    
+                    with right_col:
+                        st.markdown("### 📊 Performance Chart")
+                        st.image(bar_chart(player, ["Clean Sheets", "Goals Conceded"],
+                                           [player_data["Clean_Sheets"], player_data["Goals_Against"]],
+                                           ['#2ecc71', '#e74c3c']), use_container_width=True)
+                else:
+                    st.info("⚠️ Detailed goalkeeper stats not available for this player")
+            
+            else:
+                # OUTFIELD PLAYER LAYOUT
+                is_midfielder = player_data["Position"] == "MF"
                 
-                with adv_col2:
-                    st.markdown("**Passing & Carries**")
-                    st.metric("Progressive Passes", int(player_data["Progressive_Passes"]))
-                    st.metric("Progressive Carries", int(player_data["Progressive_Carries"]))
+                # Main stats in two columns
+                left_col, right_col = st.columns([1, 1])
                 
-                with adv_col3:
-                    st.markdown("**Receptions**")
-                    st.metric("Progressive Receptions", int(player_data["Progressive_Receptions"]))
-        
-        # Efficiency metrics in expandable section
-        with st.expander("⚡ **Efficiency Metrics**", expanded=False):
-            eff_col1, eff_col2 = st.columns(2)
-            with eff_col1:
-                mins_per_goal = player_data["Minutes_per_Goal"]
-                if mins_per_goal > 0 and mins_per_goal != np.inf:
-                    st.metric("⏱️ Minutes per Goal", f"{int(mins_per_goal)}")
-                else:
-                    st.metric("⏱️ Minutes per Goal", "N/A")
-            with eff_col2:
-                mins_per_contrib = player_data["Minutes_per_Contribution"]
-                if mins_per_contrib > 0 and mins_per_contrib != np.inf:
-                    st.metric("⏱️ Minutes per Contribution", f"{int(mins_per_contrib)}")
+                with left_col:
+                    st.markdown("### ⚽ Attacking Stats")
+                    
+                    stat_col1, stat_col2, stat_col3 = st.columns(3)
+                    with stat_col1:
+                        st.metric("Goals", int(player_data["Goals"]))
+                    with stat_col2:
+                        st.metric("Assists", int(player_data["Assists"]))
+                    with stat_col3:
+                        st.metric("G+A", int(player_data["Goals"] + player_data["Assists"]))
+                    
+                    st.markdown("")
+                    
+                    # Per 90 stats
+                    st.markdown("**📈 Per 90 Minutes**")
+                    per90_col1, per90_col2, per90_col3 = st.columns(3)
+                    with per90_col1:
+                        st.metric("G/90", f"{player_data['Goals_per_90']:.2f}")
+                    with per90_col2:
+                        st.metric("A/90", f"{player_data['Assists_per_90']:.2f}")
+                    with per90_col3:
+                        st.metric("G+A/90", f"{player_data['G+A_per_90']:.2f}")
+                
+                with right_col:
+                    st.markdown("### 📊 Performance Chart")
+                    st.image(bar_chart(player, ["Goals", "Assists"], [player_data["Goals"], player_data["Assists"]],
+                                       ['#e74c3c', '#3498db']), use_container_width=True)
+                
+                st.markdown("")
+                
+                # Midfielder-specific stats in expandable section
+                if is_midfielder and 'xG' in player_data.index and player_data['Progressive_Passes'] > 0:
+                    with st.expander("🎯 **Advanced Midfielder Stats**", expanded=False):
+                        adv_col1, adv_col2, adv_col3 = st.columns(3)
+                        
+                        with adv_col1:
+                            st.markdown("**Expected Stats**")
+                            st.metric("xG", f"{player_data['xG']:.1f}")
+                            st.metric("xAG", f"{player_data['xAG']:.1f}")
+                        
+                        with adv_col2:
+                            st.markdown("**Passing & Carries**")
+                            st.metric("Progressive Passes", int(player_data["Progressive_Passes"]))
+                            st.metric("Progressive Carries", int(player_data["Progressive_Carries"]))
+                        
+                        with adv_col3:
+                            st.markdown("**Receptions**")
+                            st.metric("Progressive Receptions", int(player_data["Progressive_Receptions"]))
+                
+                # Efficiency metrics in expandable section
+                with st.expander("⚡ **Efficiency Metrics**", expanded=False):
+                    eff_col1, eff_col2 = st.columns(2)
+                    with eff_col1:
+                        mins_per_goal = player_data["Minutes_per_Goal"]
+                        if mins_per_goal > 0:
+                            st.metric("⏱️ Minutes per Goal", f"{int(mins_per_goal)}")
+                        else:
+                            st.metric("⏱️ Minutes per Goal", "N/A")
+                    with eff_col2:
+                        mins_per_contrib = player_data["Minutes_per_Contribution"]
+                        if mins_per_contrib > 0:
+                            st.metric("⏱️ Minutes per Contribution", f"{int(mins_per_contrib)}")
+                        else:
+                            st.metric("⏱️ Minutes per Contribution", "N/A")
+            
+            # Percentile profile against players in the same position
+            radar_metrics = percentiles.radar_metrics(player_data["Position"])
+            player_percentiles = percentiles.player(player_row, radar_metrics) if radar_metrics else None
+            # No radar at all when none of the metrics exist for this player
+            if player_percentiles is not None and player_percentiles.notna().any():
+                st.markdown("---")
+                st.markdown("### 🕸️ Percentile Profile")
+                radar_col, _ = st.columns([1, 1])
+                with radar_col:
+                    st.image(radar_chart([player], [LABELS[m] for m in radar_metrics], [player_percentiles]),
+                             use_container_width=True)
+                    st.caption(f"Percentile rank among all {player_data['Position']} players this season.")
+            
+            # Full stats table
+            st.markdown("---")
+            with st.expander("📋 **Full Statistics Table**", expanded=False):
+                if is_goalkeeper and 'Clean_Sheets' in player_data.index:
+                    display_cols = ['Player', 'Team', 'Position', 'Appearances', 'Minutes', 'Clean_Sheets', 'Goals_Against']
+                    if 'Save_Percentage' in player_data.index:
+                        display_cols.append('Save_Percentage')
                 else:
-                    st.metric("⏱️ Minutes per Contribution", "N/A")
-    
-    # Full stats table
-    st.markdown("---")
-    with st.expander("📋 **Full Statistics Table**", expanded=False):
-        if is_goalkeeper and 'Clean_Sheets' in player_data.index:
-            display_cols = ['Player', 'Team', 'Position', 'Appearances', 'Minutes', 'Clean_Sheets', 'Goals_Against']
-            if 'Save_Percentage' in player_data.index:
-                display_cols.append('Save_Percentage')
-        else:
-            display_cols = ['Player', 'Team', 'Position', 'Goals', 'Assists', 'Appearances', 'Minutes', 
-                            'Goals_per_90', 'Assists_per_90', 'G+A_per_90']
-        
-        # Only show columns that exist in the dataframe
-        available_display_cols = [col for col in display_cols if col in search_filtered_df.columns]
-        st.dataframe(search_filtered_df[search_filtered_df["Player"] == player][available_display_cols], use_container_width=True)
+                    display_cols = ['Player', 'Team', 'Position', 'Goals', 'Assists', 'Appearances', 'Minutes', 
+                                    'Goals_per_90', 'Assists_per_90', 'G+A_per_90']
+                
+                # Only show columns that exist in the dataframe
+                available_display_cols = [col for col in display_cols if col in df.columns]
+                st.dataframe(engine.view(engine.player_rows(search_rows, player), available_display_cols), use_container_width=True)
 
 # TAB 2: LEADERBOARDS
-with tab2:
-    st.header("🏆 Top Performers")
-    
-    # Top Goal Scorers
-    st.subheader("⚽ Top 10 Goal Scorers")
-    top_scorers = df.nlargest(10, 'Goals')[['Player', 'Team', 'Position', 'Goals', 'Appearances']]
-    top_scorers['Goals/Game'] = (top_scorers['Goals'] / top_scorers['Appearances']).round(2)
-    top_scorers.index = range(1, len(top_scorers) + 1)
-    st.dataframe(top_scorers, use_container_width=True)
-    
-    # Top Assist Providers
-    st.subheader("🎯 Top 10 Assist Providers")
-    top_assisters = df.nlargest(10, 'Assists')[['Player', 'Team', 'Position', 'Assists', 'Appearances']]
-    top_assisters['Assists/Game'] = (top_assisters['Assists'] / top_assisters['Appearances']).round(2)
-    top_assisters.index = range(1, len(top_assisters) + 1)
-    st.dataframe(top_assisters, use_container_width=True)
-    
-    # Combined Goals + Assists
-    st.subheader("🌟 Top 10 Goal Contributions (Goals + Assists)")
-    df['Total Contributions'] = df['Goals'] + df['Assists']
-    top_contributors = df.nlargest(10, 'Total Contributions')[['Player', 'Team', 'Position', 'Goals', 'Assists', 'Total Contributions', 'Appearances']]
-    top_contributors['Contributions/Game'] = (top_contributors['Total Contributions'] / top_contributors['Appearances']).round(2)
-    top_contributors.index = range(1, len(top_contributors) + 1)
-    st.dataframe(top_contributors, use_container_width=True)
-    
-    # Per 90 Minutes Leaderboards
-    st.subheader("⚡ Top 10 by Per 90 Minutes (min. 500 minutes)")
-    qualified_df = df[df['Minutes'] >= 500]
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.write("**Goals per 90**")
-        top_goals_per90 = qualified_df.nlargest(10, 'Goals_per_90')[['Player', 'Team', 'Position', 'Goals', 'Minutes', 'Goals_per_90']]
-        top_goals_per90.index = range(1, len(top_goals_per90) + 1)
-        st.dataframe(top_goals_per90, use_container_width=True)
-    
-    with col2:
-        st.write("**G+A per 90**")
-        top_ga_per90 = qualified_df.nlargest(10, 'G+A_per_90')[['Player', 'Team', 'Position', 'Goals', 'Assists', 'G+A_per_90']]
-        top_ga_per90.index = range(1, len(top_ga_per90) + 1)
-        st.dataframe(top_ga_per90, use_container_width=True)
-    
-    # Top Goalkeepers
-    st.subheader("🧤 Top 10 Goalkeepers")
-    goalkeepers_df = df[df['Position'] == 'GK'].copy()
-    
-    if len(goalkeepers_df) > 0 and 'Clean_Sheets' in goalkeepers_df.columns:
-        # Calculate Clean Sheet %
-        goalkeepers_df['Clean_Sheet_%'] = (goalkeepers_df['Clean_Sheets'] / goalkeepers_df['Appearances'] * 100).round(1)
+if tab2.open:
+    with tab2, span("tab.leaderboards"):
+        st.header("🏆 Top Performers")
         
-        # Get top 10 by Clean Sheets
-        top_goalkeepers = goalkeepers_df.nlargest(10, 'Clean_Sheets')[['Player', 'Team', 'Appearances', 'Clean_Sheets', 'Goals_Against', 'Clean_Sheet_%', 'Save_Percentage']]
-        top_goalkeepers.index = range(1, len(top_goalkeepers) + 1)
+        # Rankings are precomputed once per dataset version and shared by all sessions
+        boards = leaderboards(dataset)
         
-        # Format Save_Percentage
-        top_goalkeepers['Save_Percentage'] = top_goalkeepers['Save_Percentage'].apply(lambda x: f"{x:.1f}%" if x > 0 else "N/A")
+        # Top Goal Scorers
+        st.subheader("⚽ Top 10 Goal Scorers")
+        top_scorers = boards.table('Goals', 10, ['Player', 'Team', 'Position', 'Goals', 'Appearances', 'Goals_per_Game'])
+        st.dataframe(top_scorers.rename(columns={'Goals_per_Game': 'Goals/Game'}), use_container_width=True)
         
-        st.dataframe(top_goalkeepers, use_container_width=True)
-    else:
-        st.info("Goalkeeper statistics not available in current dataset.")
-    
-    # Visualization
-    st.subheader("📊 Top 5 Scorers vs Assisters")
-    top5_scorers = df.nlargest(5, 'Goals')
-    top5_assisters = df.nlargest(5, 'Assists')
-    
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
-    
-    # Top Scorers Chart
-    ax1.barh(top5_scorers['Player'], top5_scorers['Goals'], color='#FF6B6B')
-    ax1.set_xlabel('Goals')
-    ax1.set_title('Top 5 Goal Scorers')
-    ax1.invert_yaxis()
-    
-    # Top Assisters Chart
-    ax2.barh(top5_assisters['Player'], top5_assisters['Assists'], color='#4ECDC4')
-    ax2.set_xlabel('Assists')
-    ax2.set_title('Top 5 Assist Providers')
-    ax2.invert_yaxis()
-    
-    plt.tight_layout()
-    st.pyplot(fig)
+        # Top Assist Providers
+        st.subheader("🎯 Top 10 Assist Providers")
+        top_assisters = boards.table('Assists', 10, ['Player', 'Team', 'Position', 'Assists', 'Appearances', 'Assists_per_Game'])
+        st.dataframe(top_assisters.rename(columns={'Assists_per_Game': 'Assists/Game'}), use_container_width=True)
+        
+        # Combined Goals + Assists
+        st.subheader("🌟 Top 10 Goal Contributions (Goals + Assists)")
+        top_contributors = boards.table('Total Contributions', 10, ['Player', 'Team', 'Position', 'Goals', 'Assists', 'Total Contributions', 'Appearances', 'Contributions_per_Game'])
+        st.dataframe(top_contributors.rename(columns={'Contributions_per_Game': 'Contributions/Game'}), use_container_width=True)
+        
+        # Per 90 Minutes Leaderboards
+        st.subheader("⚡ Top 10 by Per 90 Minutes (min. 500 minutes)")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.write("**Goals per 90**")
+            top_goals_per90 = boards.table('Goals_per_90', 10, ['Player', 'Team', 'Position', 'Goals', 'Minutes', 'Goals_per_90'], min_minutes=500)
+            st.dataframe(top_goals_per90, use_container_width=True)
+        
+        with col2:
+            st.write("**G+A per 90**")
+            top_ga_per90 = boards.table('G+A_per_90', 10, ['Player', 'Team', 'Position', 'Goals', 'Assists', 'G+A_per_90'], min_minutes=500)
+            st.dataframe(top_ga_per90, use_container_width=True)
+        
+        # Top Goalkeepers
+        st.subheader("🧤 Top 10 Goalkeepers")
+        
+        if 'Clean_Sheets' in boards.metrics and (df['Position'] == 'GK').any():
+            # Get top 10 by Clean Sheets
+            top_goalkeepers = boards.table('Clean_Sheets', 10, ['Player', 'Team', 'Appearances', 'Clean_Sheets', 'Goals_Against', 'Clean_Sheet_%', 'Save_Percentage'], position='GK')
+            
+            # Format Save_Percentage
+            top_goalkeepers['Save_Percentage'] = top_goalkeepers['Save_Percentage'].apply(lambda x: f"{x:.1f}%" if x > 0 else "N/A")
+            
+            st.dataframe(top_goalkeepers, use_container_width=True)
+        else:
+            st.info("Goalkeeper statistics not available in current dataset.")
+        
+        # Visualization
+        st.subheader("📊 Top 5 Scorers vs Assisters")
+        top5_scorers = boards.table('Goals', 5)
+        top5_assisters = boards.table('Assists', 5)
+        st.image(top_five_chart(dataset.version, top5_scorers, top5_assisters), use_container_width=True)
+        
+        # Custom leaderboard over any ranked metric, honouring the sidebar filters
+        st.subheader("🔎 Custom Leaderboard")
+        
+        custom_col1, custom_col2, custom_col3 = st.columns([2, 1, 1])
+        with custom_col1:
+            if st.session_state.get("rank_metric") not in boards.metrics:
+                st.session_state.pop("rank_metric", None)
+            rank_metric = st.selectbox("Rank by", boards.metrics, key="rank_metric")
+        with custom_col2:
+            rank_min_minutes = st.number_input("Min. minutes", min_value=0, step=90, key="rank_min_minutes")
+        with custom_col3:
+            rank_n = st.number_input("Show top", min_value=1, max_value=100, key="rank_n")
+        
+        custom_board = boards.table(
+            rank_metric,
+            int(rank_n),
+            ['Player', 'Team', 'Position', 'Appearances', 'Minutes', rank_metric],
+            team=team_filter,
+            position=position_filter,
+            min_minutes=int(rank_min_minutes),
+        )
+        if len(custom_board) > 0:
+            st.dataframe(custom_board, use_container_width=True)
+        else:
+            st.info("No players match the current filters.")
 
 # TAB 3: COMPARE PLAYERS
-with tab3:
-    st.header("👥 Compare Players")
-    
-    # Add search filters for both players
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.subheader("Player 1")
-        search_term1 = st.text_input("Search Player 1", "", key="search1").strip()
+if tab3.open:
+    with tab3, span("tab.compare"):
+        st.header("👥 Compare Players")
+        
+        # Built on first use, once per dataset version
+        percentiles = percentile_ranks(dataset)
+        similar_players = similarity_index(dataset)
+        
+        # Search narrows the options the same way as on the player card
+        # (accent-insensitive, tolerant of typos)
+        compare_search = st.text_input("🔍 Search players to add", placeholder="e.g., Odegaard, Saka...",
+                                       key="compare_search").strip()
+        compare_options = player_search.filter_rows(filtered_rows, compare_search) if compare_search else filtered_rows
         
-        # Filter players based on search term
-        if search_term1:
-            search_filtered_df1 = filtered_df[filtered_df["Player"].str.contains(search_term1, case=False, na=False)]
+        # The shortlist holds row positions, so a player who moved clubs mid-season
+        # is compared on the row the filters picked. Rows mean nothing in another
+        # dataset version, so the shortlist restarts when the data changes
+        if st.session_state.get("compare_version") != dataset.version:
+            st.session_state["compare_version"] = dataset.version
+            st.session_state["compare_players"] = [int(row) for row in filtered_rows[:2]]
+        player_labels = df["Player"].astype(str).to_numpy()
+        team_labels = df["Team"].astype(str).to_numpy()
+        
+        def row_label(row):
+            return f"{player_labels[row]} ({team_labels[row]})"
+        
+        # Players picked under another filter or search stay selected
+        option_rows = [int(row) for row in compare_options]
+        shown = set(option_rows)
+        option_rows += [row for row in st.session_state["compare_players"] if row not in shown]
+        shortlist = st.multiselect(f"Players to compare (up to {MAX_COMPARE})", option_rows, format_func=row_label,
+                                   max_selections=MAX_COMPARE, key="compare_players")
+        shortlist_names = [row_label(row) for row in shortlist]
+        
+        if len(shortlist) < 2:
+            st.info("Select at least two players to compare.")
         else:
-            search_filtered_df1 = filtered_df
+            # One gather of every metric for the whole shortlist
+            compare_rows = np.asarray(shortlist)
+            compare_positions = df["Position"].to_numpy()[compare_rows]
+            goalkeepers = compare_positions == "GK"
+            
+            # Percentiles are only comparable when everyone is ranked on the same metrics
+            same_group = goalkeepers.all() or not goalkeepers.any()
+            compare_metrics = percentiles.radar_metrics(compare_positions[0]) if same_group else []
+            compare_percentiles = percentiles.players(compare_rows, compare_metrics) if compare_metrics else None
+            compare_table = comparison_table(
+                df, compare_rows, compare_percentiles.rename(columns=LABELS) if compare_percentiles is not None else None)
+            
+            st.subheader("📋 Side-by-Side Comparison")
+            percentile_columns = [col for col in compare_table.columns if col.endswith(" %ile")]
+            st.dataframe(compare_table.style.format(precision=0, na_rep="n/a", subset=percentile_columns),
+                         hide_index=True, use_container_width=True)
+            st.caption("Click a column header to sort.")
+            
+            stat_values = compare_table[['Goals', 'Assists', 'Appearances', 'Minutes']].to_numpy(dtype=float)
+            # Normalize minutes for better visualization
+            stat_values[:, 3] /= 100
+            st.image(comparison_chart(shortlist_names, ['Goals', 'Assists', 'Appearances', 'Minutes (x100)'], stat_values),
+                     use_container_width=True)
+            
+            # Percentile radar
+            st.subheader("🕸️ Percentile Profiles")
+            if not same_group:
+                st.info("Percentile profiles can only be compared between goalkeepers or between outfield players.")
+            elif compare_percentiles is None:
+                st.info("Percentile metrics not available in current dataset.")
+            else:
+                # Players with none of the metrics (keepers without goalkeeper stats) are left off
+                ranked = compare_percentiles.notna().any(axis=1).to_numpy()
+                if not ranked.any():
+                    st.info("Percentile metrics not available for these players.")
+                else:
+                    radar_col, _ = st.columns([1, 1])
+                    with radar_col:
+                        st.image(radar_chart([name for name, keep in zip(shortlist_names, ranked) if keep],
+                                             [LABELS[m] for m in compare_metrics], compare_percentiles.to_numpy()[ranked]),
+                                 use_container_width=True)
+                        caption = "Each player is ranked against players in their own position."
+                        if not ranked.all():
+                            missing = [name for name, keep in zip(shortlist_names, ranked) if not keep]
+                            caption += f" No percentile data for {', '.join(missing)}."
+                        st.caption(caption)
         
-        player1 = st.selectbox("Select Player 1", search_filtered_df1["Player"].unique(), key="p1")
-        player1_data = filtered_df[filtered_df["Player"] == player1].iloc[0]
+        # Similar players: nearest per-90 profiles across the whole season
+        st.markdown("---")
+        st.subheader("🧭 Similar Players")
         
-        st.markdown(f"**Position:** {player1_data['Position']}")
-        st.markdown(f"**Team:** {player1_data['Team']}")
-        st.metric("Goals", int(player1_data["Goals"]))
-        st.metric("Assists", int(player1_data["Assists"]))
-        st.metric("Appearances", int(player1_data["Appearances"]))
-        st.metric("Minutes", int(player1_data["Minutes"]))
-    
-    with col2:
-        st.subheader("Player 2")
-        search_term2 = st.text_input("Search Player 2", "", key="search2").strip()
+        sim_col1, sim_col2, sim_col3, sim_col4 = st.columns([2, 1, 1, 1])
+        with sim_col1:
+            similar_options = shortlist or [int(row) for row in filtered_rows[:1]]
+            if st.session_state.get("similar_to") not in similar_options:
+                st.session_state.pop("similar_to", None)
+            similar_to = st.selectbox("Find players similar to", similar_options, format_func=row_label, key="similar_to")
+        with sim_col2:
+            similar_min_minutes = st.number_input("Min. minutes", min_value=0, step=90, key="similar_min_minutes")
+        with sim_col3:
+            similar_n = st.number_input("Show", min_value=1, max_value=50, key="similar_n")
+        with sim_col4:
+            st.markdown("")
+            similar_same_position = st.checkbox("Same position", key="similar_same_position")
+        
+        if similar_to is None:
+            st.info("No players match the current filters.")
+        else:
+            similar_row = similar_to
+            similar_rows, similar_distances = similar_players.similar(
+                similar_row,
+                int(similar_n),
+                # Any shared role counts, so a FW,MF winger is matched with both groups
+                position=int(df["Position_Mask"].iat[similar_row]) if similar_same_position else None,
+                min_minutes=int(similar_min_minutes),
+            )
+            
+            if len(similar_rows) > 0:
+                similar_table = engine.view(similar_rows, ['Player', 'Team', 'Position', 'Minutes'] + similar_players.features).copy()
+                similar_table.insert(0, "Distance", similar_distances.round(2))
+                similar_table.index = pd.RangeIndex(1, len(similar_table) + 1)
+                st.dataframe(similar_table, use_container_width=True)
+                st.caption("Distance between standardized per-90 profiles: lower is more similar.")
+            else:
+                st.info("No similar players match these settings.")
+
+# TAB 4: COMPARE TEAMS
+if tab4.open:
+    with tab4, span("tab.compare_teams"):
+        st.header("🏟️ Compare Teams")
+        
+        # Other seasons of the selected league can be added; only their
+        # partitions are loaded, and combined once per selection
+        other_seasons = [s for s in seasons if s != selected_season]
+        st.session_state["compare_seasons"] = [s for s in st.session_state.get("compare_seasons") or [] if s in other_seasons]
+        compare_seasons = st.multiselect("Add seasons", other_seasons, key="compare_seasons", format_func=season_label)
+        with span("load.seasons"):
+            team_cube = aggregate_cube(load_partitions([(selected_league, s) for s in [selected_season] + compare_seasons]))
         
-        # Filter players based on search term
-        if search_term2:
-            search_filtered_df2 = filtered_df[filtered_df["Player"].str.contains(search_term2, case=False, na=False)]
+        # Team totals are lookups in the aggregate cube; the sidebar position filter applies
+        # All teams at first; teams of another dataset are dropped
+        remembered = st.session_state.get("compare_teams")
+        st.session_state["compare_teams"] = team_cube.teams if remembered is None else [t for t in remembered if t in team_cube.teams]
+        compare_teams = st.multiselect("Teams", team_cube.teams, key="compare_teams")
+        if position_filter is not None:
+            st.caption(f"Showing {position_filter} players only.")
+        
+        team_table = team_cube.team_totals(position=position_filter, teams=compare_teams)
+        if len(team_table) > 0:
+            st.subheader("📋 Team Totals")
+            team_columns = [col for col in ['Team', 'Players', 'Goals', 'Assists', 'xG', 'xAG', 'Goals - xG', 'Minutes',
+                                            'Goals_per_90', 'xG_per_90', 'Avg_Age'] if col in team_table.columns]
+            if len(team_cube.seasons) > 1:
+                # One row per team and season; the charts below add the seasons up
+                season_table = pd.concat([
+                    team_cube.team_totals(position=position_filter, season=season, teams=compare_teams)
+                    .assign(Season=season_label(season))
+                    for season in team_cube.seasons
+                ], ignore_index=True)
+                st.dataframe(season_table[['Season'] + team_columns].sort_values(['Season', 'Goals'], ascending=[False, False]),
+                             hide_index=True, use_container_width=True)
+                st.caption(f"Charts show totals over the {len(team_cube.seasons)} selected seasons.")
+            else:
+                st.dataframe(team_table[team_columns].sort_values('Goals', ascending=False), hide_index=True,
+                             use_container_width=True)
+            
+            team_col1, team_col2 = st.columns(2)
+            with team_col1:
+                if 'xG' in team_table.columns:
+                    st.subheader("🎯 Goals vs Expected Goals")
+                    st.image(xg_chart(team_table['Team'], team_table['xG'], team_table['Goals']), use_container_width=True)
+                    st.caption("Teams above the line scored more than their chances were worth.")
+            with team_col2:
+                st.subheader("⏱️ Squad Minutes Distribution")
+                distribution = team_cube.minutes_distribution(position=position_filter, teams=compare_teams)
+                st.image(minutes_distribution_chart(distribution.index, distribution.columns, distribution.to_numpy()),
+                         use_container_width=True)
+                st.caption("Players per team by minutes played: a deep rotation or a settled XI.")
         else:
-            search_filtered_df2 = filtered_df
+            st.info("No teams match the current selection.")
+
+# Performance panel: this rerun's spans and counters, plus process-wide totals
+record = trace.finish(league=selected_league, season=selected_season,
+                      session_bytes=instrument.session_bytes(st.session_state))
+if admin_panel is not None:
+    with admin_panel.container():
+        st.markdown("---")
+        st.markdown("### 🛠️ Performance")
+        perf_col1, perf_col2 = st.columns(2)
+        with perf_col1:
+            st.metric("Rerun", f"{record['ms']:.0f} ms")
+        with perf_col2:
+            rss = instrument.process_rss_mib()
+            st.metric("Process RSS", f"{rss} MiB" if rss is not None else "n/a")
+        st.caption(f"Session state: {record['session_bytes'] / 1024:.1f} KiB")
         
-        player2 = st.selectbox("Select Player 2", search_filtered_df2["Player"].unique(), key="p2")
-        player2_data = filtered_df[filtered_df["Player"] == player2].iloc[0]
+        spans = pd.DataFrame(record["spans"])
+        if len(spans) > 0:
+            spans["name"] = ["  " * depth + name for name, depth in zip(spans["name"], spans["depth"])]
+            st.dataframe(spans[["name", "ms"]], hide_index=True, use_container_width=True)
+        if record["counters"]:
+            st.json(record["counters"], expanded=False)
         
-        st.markdown(f"**Position:** {player2_data['Position']}")
-        st.markdown(f"**Team:** {player2_data['Team']}")
-        st.metric("Goals", int(player2_data["Goals"]))
-        st.metric("Assists", int(player2_data["Assists"]))
-        st.metric("Appearances", int(player2_data["Appearances"]))
-        st.metric("Minutes", int(player2_data["Minutes"]))
-    
-    # Comparison chart
-    st.subheader("Side-by-Side Comparison")
-    
-    stats = ['Goals', 'Assists', 'Appearances', 'Minutes']
-    player1_stats = [player1_data[stat] for stat in stats]
-    player2_stats = [player2_data[stat] for stat in stats]
-    
-    # Normalize minutes for better visualization
-    player1_stats_viz = player1_stats[:3] + [player1_stats[3]/100]
-    player2_stats_viz = player2_stats[:3] + [player2_stats[3]/100]
-    
-    x = np.arange(len(stats))
-    width = 0.35
-    
-    fig, ax = plt.subplots(figsize=(10, 6))
-    bars1 = ax.bar(x - width/2, player1_stats_viz, width, label=player1, alpha=0.8)
-    bars2 = ax.bar(x + width/2, player2_stats_viz, width, label=player2, alpha=0.8)
-    
-    ax.set_xlabel('Statistics')
-    ax.set_ylabel('Value')
-    ax.set_title(f'Player Comparison - {player1_data["Position"]} vs {player2_data["Position"]}')
-    ax.set_xticks(x)
-    ax.set_xticklabels(['Goals', 'Assists', 'Appearances', 'Minutes (x100)'])
-    ax.legend()
-    ax.grid(axis='y', alpha=0.3)
-    
-    st.pyplot(fig)
-    
-    # Goals per game comparison
-    st.subheader("Per Game Statistics")
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.write(f"**{player1}**")
-        if player1_data["Appearances"] > 0:
-            st.metric("Goals per Game", f"{player1_data['Goals']/player1_data['Appearances']:.2f}")
-            st.metric("Assists per Game", f"{player1_data['Assists']/player1_data['Appearances']:.2f}")
-    
-    with col2:
-        st.write(f"**{player2}**")
-        if player2_data["Appearances"] > 0:
-            st.metric("Goals per Game", f"{player2_data['Goals']/player2_data['Appearances']:.2f}")
-            st.metric("Assists per Game", f"{player2_data['Assists']/player2_data['Appearances']:.2f}")
+        with st.expander("Process totals", expanded=False):
+            st.dataframe(instrument.span_totals(), hide_index=True, use_container_width=True)
+            st.json(instrument.counters(), expanded=False)
+        
+        st.download_button("Export trace (JSON)", json.dumps({"rerun": record, "process": instrument.snapshot()}, default=str),
+                           file_name="dashboard_trace.json", mime="application/json")
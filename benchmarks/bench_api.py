@@ -0,0 +1,72 @@
+"""API request handling: requests per second, cold vs cached, over a served port.
+
+Usage: python benchmarks/bench_api.py [rows] [requests]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer
+from urllib.request import urlopen
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_players  # noqa: E402
+from premstats import api, partitions  # noqa: E402
+
+URLS = [
+    "/search?q=player%2012&per_page=20",
+    "/leaderboards/Goals_per_90?position=FW&min_minutes=900&page=2",
+    "/player?name=Player%2042",
+    "/similar?name=Player%2042&k=10",
+]
+
+
+def run(base, requests, workers=8):
+    def fetch(i):
+        with urlopen(base + URLS[i % len(URLS)]) as response:
+            return response.status
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(workers) as pool:
+        statuses = list(pool.map(fetch, range(requests)))
+    assert set(statuses) == {200}, set(statuses)
+    return requests / (time.perf_counter() - start)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        path = partitions.partition_path(partitions.DEFAULT_LEAGUE, partitions.DEFAULT_SEASON)
+        os.makedirs(os.path.dirname(path))
+        make_players(rows).to_csv(path, index=False)
+        partitions.register_partition(partitions.DEFAULT_LEAGUE, partitions.DEFAULT_SEASON, rows, [])
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), api.ApiHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+
+        start = time.perf_counter()
+        run(base, len(URLS), workers=1)
+        first = (time.perf_counter() - start) * 1000
+
+        api.response_cache.max_entries = 0
+        uncached = run(base, requests)
+        api.response_cache.max_entries = api.MAX_CACHED_RESPONSES
+        cached = run(base, requests)
+        server.shutdown()
+
+    print(f"rows={rows} requests={requests}")
+    print(f"first requests (load + index build): {first:8.1f} ms")
+    print(f"uncached:  {uncached:8.0f} requests/s")
+    print(f"cached:    {cached:8.0f} requests/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Position / nationality cleaning: row-wise .apply vs the vectorized versions.
+
+tests/test_cleaning.py checks that both produce identical output.
+
+Usage: python benchmarks/bench_cleaning.py [rows]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from premstats.cleaning import (  # noqa: E402
+    clean_nationalities,
+    clean_nationality,
+    standardize_position,
+    standardize_positions,
+)
+
+
+def make_raw(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    positions = np.array(["GK", "DF", "MF", "FW", "FW,MF", "MF,FW", "DF,MF", "DF,FW", "MF,DF"], dtype=object)
+    nations = np.array(["eng ENG", "fr FRA", "es ESP", "br BRA", "no NOR", "ch SUI", "gb-sct SCO"], dtype=object)
+    pos = positions[rng.integers(0, len(positions), rows)]
+    nat = nations[rng.integers(0, len(nations), rows)]
+    pos[rng.random(rows) < 0.01] = None
+    nat[rng.random(rows) < 0.01] = None
+    return pd.Series(pos, dtype=object), pd.Series(nat, dtype=object)
+
+
+def timed(fn, series):
+    start = time.perf_counter()
+    fn(series)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    positions, nationalities = make_raw(rows)
+
+    print(f"rows={rows}")
+    print(f"positions    apply {timed(lambda s: s.apply(standardize_position), positions):9.1f} ms   "
+          f"vectorized {timed(standardize_positions, positions):9.1f} ms")
+    print(f"nationality  apply {timed(lambda s: s.apply(clean_nationality), nationalities):9.1f} ms   "
+          f"vectorized {timed(clean_nationalities, nationalities):9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
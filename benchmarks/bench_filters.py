@@ -0,0 +1,62 @@
+"""Sidebar filtering per rerun: frame copy + boolean masks vs the FilterIndex.
+
+tests/test_filters.py checks that both produce the same rows and totals.
+
+Usage: python benchmarks/bench_filters.py [rows] [reruns]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_players  # noqa: E402
+from premstats.filters import FilterIndex  # noqa: E402
+from premstats.loader import enrich  # noqa: E402
+
+COMBOS = [("Arsenal", None), (None, "MF"), ("Liverpool", "FW"), (None, None)]
+
+
+def before(df, team, position):
+    # What the sidebar did on every rerun
+    filtered = df.copy()
+    if team is not None:
+        filtered = filtered[filtered["Team"] == team]
+    if position is not None:
+        filtered = filtered[filtered["Position"] == position]
+    return len(filtered), filtered["Team"].nunique(), int(filtered["Goals"].sum()), int(filtered["Assists"].sum())
+
+
+def after(engine, team, position):
+    return engine.summary(engine.rows(team, position))
+
+
+def measure(fn, reruns):
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(reruns):
+        for team, position in COMBOS:
+            fn(team, position)
+    elapsed = (time.perf_counter() - start) / (reruns * len(COMBOS)) * 1000
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    reruns = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    df = enrich(make_players(rows))
+    engine = FilterIndex(df)
+
+    t_before, m_before = measure(lambda t, p: before(df, t, p), reruns)
+    t_after, m_after = measure(lambda t, p: after(engine, t, p), reruns)
+    print(f"rows={rows}")
+    print(f"copy + mask:  {t_before:8.3f} ms per rerun, peak allocation {m_before:7.2f} MiB")
+    print(f"FilterIndex:  {t_after:8.3f} ms per rerun, peak allocation {m_after:7.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Peak RSS of cleaning a large raw table: full read vs chunked streaming.
+
+The source gets extra unused columns, as the wider FBref exports have, so
+the usecols pruning shows up too. Each run is a fresh interpreter.
+
+Usage: python benchmarks/bench_ingest.py [rows] [chunk_size]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import make_kaggle_players  # noqa: E402
+from premstats.ingest import DEFAULT_CHUNK_SIZE  # noqa: E402
+
+EXTRA_COLUMNS = 40
+
+CHILD = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+import pandas as pd
+from premstats.cleaning import clean_players
+from premstats.ingest import stream_players
+
+def peak_rss_kb():
+    with open("/proc/self/status") as fh:
+        for line in fh:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1])
+
+base = peak_rss_kb()
+start = time.perf_counter()
+if {mode!r} == "full":
+    df = clean_players(pd.read_csv({source!r}))
+    df.to_csv({output!r}, index=False)
+else:
+    stream_players({source!r}, {output!r}, {chunk_size})
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "rss_kb": peak_rss_kb(), "base_kb": base}}))
+"""
+
+
+def measure(mode, source, output, chunk_size):
+    code = CHILD.format(root=ROOT, mode=mode, source=source, output=output, chunk_size=chunk_size)
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_CHUNK_SIZE
+    raw = make_kaggle_players(rows)
+    rng = np.random.default_rng(1)
+    for i in range(EXTRA_COLUMNS):
+        raw[f"Extra_{i}"] = rng.random(rows).round(3)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "source.csv")
+        raw.to_csv(source, index=False)
+        columns = len(raw.columns)
+        del raw
+        print(f"rows={rows} columns={columns} chunk_size={chunk_size} "
+              f"source {os.path.getsize(source) / 2**20:.1f} MiB")
+        for mode in ("full", "stream"):
+            result = measure(mode, source, os.path.join(tmp, f"{mode}.csv"), chunk_size)
+            print(f"{mode:7s} {result['seconds']:7.2f} s   peak RSS {result['rss_kb'] / 1024:7.1f} MiB "
+                  f"(after imports {result['base_kb'] / 1024:6.1f})")
+
+
+if __name__ == "__main__":
+    main()
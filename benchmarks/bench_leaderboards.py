@@ -0,0 +1,63 @@
+"""Top-N latency: DataFrame.nlargest per rerun vs the precomputed LeaderboardIndex.
+
+tests/test_leaderboards.py checks that both return the same rows.
+
+Usage: python benchmarks/bench_leaderboards.py [rows] [queries]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_players  # noqa: E402
+from premstats.leaderboards import LeaderboardIndex  # noqa: E402
+from premstats.loader import enrich  # noqa: E402
+
+QUERIES = [
+    ("Goals", {}),
+    ("Assists", {}),
+    ("G+A_per_90", {"min_minutes": 500}),
+    ("Goals_per_90", {"team": "Arsenal", "min_minutes": 900}),
+    ("Clean_Sheets", {"position": "GK"}),
+]
+
+
+def nlargest(df, metric, n, team=None, position=None, min_minutes=0):
+    if team is not None:
+        df = df[df["Team"] == team]
+    if position is not None:
+        df = df[df["Position"] == position]
+    if min_minutes:
+        df = df[df["Minutes"] >= min_minutes]
+    return df.nlargest(n, metric)
+
+
+def bench(fn, queries):
+    start = time.perf_counter()
+    for _ in range(queries):
+        for metric, filters in QUERIES:
+            fn(metric, filters)
+    return (time.perf_counter() - start) / (queries * len(QUERIES)) * 1000
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    df = enrich(make_players(rows))
+
+    start = time.perf_counter()
+    index = LeaderboardIndex(df)
+    build = (time.perf_counter() - start) * 1000
+
+    before = bench(lambda m, f: nlargest(df, m, 10, **f), queries)
+    after = bench(lambda m, f: index.top(m, 10, **f), queries)
+    print(f"rows={rows}")
+    print(f"index build (once per dataset version): {build:.1f} ms")
+    print(f"nlargest per query:  {before:.3f} ms")
+    print(f"index top per query: {after:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
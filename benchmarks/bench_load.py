@@ -0,0 +1,68 @@
+"""Rerun data-stage latency: re-reading the CSV every rerun vs the cached loader.
+
+Usage: python benchmarks/bench_load.py [rows] [reruns]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_players  # noqa: E402
+from premstats.loader import clear_cache, load_dataset  # noqa: E402
+
+
+def rerun_before(path):
+    # What app.py did at the top of every rerun
+    df = pd.read_csv(path)
+    df["Goals_per_90"] = (df["Goals"] / df["Minutes"] * 90).round(2)
+    df["Assists_per_90"] = (df["Assists"] / df["Minutes"] * 90).round(2)
+    df["G+A_per_90"] = ((df["Goals"] + df["Assists"]) / df["Minutes"] * 90).round(2)
+    df["Minutes_per_Goal"] = (df["Minutes"] / df["Goals"]).replace([np.inf, -np.inf], 0).round(0)
+    df["Minutes_per_Contribution"] = (df["Minutes"] / (df["Goals"] + df["Assists"])).replace([np.inf, -np.inf], 0).round(0)
+    return df.fillna(0)
+
+
+def rerun_after(path):
+    return load_dataset(path).view()
+
+
+def timeit(fn, path, reruns):
+    samples = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        fn(path)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2] * 1000, samples[0] * 1000
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    reruns = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "premier_league_stats.csv")
+        make_players(rows).to_csv(path, index=False)
+
+        clear_cache()
+        start = time.perf_counter()
+        load_dataset(path)
+        cold = (time.perf_counter() - start) * 1000
+
+        before = timeit(rerun_before, path, reruns)
+        after = timeit(rerun_after, path, reruns)
+
+    print(f"rows={rows} reruns={reruns}")
+    print(f"before (read_csv + enrich per rerun): median {before[0]:.3f} ms, min {before[1]:.3f} ms")
+    print(f"after  (cached dataset view):         median {after[0]:.3f} ms, min {after[1]:.3f} ms")
+    print(f"after cold load (first rerun only):   {cold:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
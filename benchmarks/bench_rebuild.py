@@ -0,0 +1,48 @@
+"""Wall time of a multi-partition rebuild with 1..N worker processes.
+
+Usage: python benchmarks/bench_rebuild.py [partitions] [rows per partition]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import make_kaggle_players, make_keepers_table  # noqa: E402
+from premstats import rebuild  # noqa: E402
+from premstats.goalkeepers import extract_goalkeeper_stats  # noqa: E402
+
+LEAGUES = ["Premier-League", "La-Liga", "Serie-A", "Bundesliga", "Ligue-1"]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 50_000
+    cores = os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tasks = []
+        for i in range(count):
+            league, season = LEAGUES[i % len(LEAGUES)], f"{2015 + i // len(LEAGUES)}-{2016 + i // len(LEAGUES)}"
+            raw = make_kaggle_players(rows, seed=i)
+            directory = os.path.join(tmp, "sources", f"league={league}", f"season={season}")
+            os.makedirs(directory)
+            raw.to_csv(os.path.join(directory, "players.csv"), index=False)
+            tasks.append((league, season, os.path.join(directory, "players.csv"),
+                          extract_goalkeeper_stats(make_keepers_table(raw))))
+
+        print(f"partitions={count} rows={rows} cores={cores}")
+        baseline = None
+        for processes in sorted({1, 2, 4, cores} & set(range(1, cores + 1))):
+            start = time.perf_counter()
+            rebuild.rebuild(tasks, processes, os.path.join(tmp, f"data_{processes}"))
+            seconds = time.perf_counter() - start
+            baseline = baseline or seconds
+            print(f"{processes:3d} process(es) {seconds:8.2f} s   speed-up {baseline / seconds:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
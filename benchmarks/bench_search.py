@@ -0,0 +1,58 @@
+"""Per-keystroke search latency: str.contains scans vs the SearchIndex.
+
+Usage: python benchmarks/bench_search.py [rows]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from premstats.search import SearchIndex  # noqa: E402
+
+REAL = ["Martin Ødegaard", "Erling Haaland", "Mohamed Salah", "Kevin De Bruyne", "Bukayo Saka",
+        "Cole Palmer", "Alexis Mac Allister", "Bruno Fernandes", "Virgil van Dijk", "Son Heung-min"]
+SYLLABLES = ["ba", "ko", "ri", "san", "del", "mar", "tin", "ez", "lo", "vic", "ha", "ø", "gu", "nes", "te", "al"]
+
+# Each query is typed one keystroke at a time, like the dashboard search box
+QUERIES = ["odegaard", "haaland", "de bruy", "sal", "mac alister"]
+
+
+def main():
+    import pandas as pd
+
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    rng = np.random.default_rng(0)
+
+    def word():
+        return "".join(rng.choice(SYLLABLES, rng.integers(2, 5))).capitalize()
+
+    names = pd.Series(REAL + [f"{word()} {word()}" for _ in range(rows - len(REAL))])
+
+    start = time.perf_counter()
+    index = SearchIndex(names.tolist())
+    build = (time.perf_counter() - start) * 1000
+
+    keystrokes = [q[:i] for q in QUERIES for i in range(1, len(q) + 1)]
+
+    start = time.perf_counter()
+    for query in keystrokes:
+        names[names.str.contains(query, case=False, na=False)]
+    before = (time.perf_counter() - start) / len(keystrokes) * 1000
+
+    start = time.perf_counter()
+    for query in keystrokes:
+        index.search(query, limit=50)
+    after = (time.perf_counter() - start) / len(keystrokes) * 1000
+
+    print(f"rows={rows} keystrokes={len(keystrokes)}")
+    print(f"index build (once per dataset version): {build:.1f} ms")
+    print(f"str.contains per keystroke: {before:.3f} ms")
+    print(f"SearchIndex per keystroke:  {after:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Similar-player queries: per-query latency of the SimilarityIndex.
+
+tests/test_similarity.py checks the neighbours against a brute-force search.
+
+Usage: python benchmarks/bench_similarity.py [rows] [queries]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_players  # noqa: E402
+from premstats.loader import enrich  # noqa: E402
+from premstats.similarity import SimilarityIndex  # noqa: E402
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    df = enrich(make_players(rows))
+
+    start = time.perf_counter()
+    index = SimilarityIndex(df)
+    build = (time.perf_counter() - start) * 1000
+
+    rng = np.random.default_rng(1)
+    sample = rng.choice(rows, queries, replace=False)
+    start = time.perf_counter()
+    for row in sample:
+        index.similar(row, k=10, position="MF", min_minutes=900)
+    single = (time.perf_counter() - start) / queries * 1000
+
+    start = time.perf_counter()
+    index.neighbours(sample, k=10, position="MF", min_minutes=900)
+    batched = (time.perf_counter() - start) / queries * 1000
+
+    print(f"rows={rows} features={len(index.features)}")
+    print(f"build:          {build:8.2f} ms")
+    print(f"single query:   {single:8.3f} ms")
+    print(f"batched query:  {batched:8.3f} ms per query")
+
+
+if __name__ == "__main__":
+    main()
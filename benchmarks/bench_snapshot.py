@@ -0,0 +1,73 @@
+"""Cold-start load time and peak RSS: CSV vs typed Feather snapshot.
+
+Each load runs in a fresh interpreter so RSS is not shared between formats.
+
+Usage: python benchmarks/bench_snapshot.py [rows]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import make_players  # noqa: E402
+from premstats import snapshot  # noqa: E402
+
+CHILD = """
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+from premstats.loader import load_dataset
+
+def peak_rss_kb():
+    # VmHWM is reset on exec; ru_maxrss can carry over the parent's peak
+    try:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+base = peak_rss_kb()
+start = time.perf_counter()
+df = load_dataset({path!r}).frame
+elapsed = time.perf_counter() - start
+peak = peak_rss_kb()
+print(json.dumps({{"seconds": elapsed, "rss_kb": peak, "base_kb": base, "frame_bytes": int(df.memory_usage(deep=True).sum())}}))
+"""
+
+
+def measure(root, path):
+    out = subprocess.run([sys.executable, "-c", CHILD.format(root=root, path=path)],
+                         check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    if not snapshot.available():
+        sys.exit("pyarrow is required for this benchmark")
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    df = make_players(rows)
+
+    with tempfile.TemporaryDirectory() as csv_dir, tempfile.TemporaryDirectory() as snap_dir:
+        # The loader prefers a snapshot next to the CSV, so keep the formats apart
+        csv_path = os.path.join(csv_dir, "premier_league_stats.csv")
+        df.to_csv(csv_path, index=False)
+        snap_csv_path = os.path.join(snap_dir, "premier_league_stats.csv")
+        snapshot.write_snapshot(df, snapshot.snapshot_path(snap_csv_path))
+
+        print(f"rows={rows}")
+        for label, path in [("csv", csv_path), ("feather", snap_csv_path)]:
+            result = measure(ROOT, path)
+            print(f"{label:8s} load {result['seconds'] * 1000:9.1f} ms   "
+                  f"peak RSS {result['rss_kb'] / 1024:7.1f} MiB (after imports {result['base_kb'] / 1024:6.1f})   "
+                  f"frame {result['frame_bytes'] / 2**20:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
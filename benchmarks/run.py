@@ -0,0 +1,231 @@
+"""Benchmark harness: every pipeline and dashboard stage at several dataset sizes.
+
+Times each stage on synthetic data (median and min over repeats), measures
+its peak traced allocation in a separate run, and writes the results as
+JSON. With --baseline, stages that got slower than the threshold are
+reported and the exit status is 1, so a release can be checked against the
+previous one's results file.
+
+Usage:
+    python benchmarks/run.py [--sizes 1000 10000 100000 1000000] [--repeat 3]
+                             [--stages clean enrich ...] [--output results.json]
+                             [--baseline old.json] [--threshold 1.25]
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import make_kaggle_players, make_keepers_table  # noqa: E402
+from premstats.aggregates import AggregateCube  # noqa: E402
+from premstats.cleaning import clean_players  # noqa: E402
+from premstats.filters import FilterIndex  # noqa: E402
+from premstats.goalkeepers import extract_goalkeeper_stats, merge_goalkeeper_stats  # noqa: E402
+from premstats.leaderboards import LeaderboardIndex  # noqa: E402
+from premstats.loader import clear_cache, enrich, load_dataset  # noqa: E402
+from premstats.metrics import comparison_table  # noqa: E402
+from premstats.percentiles import PercentileRanks  # noqa: E402
+from premstats.search import SearchIndex  # noqa: E402
+from premstats.similarity import SimilarityIndex  # noqa: E402
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+FILTER_COMBOS = [("Arsenal", None), (None, "MF"), ("Liverpool", "FW"), (None, None)]
+SEARCH_QUERIES = ["player 12", "plyer 4", "9", "player 99999"]
+
+
+def stage_clean(ctx):
+    return clean_players(ctx["raw"])
+
+
+def stage_gk_merge(ctx):
+    return merge_goalkeeper_stats(ctx["clean"], extract_goalkeeper_stats(ctx["keepers"]))[0]
+
+
+def stage_enrich(ctx):
+    return enrich(ctx["merged"].copy())
+
+
+def stage_load_csv(ctx):
+    clear_cache()
+    return load_dataset(ctx["csv_path"])
+
+
+def stage_filters(ctx):
+    engine = FilterIndex(ctx["frame"])
+    for team, position in FILTER_COMBOS:
+        engine.summary(engine.rows(team, position))
+    return engine
+
+
+def stage_aggregates(ctx):
+    cube = AggregateCube(ctx["frame"])
+    for team, position in FILTER_COMBOS:
+        cube.summary(team, position)
+    cube.team_totals()
+    cube.minutes_distribution()
+    return cube
+
+
+def stage_search(ctx):
+    index = SearchIndex(ctx["frame"]["Player"])
+    for query in SEARCH_QUERIES:
+        index.search(query, limit=50)
+    return index
+
+
+def stage_leaderboards(ctx):
+    boards = LeaderboardIndex(ctx["frame"], ctx["filters"])
+    for metric in boards.metrics:
+        boards.table(metric, 10)
+    boards.table("Goals_per_90", 10, min_minutes=500, position="FW")
+    return boards
+
+
+def stage_percentiles(ctx):
+    return PercentileRanks(ctx["frame"])
+
+
+def stage_compare(ctx):
+    # A 20-player shortlist: one name lookup, one gather
+    shortlist = ctx["frame"]["Player"].iloc[::max(1, len(ctx["frame"]) // 20)][:20]
+    rows = ctx["filters"].first_rows(shortlist)
+    return comparison_table(ctx["frame"], rows, ctx["percentiles"].players(rows))
+
+
+def stage_similarity(ctx):
+    index = SimilarityIndex(ctx["frame"])
+    index.neighbours(np.arange(min(100, len(ctx["frame"]))), k=10, position="MF", min_minutes=450)
+    return index
+
+
+# name -> (function, context key its result is stored under)
+STAGES = {
+    "clean": (stage_clean, "clean"),
+    "gk_merge": (stage_gk_merge, "merged"),
+    "enrich": (stage_enrich, "frame"),
+    "load_csv": (stage_load_csv, None),
+    "filters": (stage_filters, "filters"),
+    "aggregates": (stage_aggregates, None),
+    "search": (stage_search, None),
+    "leaderboards": (stage_leaderboards, None),
+    "percentiles": (stage_percentiles, "percentiles"),
+    "compare": (stage_compare, None),
+    "similarity": (stage_similarity, None),
+}
+
+
+def peak_mib(fn, ctx):
+    tracemalloc.start()
+    try:
+        fn(ctx)
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def run_size(rows, stages, repeat, tmp):
+    ctx = {"raw": make_kaggle_players(rows)}
+    ctx["keepers"] = make_keepers_table(ctx["raw"])
+    results = []
+    for name, (fn, key) in STAGES.items():
+        if name == "load_csv":
+            ctx["csv_path"] = os.path.join(tmp, f"players_{rows}.csv")
+            ctx["merged"].to_csv(ctx["csv_path"], index=False)
+
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = fn(ctx)
+            times.append(time.perf_counter() - start)
+        if key is not None:
+            ctx[key] = result
+
+        # Later stages need earlier outputs, so skipped stages still run once
+        if name not in stages:
+            continue
+        results.append({
+            "stage": name,
+            "rows": rows,
+            "seconds_median": float(np.median(times)),
+            "seconds_min": float(min(times)),
+            "peak_mib": round(peak_mib(fn, ctx), 2),
+        })
+        print(f"{rows:>9} {name:<13} {results[-1]['seconds_median'] * 1000:10.1f} ms  "
+              f"{results[-1]['peak_mib']:9.1f} MiB", flush=True)
+    return results
+
+
+def metadata():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": time.time(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+    }
+
+
+def regressions(results, baseline, threshold):
+    previous = {(r["stage"], r["rows"]): r for r in baseline["results"]}
+    slower = []
+    for r in results:
+        old = previous.get((r["stage"], r["rows"]))
+        if old and old["seconds_median"] > 0 and r["seconds_median"] / old["seconds_median"] > threshold:
+            slower.append((r["stage"], r["rows"], old["seconds_median"], r["seconds_median"]))
+    return slower
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark every data pipeline and dashboard stage")
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES, help="dataset sizes in rows")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage")
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES), help="stages to report")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON results file")
+    parser.add_argument("--baseline", help="previous JSON results file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="slowdown ratio vs the baseline reported as a regression")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.sizes:
+            results.extend(run_size(rows, set(args.stages), args.repeat, tmp))
+
+    with open(args.output, "w", encoding="utf-8") as fh:
+        json.dump({"meta": metadata(), "results": results}, fh, indent=2)
+    print(f"✓ Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            slower = regressions(results, json.load(fh), args.threshold)
+        for stage, rows, old, new in slower:
+            print(f"⚠️ {stage} at {rows} rows: {old * 1000:.1f} ms -> {new * 1000:.1f} ms")
+        if slower:
+            sys.exit(1)
+        print(f"✓ No stage slower than {args.threshold}x the baseline")
+
+
+if __name__ == "__main__":
+    main()
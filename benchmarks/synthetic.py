@@ -0,0 +1,89 @@
+"""Synthetic player datasets matching the premier_league_stats.csv schema."""
+
+import numpy as np
+import pandas as pd
+
+TEAMS = [
+    "Arsenal", "Aston Villa", "Bournemouth", "Brentford", "Brighton", "Chelsea",
+    "Crystal Palace", "Everton", "Fulham", "Ipswich Town", "Leicester City",
+    "Liverpool", "Manchester City", "Manchester Utd", "Newcastle Utd",
+    "Nott'ham Forest", "Southampton", "Tottenham", "West Ham", "Wolves",
+]
+POSITIONS = ["GK", "DF", "MF", "FW"]
+NATIONS = ["ENG", "FRA", "ESP", "BRA", "NOR", "EGY", "BEL", "POR", "NED", "GER"]
+
+
+def make_players(n, seed=0):
+    rng = np.random.default_rng(seed)
+    position = rng.choice(POSITIONS, n, p=[0.08, 0.34, 0.36, 0.22])
+    minutes = rng.integers(0, 3420, n)
+    df = pd.DataFrame({
+        "Player": [f"Player {i}" for i in range(n)],
+        "Nationality": rng.choice(NATIONS, n),
+        "Position": position,
+        "Team": rng.choice(TEAMS, n),
+        "Age": rng.integers(17, 39, n),
+        "Year_Born": rng.integers(1986, 2008, n),
+        "Goals": rng.poisson(2.5, n),
+        "Assists": rng.poisson(1.8, n),
+        "Appearances": np.minimum(minutes // 60, 38),
+        "Minutes": minutes,
+        "xG": (rng.random(n) * 12).round(1),
+        "xAG": (rng.random(n) * 8).round(1),
+        "Progressive_Carries": rng.integers(0, 150, n),
+        "Progressive_Passes": rng.integers(0, 250, n),
+        "Progressive_Receptions": rng.integers(0, 300, n),
+    })
+    gk = position == "GK"
+    df["Clean_Sheets"] = np.where(gk, rng.integers(0, 16, n), np.nan)
+    df["Goals_Against"] = np.where(gk, rng.integers(5, 70, n), np.nan)
+    df["Save_Percentage"] = np.where(gk, (rng.random(n) * 40 + 50).round(1), np.nan)
+    return df
+
+
+RAW_POSITIONS = ["GK", "DF", "MF", "FW", "FW,MF", "MF,FW", "DF,MF", "DF,FW", "MF,DF"]
+RAW_NATIONS = ["eng ENG", "fr FRA", "es ESP", "br BRA", "no NOR", "eg EGY", "be BEL", "pt POR", "nl NED", "de GER"]
+
+
+def make_kaggle_players(n, seed=0):
+    """Raw player table in the Kaggle / FBref column naming that clean_players expects."""
+    rng = np.random.default_rng(seed)
+    minutes = rng.integers(0, 3420, n)
+    return pd.DataFrame({
+        "Rk": np.arange(1, n + 1),
+        "Player": [f"Player {i}" for i in range(n)],
+        "Nation": rng.choice(RAW_NATIONS, n),
+        "Pos": rng.choice(RAW_POSITIONS, n, p=[0.08, 0.3, 0.3, 0.16, 0.04, 0.04, 0.03, 0.02, 0.03]),
+        "Squad": rng.choice(TEAMS, n),
+        "Age": rng.integers(17, 39, n),
+        "Born": rng.integers(1986, 2008, n),
+        "MP": np.minimum(minutes // 60, 38),
+        "Starts": np.minimum(minutes // 90, 38),
+        "Min": minutes,
+        "Gls": rng.poisson(2.5, n),
+        "Ast": rng.poisson(1.8, n),
+        "xG": (rng.random(n) * 12).round(1),
+        "xAG": (rng.random(n) * 8).round(1),
+        "PrgC": rng.integers(0, 150, n),
+        "PrgP": rng.integers(0, 250, n),
+        "PrgR": rng.integers(0, 300, n),
+    })
+
+
+def make_keepers_table(raw, seed=0):
+    """FBref keepers table (two-level headers, header row repeated every 25 rows) for the GKs of ``raw``."""
+    rng = np.random.default_rng(seed)
+    gk = raw[raw["Pos"] == "GK"]
+    n = len(gk)
+    table = pd.DataFrame({
+        ("Unnamed: 1_level_0", "Player"): gk["Player"].to_numpy(),
+        ("Unnamed: 4_level_0", "Squad"): gk["Squad"].to_numpy(),
+        ("Unnamed: 6_level_0", "Born"): gk["Born"].to_numpy(),
+        ("Performance", "GA"): rng.integers(5, 70, n),
+        ("Performance", "Save%"): (rng.random(n) * 40 + 50).round(1),
+        ("Performance", "CS"): rng.integers(0, 16, n),
+        ("Penalty Kicks", "Save%"): (rng.random(n) * 100).round(1),
+    }).astype(object)
+    header = pd.DataFrame([[col[1] for col in table.columns]], columns=table.columns)
+    chunks = [pd.concat([table.iloc[i:i + 25], header]) for i in range(0, n, 25)]
+    return pd.concat(chunks, ignore_index=True) if chunks else table
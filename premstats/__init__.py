@@ -0,0 +1 @@
+"""Data and compute layer shared by the Premier League dashboard and scraper."""
@@ -0,0 +1,143 @@
+"""Team x position x season aggregate cube.
+
+Player counts, column sums and a squad-minutes histogram are accumulated
+once per dataset version into dense arrays indexed by (partition, team,
+position mask), where a partition is one (league, season) of a dataset
+combined by ``partitions.load_partitions``. A sidebar summary or a team comparison then adds up a few
+hundred cells instead of scanning every player row.
+
+Position filters match primary and secondary positions like the sidebar
+does: "MF" adds up every mask cell with the MF bit set. Each player lives
+in exactly one cell, so players are never counted twice.
+"""
+
+import numpy as np
+import pandas as pd
+
+from premstats.cleaning import POSITION_BITS, position_masks
+from premstats.schema import COUNT_DTYPES
+
+# Columns summed per cell; means and per-90 rates are derived from the sums
+SUM_COLUMNS = [
+    "Goals", "Assists", "Minutes", "Appearances", "xG", "xAG",
+    "Progressive_Carries", "Progressive_Passes", "Progressive_Receptions", "Age",
+]
+
+# Squad minutes distribution: [lower, upper) bounds of each bucket
+MINUTE_BINS = [0, 450, 900, 1800, 2700, np.inf]
+MINUTE_LABELS = ["< 450", "450-899", "900-1799", "1800-2699", "2700+"]
+
+MASKS = 16
+
+
+class AggregateCube:
+    def __init__(self, frame):
+        team_codes, teams = pd.factorize(frame["Team"], sort=True)
+        self.teams = [str(team) for team in teams]
+        # Rows without a team still count towards unfiltered totals
+        team_codes = np.where(team_codes < 0, len(self.teams), team_codes)
+
+        # (league, season) pairs; a single partition has no League / Season columns
+        by = [col for col in ("League", "Season") if col in frame.columns]
+        if by:
+            grouped = frame.groupby(by, observed=True, sort=True, dropna=False)
+            period_codes = grouped.ngroup().to_numpy()
+            keys = grouped.size().index.to_frame(index=False)
+            self.periods = list(zip(*[keys[col].astype(str) if col in by else [None] * len(keys)
+                                      for col in ("League", "Season")]))
+        else:
+            period_codes, self.periods = np.zeros(len(frame), dtype=np.int64), [(None, None)]
+        self.leagues = sorted({league for league, _ in self.periods if league is not None})
+        self.seasons = sorted({season for _, season in self.periods if season is not None})
+
+        if "Position_Mask" in frame.columns:
+            masks = frame["Position_Mask"].to_numpy().astype(np.int64)
+        else:
+            masks = position_masks(frame["Position"]).to_numpy().astype(np.int64)
+
+        self.shape = (len(self.periods), len(self.teams) + 1, MASKS)
+        cell = np.ravel_multi_index((period_codes, team_codes, masks), self.shape)
+        cells = int(np.prod(self.shape))
+
+        self.counts = np.bincount(cell, minlength=cells).reshape(self.shape)
+        self.columns = [col for col in SUM_COLUMNS if col in frame.columns]
+        self.sums = {
+            col: np.bincount(cell, weights=np.nan_to_num(frame[col].to_numpy(dtype=np.float64)),
+                             minlength=cells).reshape(self.shape)
+            for col in self.columns
+        }
+
+        minutes = frame["Minutes"].to_numpy(dtype=np.float64) if "Minutes" in frame.columns else np.zeros(len(frame))
+        bucket = np.digitize(np.nan_to_num(minutes), MINUTE_BINS[1:-1])
+        self.minutes_hist = np.bincount(cell * len(MINUTE_LABELS) + bucket,
+                                        minlength=cells * len(MINUTE_LABELS)).reshape(self.shape + (len(MINUTE_LABELS),))
+
+    def _index(self, team=None, position=None, season=None, league=None):
+        periods = [i for i, (lg, ss) in enumerate(self.periods)
+                   if (league is None or lg == league) and (season is None or ss == season)]
+        if team is None:
+            teams = slice(None)
+        elif team in self.teams:
+            teams = [self.teams.index(team)]
+        else:
+            teams = []
+        masks = slice(None) if position is None else [m for m in range(MASKS) if m & POSITION_BITS.get(position, 0)]
+        return np.ix_(*(np.arange(n)[sel] for n, sel in zip(self.shape, (periods, teams, masks))))
+
+    def total(self, column, team=None, position=None, season=None, league=None):
+        """Sum of ``column`` (or the player count for "Players") over the selection."""
+        values = self.counts if column == "Players" else self.sums[column]
+        return values[self._index(team, position, season, league)].sum()
+
+    def summary(self, team=None, position=None, season=None, league=None):
+        """Sidebar totals: players, teams, goals and assists."""
+        index = self._index(team, position, season, league)
+        per_team = self.counts[index].sum(axis=(0, 2))
+        teams = index[1].ravel()
+        return {
+            "players": int(per_team.sum()),
+            "teams": int(np.count_nonzero(per_team[teams < len(self.teams)])),
+            "goals": int(self.sums["Goals"][index].sum()) if "Goals" in self.sums else 0,
+            "assists": int(self.sums["Assists"][index].sum()) if "Assists" in self.sums else 0,
+        }
+
+    def team_totals(self, position=None, season=None, teams=None, league=None):
+        """One row per team with players: totals, xG difference, per-90 rates and mean age."""
+        index = self._index(None, position, season, league)
+        players = self.counts[index].sum(axis=(0, 2))[:len(self.teams)]
+        table = pd.DataFrame({"Team": self.teams, "Players": players})
+        for col in self.columns:
+            values = self.sums[col][index].sum(axis=(0, 2))[:len(self.teams)]
+            table[col] = values.round().astype(np.int64) if col in COUNT_DTYPES else values
+
+        minutes = table["Minutes"].where(table["Minutes"] > 0) if "Minutes" in table else None
+        if "xG" in table and "Goals" in table:
+            table["Goals - xG"] = (table["Goals"] - table["xG"]).round(1)
+        if minutes is not None:
+            for col in ("Goals", "Assists", "xG", "xAG"):
+                if col in table:
+                    table[f"{col}_per_90"] = (table[col] / minutes * 90).round(2)
+        if "Age" in table:
+            table["Avg_Age"] = (table.pop("Age") / table["Players"].where(table["Players"] > 0)).round(1)
+
+        for col in ("xG", "xAG"):
+            if col in table:
+                table[col] = table[col].round(1)
+        table = table[table["Players"] > 0]
+        if teams is not None:
+            table = table[table["Team"].isin(teams)]
+        return table.reset_index(drop=True)
+
+    def minutes_distribution(self, position=None, season=None, teams=None, league=None):
+        """Players per squad-minutes bucket, one row per team."""
+        index = self._index(None, position, season, league)
+        hist = self.minutes_hist[index].sum(axis=(0, 2))[:len(self.teams)]
+        table = pd.DataFrame(hist, index=pd.Index(self.teams, name="Team"), columns=MINUTE_LABELS)
+        table = table[table.sum(axis=1) > 0]
+        if teams is not None:
+            table = table[table.index.isin(teams)]
+        return table
+
+
+def aggregate_cube(dataset):
+    return dataset.memo("aggregates", lambda ds: AggregateCube(ds.frame))
@@ -0,0 +1,375 @@
+"""Headless HTTP/JSON API over the same datasets and indexes as the dashboard.
+
+Run with ``python -m premstats.api [--host HOST] [--port PORT]``. Every
+endpoint is a GET returning JSON and accepts ``league`` and ``season`` to
+pick a partition (default: the latest Premier League season). Repeating
+them selects several partitions at once, e.g. ``season=2023-2024&season=2024-2025``;
+rows then carry League and Season fields:
+
+    /partitions
+    /teams?position=FW&season=2023-2024&season=2024-2025
+    /player?name=Bukayo Saka
+    /search?q=saka&page=1&per_page=20
+    /leaderboards/Goals_per_90?team=Arsenal&position=FW&min_minutes=900&page=2
+    /compare?player=Bukayo Saka&player=Mohamed Salah
+    /similar?name=Bukayo Saka&k=10&min_minutes=450&same_position=true
+
+Responses are cached per dataset version and carry an ETag. The dataset
+behind a league / season is re-checked against the files on disk at most
+once per ``DATASET_CHECK_INTERVAL``, so a repeated query costs a couple of
+dictionary lookups and new data from the scraper shows up within a second.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+from premstats import partitions
+from premstats.aggregates import aggregate_cube
+from premstats.filters import filter_index
+from premstats.leaderboards import leaderboards
+from premstats.percentiles import percentile_ranks
+from premstats.search import search_index
+from premstats.similarity import similarity_index
+
+DEFAULT_PER_PAGE = 20
+MAX_PER_PAGE = 200
+
+# Encoded responses kept per process, least recently used first
+MAX_CACHED_RESPONSES = 2048
+
+# Seconds a resolved league / season dataset is reused before the files are checked again
+DATASET_CHECK_INTERVAL = 1.0
+
+logger = logging.getLogger("premstats.api")
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ResponseLRU:
+    def __init__(self, max_entries=MAX_CACHED_RESPONSES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+response_cache = ResponseLRU()
+
+
+def _param(params, name, default=None):
+    values = params.get(name)
+    return values[0] if values else default
+
+
+def _int_param(params, name, default, minimum=0, maximum=None):
+    value = _param(params, name)
+    if value is None:
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        raise ApiError(400, f"{name} must be an integer")
+    if value < minimum or (maximum is not None and value > maximum):
+        raise ApiError(400, f"{name} must be between {minimum} and {maximum if maximum is not None else 'any'}")
+    return value
+
+
+def _bool_param(params, name, default):
+    value = _param(params, name)
+    if value is None:
+        return default
+    return value.lower() in ("1", "true", "yes")
+
+
+def _page(params):
+    page = _int_param(params, "page", 1, minimum=1)
+    per_page = _int_param(params, "per_page", DEFAULT_PER_PAGE, minimum=1, maximum=MAX_PER_PAGE)
+    return page, per_page
+
+
+def _paginated(items, total, page, per_page):
+    return {
+        "items": items,
+        "page": page,
+        "per_page": per_page,
+        "total": int(total),
+        "pages": -(-int(total) // per_page),
+    }
+
+
+def _records(frame):
+    # float32 columns go through their shortest repr ("89.9"), so responses
+    # carry the value as stored rather than 89.900002 widened to double
+    floats = [col for col in frame.columns if frame[col].dtype == "float32"]
+    if floats:
+        frame = frame.assign(**{col: frame[col].to_numpy().astype(str).astype("float64") for col in floats})
+    # pandas handles NaN -> null and numpy scalars in one pass
+    return json.loads(frame.to_json(orient="records"))
+
+
+def select_partitions(params):
+    """(league, season) pairs named by the ``league`` / ``season`` params.
+
+    Every listed season of every listed league; the latest season of each
+    league when no season is given.
+    """
+    available = partitions.catalog()
+    if not available:
+        raise ApiError(503, "no player data found, run scrape_fbref.py first")
+    selection = []
+    for league in params.get("league") or [partitions.DEFAULT_LEAGUE]:
+        seasons = sorted(season for lg, season in available if lg == league)
+        if not seasons:
+            raise ApiError(404, f"unknown league {league!r}")
+        for season in params.get("season") or [seasons[-1]]:
+            if season not in seasons:
+                raise ApiError(404, f"no {league} data for season {season!r}")
+            selection.append((league, season))
+    return selection
+
+
+def select_dataset(params):
+    """Dataset of the selected partitions, combined when there are several."""
+    return partitions.load_partitions(select_partitions(params))
+
+
+# (league, season) params -> (monotonic time resolved, dataset)
+_resolved = {}
+
+
+def resolve_dataset(params):
+    """``select_dataset``, checking the manifest and files at most once per interval."""
+    key = (tuple(params.get("league", ())), tuple(params.get("season", ())))
+    now = time.monotonic()
+    resolved = _resolved.get(key)
+    if resolved is not None and now - resolved[0] < DATASET_CHECK_INTERVAL:
+        return resolved[1]
+    dataset = select_dataset(params)
+    _resolved[key] = (now, dataset)
+    return dataset
+
+
+def _columns(frame, columns):
+    # Rows of a multi-partition dataset say which league season they come from
+    return columns + [col for col in ("League", "Season") if col in frame.columns]
+
+
+def _player_rows(dataset, name):
+    engine = filter_index(dataset)
+    rows = engine.player_rows(engine.all_rows, name)
+    if not len(rows):
+        raise ApiError(404, f"unknown player {name!r}")
+    return rows
+
+
+def _player_payload(dataset, rows):
+    ranks = percentile_ranks(dataset)
+    players = _records(dataset.frame.iloc[rows])
+    for player, ranked in zip(players, _records(ranks.table.iloc[rows].round(1))):
+        player["percentiles"] = ranked
+    return players
+
+
+def get_partitions(params, dataset):
+    return [{"league": league, "season": season} for league, season in partitions.catalog()]
+
+
+def get_teams(params, dataset):
+    cube = aggregate_cube(dataset)
+    position = _param(params, "position")
+    # A single partition is loaded as is, without League / Season columns
+    labels = select_partitions(params) if cube.periods == [(None, None)] else cube.periods
+    return {"version": dataset.version, "partitions": [
+        {"league": label[0], "season": label[1],
+         "teams": _records(cube.team_totals(position=position, league=league, season=season))}
+        for label, (league, season) in zip(labels, cube.periods)
+    ]}
+
+
+def get_player(params, dataset):
+    name = _param(params, "name")
+    if not name:
+        raise ApiError(400, "name is required")
+    return {"version": dataset.version, "players": _player_payload(dataset, _player_rows(dataset, name))}
+
+
+def get_search(params, dataset):
+    query = _param(params, "q", "")
+    page, per_page = _page(params)
+    rows = search_index(dataset).search(query)
+    hits = rows[(page - 1) * per_page:page * per_page]
+    items = _records(dataset.frame.iloc[hits][_columns(dataset.frame, ["Player", "Team", "Position", "Nationality", "Age"])])
+    return _paginated(items, len(rows), page, per_page)
+
+
+def get_leaderboard(params, dataset, metric):
+    boards = leaderboards(dataset)
+    if metric not in boards.metrics:
+        raise ApiError(404, f"unknown metric {metric!r}, expected one of {boards.metrics}")
+    page, per_page = _page(params)
+    mask = boards.mask(
+        team=_param(params, "team"),
+        position=_param(params, "position"),
+        min_minutes=_int_param(params, "min_minutes", 0),
+    )
+    rows = boards.top(metric, page * per_page, mask=mask)[(page - 1) * per_page:]
+    total = boards.count(metric, mask=mask)
+
+    items = _records(dataset.frame.iloc[rows][
+        _columns(dataset.frame, ["Player", "Team", "Position", "Appearances", "Minutes", metric])])
+    for rank, item in enumerate(items, start=(page - 1) * per_page + 1):
+        item["rank"] = rank
+    return _paginated(items, total, page, per_page)
+
+
+def get_compare(params, dataset):
+    names = params.get("player", [])
+    if len(names) < 2:
+        raise ApiError(400, "at least two player parameters are required")
+    # The whole shortlist in one lookup
+    rows = filter_index(dataset).first_rows(names)
+    unknown = [name for name, row in zip(names, rows) if row < 0]
+    if unknown:
+        raise ApiError(404, f"unknown player(s) {unknown!r}")
+    return {"version": dataset.version, "players": _player_payload(dataset, rows)}
+
+
+def get_similar(params, dataset):
+    name = _param(params, "name")
+    if not name:
+        raise ApiError(400, "name is required")
+    row = _player_rows(dataset, name)[0]
+    k = _int_param(params, "k", 10, minimum=1, maximum=MAX_PER_PAGE)
+    same_position = _bool_param(params, "same_position", True)
+    rows, distances = similarity_index(dataset).similar(
+        row,
+        k,
+        position=int(dataset.frame["Position_Mask"].iat[row]) if same_position else None,
+        min_minutes=_int_param(params, "min_minutes", 0),
+    )
+    items = _records(dataset.frame.iloc[rows][_columns(dataset.frame, ["Player", "Team", "Position", "Minutes"])])
+    for item, distance in zip(items, distances):
+        item["distance"] = round(float(distance), 4)
+    return {"player": name, "items": items}
+
+
+ROUTES = {
+    "/partitions": get_partitions,
+    "/teams": get_teams,
+    "/player": get_player,
+    "/search": get_search,
+    "/compare": get_compare,
+    "/similar": get_similar,
+}
+
+
+def route(path, params, dataset):
+    if path in ROUTES:
+        return ROUTES[path](params, dataset)
+    if path.startswith("/leaderboards/"):
+        return get_leaderboard(params, dataset, unquote(path[len("/leaderboards/"):]))
+    raise ApiError(404, f"unknown endpoint {path}")
+
+
+def _error(status, message):
+    return status, json.dumps({"error": message}).encode(), None
+
+
+def respond(path, params):
+    """``(status, body bytes, etag)`` for a request, served from the cache when possible."""
+    try:
+        # Resolved once per request; the cache key carries its version, so a
+        # refreshed file is never served stale
+        if path == "/partitions":
+            dataset, version = None, tuple(partitions.catalog())
+        else:
+            dataset = resolve_dataset(params)
+            version = dataset.version
+        key = (path, tuple(sorted((k, tuple(v)) for k, v in params.items())), version)
+        cached = response_cache.get(key)
+        if cached is not None:
+            return (200,) + cached
+        payload = route(path, params, dataset)
+        body = json.dumps(payload, allow_nan=False).encode()
+    except ApiError as e:
+        return _error(e.status, str(e))
+    except Exception as e:
+        logger.exception("error handling %s %s", path, params)
+        return _error(500, f"internal error: {type(e).__name__}")
+    etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+    response_cache.put(key, (body, etag))
+    return 200, body, etag
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        status, body, etag = respond(url.path.rstrip("/") or "/", parse_qs(url.query))
+        if etag is not None and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if etag is not None:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Quiet by default: one line per request would dominate at hundreds of requests/sec
+        pass
+
+
+def serve(host="127.0.0.1", port=8000):
+    server = ThreadingHTTPServer((host, port), ApiHandler)
+    print(f"Serving the player stats API on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP/JSON API over the player stats dataset")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    serve(args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""Rendered-chart cache for the dashboard.
+
+Charts are drawn once into PNG bytes and kept in a process-wide LRU cache
+bounded by total size, so every session asking for the same chart gets the
+same bytes. Sessions that miss the same key at the same moment wait for a
+single draw instead of each drawing it. Figures are built with ``matplotlib.figure.Figure`` rather than
+pyplot, so nothing is left registered in pyplot's global figure list, and
+each figure is cleared as soon as it has been saved.
+
+Per-player charts are keyed on the values they plot, so an unchanged player
+keeps a cache hit across an incremental refresh; dataset-wide charts are
+keyed on the dataset version.
+"""
+
+import io
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from premstats.instrument import count, span
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class ChartCache:
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        # key -> lock held by the session drawing it, until the chart is cached
+        self._drawing = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key, data):
+        with self._lock:
+            if key in self._entries:
+                self.size -= len(self._entries.pop(key))
+            self._entries[key] = data
+            self.size += len(data)
+            while self.size > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+chart_cache = ChartCache()
+
+
+def render(key, draw, figsize, fmt="png"):
+    """PNG (or SVG) bytes for ``key``, calling ``draw(fig)`` only on a cache miss."""
+    key = (fmt,) + tuple(key)
+    data = chart_cache.get(key)
+    if data is not None:
+        count("chart_cache.hit")
+        return data
+
+    # Single flight: sessions missing the same key at once wait for one draw
+    with chart_cache._lock:
+        key_lock = chart_cache._drawing.setdefault(key, threading.Lock())
+    try:
+        with key_lock:
+            with chart_cache._lock:
+                data = chart_cache._entries.get(key)
+            if data is not None:
+                count("chart_cache.hit")
+                return data
+            count("chart_cache.miss")
+            data = _draw(key, draw, figsize, fmt)
+            chart_cache.put(key, data)
+            return data
+    finally:
+        with chart_cache._lock:
+            if chart_cache._drawing.get(key) is key_lock:
+                del chart_cache._drawing[key]
+
+
+def _draw(key, draw, figsize, fmt):
+    with span(f"chart.render.{key[1]}"):
+        # Imported here so sessions that never draw a chart never load matplotlib
+        from matplotlib.figure import Figure
+
+        fig = Figure(figsize=figsize)
+        try:
+            draw(fig)
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format=fmt, dpi=150, bbox_inches="tight")
+        finally:
+            fig.clear()
+    return buffer.getvalue()
+
+
+def bar_chart(player, labels, values, colors):
+    values = [int(v) for v in values]
+
+    def draw(fig):
+        ax = fig.subplots()
+        ax.bar(labels, values, color=colors)
+        ax.set_ylabel("Count", fontsize=11)
+        ax.grid(axis='y', alpha=0.3)
+
+    return render(("bar", player, tuple(labels), tuple(values)), draw, (6, 4))
+
+
+def top_five_chart(version, top5_scorers, top5_assisters):
+    def draw(fig):
+        ax1, ax2 = fig.subplots(1, 2)
+
+        # Top Scorers Chart
+        ax1.barh(top5_scorers['Player'], top5_scorers['Goals'], color='#FF6B6B')
+        ax1.set_xlabel('Goals')
+        ax1.set_title('Top 5 Goal Scorers')
+        ax1.invert_yaxis()
+
+        # Top Assisters Chart
+        ax2.barh(top5_assisters['Player'], top5_assisters['Assists'], color='#4ECDC4')
+        ax2.set_xlabel('Assists')
+        ax2.set_title('Top 5 Assist Providers')
+        ax2.invert_yaxis()
+
+        fig.tight_layout()
+
+    # Identical for every session, so it renders once per dataset version
+    return render(("top5", version), draw, (14, 5))
+
+
+def comparison_chart(players, labels, values):
+    """Grouped bars: one group per stat in ``labels``, one bar per player."""
+    players = tuple(players)
+    values = tuple(tuple(float(v) for v in row) for row in values)
+
+    def draw(fig):
+        x = np.arange(len(labels))
+        width = 0.8 / max(len(players), 1)
+
+        ax = fig.subplots()
+        for i, (player, row) in enumerate(zip(players, values)):
+            ax.bar(x - 0.4 + width * (i + 0.5), row, width, label=player, alpha=0.8)
+
+        ax.set_xlabel('Statistics')
+        ax.set_ylabel('Value')
+        ax.set_title('Player Comparison')
+        ax.set_xticks(x)
+        ax.set_xticklabels(labels)
+        # Long shortlists get their legend beside the plot
+        if len(players) > 6:
+            ax.legend(loc='upper left', bbox_to_anchor=(1.01, 1), fontsize=8, ncol=1 + len(players) // 16)
+        else:
+            ax.legend()
+        ax.grid(axis='y', alpha=0.3)
+
+    return render(("compare", players, tuple(labels), values), draw, (10, 6))
+
+
+def radar_chart(players, labels, percentiles):
+    """Percentile radar of one or more players over the same ``labels``.
+
+    Missing percentiles (NaN) leave a gap in the player's outline.
+    """
+    players = tuple(players)
+    # None rather than NaN in the cache key: NaN never compares equal
+    percentiles = tuple(tuple(None if np.isnan(v) else round(float(v), 1) for v in values)
+                        for values in percentiles)
+
+    def draw(fig):
+        angles = np.linspace(0, 2 * np.pi, len(labels), endpoint=False)
+        closed = np.append(angles, angles[0])
+
+        ax = fig.add_subplot(projection="polar")
+        for player, values in zip(players, percentiles):
+            values = np.array([np.nan if v is None else v for v in values + values[:1]], dtype=float)
+            ax.plot(closed, values, linewidth=2, label=player)
+            known = ~np.isnan(values)
+            ax.fill(closed[known], values[known], alpha=0.2)
+
+        ax.set_theta_offset(np.pi / 2)
+        ax.set_theta_direction(-1)
+        ax.set_xticks(angles)
+        ax.set_xticklabels(labels, fontsize=9)
+        ax.set_ylim(0, 100)
+        ax.set_yticks([25, 50, 75, 100])
+        ax.set_yticklabels(["25", "50", "75", "100"], fontsize=7, color="grey")
+        if len(players) > 1:
+            ax.legend(loc="upper right", bbox_to_anchor=(1.3, 1.1))
+
+    return render(("radar", players, tuple(labels), percentiles), draw, (6, 6))
+
+
+def xg_chart(teams, xg, goals):
+    """Team goals against expected goals, with the goals = xG diagonal."""
+    teams = tuple(teams)
+    xg = tuple(round(float(v), 1) for v in xg)
+    goals = tuple(int(v) for v in goals)
+
+    def draw(fig):
+        ax = fig.subplots()
+        ax.scatter(xg, goals, s=60, color='#667eea', alpha=0.8)
+        for team, x, y in zip(teams, xg, goals):
+            ax.annotate(team, (x, y), textcoords="offset points", xytext=(5, 3), fontsize=8)
+        top = max(max(xg, default=0), max(goals, default=0)) * 1.05 or 1
+        ax.plot([0, top], [0, top], linestyle='--', color='grey', linewidth=1, label='Goals = xG')
+        ax.set_xlim(0, top)
+        ax.set_ylim(0, top)
+        ax.set_xlabel('Expected Goals (xG)')
+        ax.set_ylabel('Goals')
+        ax.legend(loc='upper left')
+        ax.grid(alpha=0.3)
+
+    return render(("xg", teams, xg, goals), draw, (8, 6))
+
+
+def minutes_distribution_chart(teams, labels, counts):
+    """Stacked bars: each team's players per squad-minutes bucket."""
+    teams = tuple(teams)
+    counts = tuple(tuple(int(v) for v in row) for row in counts)
+
+    def draw(fig):
+        ax = fig.subplots()
+        values = np.array(counts, dtype=float).reshape(len(teams), len(labels))
+        left = np.zeros(len(teams))
+        colors = ['#e0e0e0', '#c3cfe2', '#8fa3e8', '#667eea', '#764ba2']
+        for i, label in enumerate(labels):
+            ax.barh(teams, values[:, i], left=left, label=label, color=colors[i % len(colors)])
+            left += values[:, i]
+        ax.invert_yaxis()
+        ax.set_xlabel('Players')
+        ax.legend(title='Minutes played', loc='lower right', fontsize=8)
+        ax.grid(axis='x', alpha=0.3)
+
+    return render(("minutes", teams, tuple(labels), counts), draw, (10, max(3, 0.35 * len(teams) + 1)))
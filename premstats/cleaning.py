@@ -0,0 +1,178 @@
+"""Cleaning of the raw Kaggle / FBref player table into the dashboard schema."""
+
+import numpy as np
+import pandas as pd
+
+
+# Standardize positions - handle multiple separators and classify properly
+# (scalar reference implementation; standardize_positions is the vectorized one)
+def standardize_position(pos):
+    if pd.isna(pos):
+        return 'Unknown'
+
+    # Convert to string and clean
+    pos_str = str(pos).strip()
+
+    # Split by comma or space to get primary position
+    for sep in [',', ' ']:
+        if sep in pos_str:
+            pos_str = pos_str.split(sep)[0].strip()
+            break
+
+    # Categorize versatile players
+    # FW,MF or MF,FW (wingers, attacking mids) -> classify as their primary position
+    pos_upper = pos_str.upper()
+
+    # Standard positions
+    if pos_upper in ['GK', 'DF', 'MF', 'FW']:
+        return pos_upper
+
+    # If it's still combined after split, take first 2 characters
+    if len(pos_upper) > 2:
+        return pos_upper[:2]
+
+    return pos_upper
+
+
+# Clean nationality - extract just the 3-letter country code
+# (scalar reference implementation; clean_nationalities is the vectorized one)
+def clean_nationality(nat):
+    if pd.isna(nat):
+        return 'Unknown'
+    # Nationality format is like "eng ENG" or "ch SUI" - take the last 3 characters
+    nat_str = str(nat).strip()
+    # Split by space and take the last part (the uppercase code)
+    parts = nat_str.split()
+    if len(parts) > 1:
+        return parts[-1]  # Return the last part (e.g., "ENG", "SUI", "USA")
+    return nat_str.upper()
+
+
+# Bit per position for Position_Mask, which keeps every listed position
+# (e.g. "FW,MF" -> FW | MF) while Position keeps only the primary one
+POSITION_BITS = {'GK': 1, 'DF': 2, 'MF': 4, 'FW': 8}
+
+
+def position_mask(pos):
+    if pd.isna(pos):
+        return 0
+    mask = 0
+    for token in str(pos).replace(',', ' ').split():
+        mask |= POSITION_BITS.get(token.strip().upper(), 0)
+    return mask
+
+
+def _map_unique(values, fn):
+    # Categorical mapping: factorize once (in C), run the scalar cleaner on each
+    # distinct value only, then broadcast back. Output is identical to
+    # values.apply(fn) by construction, because both cleaners start with str()
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    if not all(isinstance(u, str) for u in uniques):
+        # Non-strings hash-collide (5 == 5.0) though str() tells them apart
+        codes, uniques = pd.factorize(values.astype(str).where(values.notna()), use_na_sentinel=True)
+    # The extra trailing slot is what the NA sentinel (-1) picks up
+    mapped = np.array([fn(u) for u in uniques] + [fn(np.nan)], dtype=object)
+    return pd.Series(mapped[codes], index=values.index, dtype=object)
+
+
+def position_masks(positions):
+    """Vectorized position_mask over a Series, as uint8."""
+    return _map_unique(positions, position_mask).astype('uint8')
+
+
+def has_position(frame, position):
+    """Boolean array: rows listing ``position`` as primary or secondary position."""
+    if 'Position_Mask' in frame.columns:
+        return (frame['Position_Mask'].to_numpy() & POSITION_BITS.get(position, 0)) != 0
+    return (frame['Position'] == position).to_numpy()
+
+
+def standardize_positions(positions):
+    """Vectorized standardize_position over a Series, with identical output."""
+    return _map_unique(positions, standardize_position)
+
+
+def clean_nationalities(nationalities):
+    """Vectorized clean_nationality over a Series, with identical output."""
+    return _map_unique(nationalities, clean_nationality)
+
+
+def source_columns(columns):
+    """Source columns clean_players keeps, out of a raw table's ``columns``."""
+    columns = set(columns)
+
+    # Basic columns for all players
+    base_cols = ['Player', 'Nation', 'Pos', 'Squad', 'Age', 'Born', 'Gls', 'Ast', 'MP', 'Min']
+
+    # Advanced metrics available in dataset
+    advanced_cols = []
+    if 'xG' in columns:
+        advanced_cols.append('xG')
+    if 'xAG' in columns:
+        advanced_cols.append('xAG')
+    if 'PrgC' in columns:  # Progressive Carries
+        advanced_cols.append('PrgC')
+    if 'PrgP' in columns:  # Progressive Passes
+        advanced_cols.append('PrgP')
+    if 'PrgR' in columns:  # Progressive Receptions
+        advanced_cols.append('PrgR')
+
+    # Check for goalkeeper-specific columns (if they exist)
+    gk_cols = []
+    if 'CS' in columns:  # Clean Sheets
+        gk_cols.append('CS')
+    if 'GA' in columns:  # Goals Against
+        gk_cols.append('GA')
+    if 'Save%' in columns or 'Saves%' in columns:  # Save Percentage
+        gk_cols.append('Save%' if 'Save%' in columns else 'Saves%')
+
+    # Combine columns
+    all_cols = base_cols + advanced_cols + gk_cols
+    return [col for col in all_cols if col in columns]
+
+
+def clean_players(df):
+    df_clean = df[source_columns(df.columns)].copy()
+
+    # Rename basic columns
+    rename_map = {
+        'Player': 'Player',
+        'Nation': 'Nationality',
+        'Pos': 'Position',
+        'Squad': 'Team',
+        'Age': 'Age',
+        'Born': 'Year_Born',
+        'Gls': 'Goals',
+        'Ast': 'Assists',
+        'MP': 'Appearances',
+        'Min': 'Minutes'
+    }
+
+    # Add advanced metric renames
+    if 'xG' in df_clean.columns:
+        rename_map['xG'] = 'xG'
+    if 'xAG' in df_clean.columns:
+        rename_map['xAG'] = 'xAG'
+    if 'PrgC' in df_clean.columns:
+        rename_map['PrgC'] = 'Progressive_Carries'
+    if 'PrgP' in df_clean.columns:
+        rename_map['PrgP'] = 'Progressive_Passes'
+    if 'PrgR' in df_clean.columns:
+        rename_map['PrgR'] = 'Progressive_Receptions'
+
+    # Add GK stat renames if they exist
+    if 'CS' in df_clean.columns:
+        rename_map['CS'] = 'Clean_Sheets'
+    if 'GA' in df_clean.columns:
+        rename_map['GA'] = 'Goals_Against'
+    if 'Save%' in df_clean.columns:
+        rename_map['Save%'] = 'Save_Percentage'
+    if 'Saves%' in df_clean.columns:
+        rename_map['Saves%'] = 'Save_Percentage'
+
+    df_clean = df_clean.rename(columns=rename_map)
+
+    df_clean['Position_Mask'] = position_masks(df_clean['Position'])
+    df_clean['Position'] = standardize_positions(df_clean['Position'])
+    df_clean['Nationality'] = clean_nationalities(df_clean['Nationality'])
+    return df_clean
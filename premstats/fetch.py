@@ -0,0 +1,224 @@
+"""Concurrent, rate-limited fetching of FBref stat tables.
+
+Every request goes through one pooled ``requests.Session`` and a shared
+token bucket, so raising the worker count never raises the request rate
+FBref sees. 403/429 and 5xx responses are retried with exponential
+backoff (honouring ``Retry-After``), and each table has an overall
+deadline that covers all of its retries.
+"""
+
+import random
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+
+import pandas as pd
+
+BASE_URL = "https://fbref.com/en/comps"
+
+# FBref competition ids, keyed by the slug used in their URLs
+COMPETITIONS = {
+    "Premier-League": 9,
+    "La-Liga": 12,
+    "Serie-A": 11,
+    "Bundesliga": 20,
+    "Ligue-1": 13,
+}
+
+# URL segment -> id of the player-level table on that page
+STAT_TABLES = {
+    "stats": "stats_standard",
+    "keepers": "stats_keeper",
+    "shooting": "stats_shooting",
+    "passing": "stats_passing",
+    "defense": "stats_defense",
+    "possession": "stats_possession",
+}
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none',
+    'Cache-Control': 'max-age=0'
+}
+
+# Statuses worth retrying: FBref answers rate limiting with 403 as well as 429
+RETRY_STATUSES = {403, 429, 500, 502, 503, 504}
+
+
+class FetchJob(namedtuple("FetchJob", ["competition", "season", "table"])):
+    """One FBref stat table; ``season`` is e.g. "2023-2024", or None for the current season."""
+
+    @property
+    def url(self):
+        comp_id = COMPETITIONS[self.competition]
+        if self.season:
+            return f"{BASE_URL}/{comp_id}/{self.season}/{self.table}/{self.season}-{self.competition}-Stats"
+        return f"{BASE_URL}/{comp_id}/{self.table}/{self.competition}-Stats"
+
+
+# FetchResult.source: "network", "revalidated" (304), "stale" (cached copy
+# served after an error) or "offline"
+class FetchResult(namedtuple("FetchResult", ["job", "table", "error", "seconds", "source"])):
+    @property
+    def ok(self):
+        return self.error is None
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` requests per second, bursts up to ``capacity``."""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, deadline=None):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            if deadline is not None and time.monotonic() + wait > deadline:
+                raise TimeoutError("rate limiter wait exceeds the table deadline")
+            time.sleep(wait)
+
+
+def make_session(pool_size):
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def parse_table(html, table):
+    # FBref ships most player tables inside HTML comments; uncomment them first
+    html = html.replace("<!--", "").replace("-->", "")
+    table_id = STAT_TABLES.get(table)
+    try:
+        frames = pd.read_html(StringIO(html), attrs={"id": table_id}) if table_id else []
+    except (ValueError, ImportError):
+        # No match (pandas reports it as a failed fallback parser import when
+        # bs4/html5lib are not installed)
+        frames = []
+    if not frames:
+        # Fall back to the first table with a player column
+        frames = [f for f in pd.read_html(StringIO(html)) if any("Player" in str(c) for c in f.columns)]
+    if not frames:
+        raise ValueError(f"no player table found for {table!r}")
+    return frames[0]
+
+
+class Fetcher:
+    def __init__(self, rate=0.5, burst=1, workers=4, max_retries=4, backoff=2.0,
+                 timeout=60.0, session=None, cache=None):
+        self.cache = cache
+        self.bucket = TokenBucket(rate, burst)
+        self.workers = workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.session = session
+        if session is None and not (cache is not None and cache.offline):
+            self.session = make_session(workers)
+
+    def _delay(self, attempt, response=None):
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff * (2 ** attempt) * (1 + random.random() / 2)
+
+    def get(self, url, deadline=None):
+        """GET ``url`` with caching, rate limiting and backoff.
+
+        Returns ``(body, source)`` where source is one of the FetchResult
+        sources.
+        """
+        if self.cache is not None and self.cache.offline:
+            return self.cache.offline_body(url), "offline"
+
+        entry = self.cache.lookup(url) if self.cache is not None else None
+        try:
+            return self._get(url, entry, deadline)
+        except Exception:
+            if entry is None:
+                raise
+            # Stale-on-error: an old table beats no table
+            return entry.body, "stale"
+
+    def _get(self, url, entry, deadline):
+        import requests
+
+        if deadline is None:
+            deadline = time.monotonic() + self.timeout
+        headers = self.cache.conditional_headers(entry) if self.cache is not None else {}
+        attempt = 0
+        while True:
+            self.bucket.acquire(deadline)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"deadline exceeded fetching {url}")
+
+            response = None
+            try:
+                response = self.session.get(url, headers=headers, timeout=remaining)
+                if response.status_code == 304 and entry is not None:
+                    return entry.body, "revalidated"
+                if response.status_code not in RETRY_STATUSES:
+                    response.raise_for_status()
+                    if self.cache is not None:
+                        self.cache.store(url, response.text, response.headers)
+                    return response.text, "network"
+                error = requests.exceptions.HTTPError(f"{response.status_code} for {url}", response=response)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                error = e
+
+            if attempt >= self.max_retries:
+                raise error
+            delay = self._delay(attempt, response)
+            if time.monotonic() + delay >= deadline:
+                raise error
+            time.sleep(delay)
+            attempt += 1
+
+    def fetch(self, job):
+        start = time.monotonic()
+        try:
+            html, source = self.get(job.url, deadline=start + self.timeout)
+            return FetchResult(job, parse_table(html, job.table), None, time.monotonic() - start, source)
+        except Exception as e:
+            return FetchResult(job, None, e, time.monotonic() - start, None)
+
+    def fetch_all(self, jobs):
+        """Fetch ``jobs`` concurrently; returns ``{job: FetchResult}`` in job order."""
+        jobs = list(jobs)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            results = list(pool.map(self.fetch, jobs))
+        return dict(zip(jobs, results))
+
+
+def make_jobs(competitions, seasons, tables):
+    return [FetchJob(comp, season, table)
+            for comp in competitions
+            for season in seasons
+            for table in tables]
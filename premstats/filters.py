@@ -0,0 +1,104 @@
+"""Sidebar filter engine: team / position filters resolved to row-index arrays.
+
+Per-team and per-position row sets are built once per dataset version, so a
+filter combination costs one sorted-array intersection (cached) instead of
+copying and masking the whole frame for every rerun of every session.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from premstats.cleaning import POSITION_BITS, has_position
+
+
+class FilterIndex:
+    def __init__(self, frame):
+        self.frame = frame
+        self.all_rows = np.arange(len(frame))
+        self._players = frame["Player"].to_numpy()
+
+        self.team_codes, teams = pd.factorize(frame["Team"], sort=True)
+        self.teams = [str(team) for team in teams]
+        order = np.argsort(self.team_codes, kind="stable")
+        bounds = np.searchsorted(self.team_codes[order], np.arange(len(self.teams) + 1))
+        self._team_rows = {team: np.sort(order[bounds[i]:bounds[i + 1]]) for i, team in enumerate(self.teams)}
+
+        self._position_rows = {pos: np.flatnonzero(has_position(frame, pos)) for pos in POSITION_BITS}
+        self.positions = [pos for pos in POSITION_BITS if len(self._position_rows[pos])]
+
+        self._combos = {}
+        self._masks = {}
+        self._first = None
+        self._lock = threading.Lock()
+
+    def rows(self, team=None, position=None):
+        """Sorted row positions matching the filters (None means no filter)."""
+        combo = (team, position)
+        cached = self._combos.get(combo)
+        if cached is not None:
+            return cached
+
+        rows = self.all_rows
+        if team is not None:
+            rows = self._team_rows.get(team, rows[:0])
+        if position is not None:
+            rows = np.intersect1d(rows, self._position_rows.get(position, rows[:0]), assume_unique=True)
+
+        with self._lock:
+            self._combos[combo] = rows
+        return rows
+
+    def mask(self, team=None, position=None):
+        """Boolean row mask for the filters, or None when unfiltered."""
+        if team is None and position is None:
+            return None
+        combo = (team, position)
+        cached = self._masks.get(combo)
+        if cached is None:
+            cached = np.zeros(len(self.frame), dtype=bool)
+            cached[self.rows(team, position)] = True
+            with self._lock:
+                self._masks[combo] = cached
+        return cached
+
+    def player_options(self, rows):
+        """Distinct player names among ``rows`` (in row order) and each name's first row."""
+        names = self._players[rows]
+        _, first = np.unique(names, return_index=True)
+        first.sort()
+        return names[first].tolist(), rows[first]
+
+    def first_rows(self, players):
+        """First row of each name in ``players`` across the whole frame (-1 if unknown)."""
+        if self._first is None:
+            names, first = np.unique(self._players, return_index=True)
+            with self._lock:
+                self._first = (pd.Index(names), first)
+        names, first = self._first
+        positions = names.get_indexer(list(players))
+        return np.where(positions >= 0, first[positions], -1)
+
+    def player_rows(self, rows, player):
+        return rows[self._players[rows] == player]
+
+    def view(self, rows, columns=None):
+        """Materialize only ``columns`` of ``rows`` (all columns if None)."""
+        if columns is None:
+            return self.frame.iloc[rows]
+        return self.frame.iloc[rows, [self.frame.columns.get_loc(col) for col in columns]]
+
+    def summary(self, rows):
+        """Sidebar totals for ``rows``: players, teams, goals and assists."""
+        codes = self.team_codes[rows]
+        return {
+            "players": len(rows),
+            "teams": int(np.count_nonzero(np.bincount(codes[codes >= 0], minlength=len(self.teams)))),
+            "goals": int(self.frame["Goals"].to_numpy()[rows].sum()),
+            "assists": int(self.frame["Assists"].to_numpy()[rows].sum()),
+        }
+
+
+def filter_index(dataset):
+    return dataset.memo("filters", lambda ds: FilterIndex(ds.frame))
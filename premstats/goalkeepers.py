@@ -0,0 +1,111 @@
+"""Keyed join of FBref goalkeeper stats onto the player table.
+
+Columns are picked by explicit (header group, column) pairs rather than
+substring matching: FBref's keepers table has two "Save%" columns (overall
+and penalties) and several names containing "cs"/"ga". Rows are matched on
+the incremental-refresh player key (name + birth year + team) through a
+hash index, so a player listed twice never fans out the main table.
+"""
+
+from collections import Counter
+
+import pandas as pd
+
+from premstats.incremental import player_keys
+
+# Output column -> (FBref header group, FBref column). An empty group matches
+# the ungrouped identity columns ("Unnamed: N_level_0" in pandas).
+GK_COLUMNS = {
+    'Player': ('', 'Player'),
+    'Team': ('', 'Squad'),
+    'Year_Born': ('', 'Born'),
+    'Clean_Sheets': ('Performance', 'CS'),
+    'Goals_Against': ('Performance', 'GA'),
+    'Save_Percentage': ('Performance', 'Save%'),
+}
+
+GK_STAT_COLUMNS = ['Clean_Sheets', 'Goals_Against', 'Save_Percentage']
+
+
+def _find_column(columns, group, name):
+    for col in columns:
+        if isinstance(col, tuple):
+            top, leaf = str(col[0]), str(col[-1])
+            if leaf == name and (top == group or (not group and top.startswith('Unnamed'))):
+                return col
+        elif col == name:
+            # Flat headers: pandas suffixes repeats ("Save%.1"), so the first is the overall one
+            return col
+    return None
+
+
+def extract_goalkeeper_stats(gk_df):
+    """Goalkeeper stats with dashboard column names, or None if the table is unrecognised."""
+    found = {out: _find_column(gk_df.columns, *src) for out, src in GK_COLUMNS.items()}
+    if found['Player'] is None or not any(found[col] is not None for col in GK_STAT_COLUMNS):
+        return None
+
+    gk_stats = pd.DataFrame({out: gk_df[col].to_numpy() for out, col in found.items() if col is not None})
+
+    # FBref repeats the header row every 25 rows
+    gk_stats['Player'] = gk_stats['Player'].astype(str).str.strip()
+    gk_stats = gk_stats[gk_stats['Player'] != 'Player']
+
+    for col in GK_STAT_COLUMNS + ['Year_Born']:
+        if col in gk_stats.columns:
+            gk_stats[col] = pd.to_numeric(gk_stats[col], errors='coerce')
+    return gk_stats.reset_index(drop=True)
+
+
+def merge_goalkeeper_stats(players, gk_stats):
+    """Left-join ``gk_stats`` onto ``players`` by player key.
+
+    Returns ``(merged, report)``; ``merged`` always has exactly one row per
+    row of ``players``.
+    """
+    stat_cols = [col for col in GK_STAT_COLUMNS if col in gk_stats.columns]
+    key_cols = [col for col in ('Year_Born', 'Team') if col in gk_stats.columns and col in players.columns]
+
+    # Key both sides the same way; drop columns the GK table can't key on
+    player_key = player_keys(players[['Player'] + key_cols])
+    gk_keys = player_keys(gk_stats[['Player'] + key_cols])
+
+    duplicated = gk_keys.duplicated()
+    indexed = gk_stats.loc[~duplicated, stat_cols].set_index(gk_keys[~duplicated])
+
+    # Hash lookup of every player key; the unique index rules out fan-out
+    aligned = indexed.reindex(player_key.to_numpy())
+    aligned.index = players.index
+    merged = pd.concat([players.drop(columns=stat_cols, errors='ignore'), aligned], axis=1)
+
+    # Object-dtype isin hashes in C; on Arrow-backed strings it loops in Python
+    matched = gk_keys[~duplicated].astype(object).isin(player_key.astype(object))
+    has_stats = merged[stat_cols].notna().any(axis=1)
+    is_gk = (players['Position'] == 'GK') if 'Position' in players.columns else pd.Series(False, index=players.index)
+    report = {
+        'key': ['Player'] + key_cols,
+        'goalkeeper_rows': int(len(gk_stats)),
+        'matched': int(matched.sum()),
+        'duplicate_keys': sorted(set(gk_keys[duplicated])),
+        'unmatched_goalkeeper_rows': gk_stats.loc[~duplicated][~matched.to_numpy()]['Player'].tolist(),
+        'goalkeepers_without_stats': players.loc[is_gk & ~has_stats, 'Player'].tolist(),
+    }
+    return merged, report
+
+
+def combine_reports(reports):
+    """One join report for a player table merged in chunks against the same GK table."""
+    first = reports[0]
+    # A goalkeeper row is unmatched only if no chunk matched it
+    unmatched = Counter(first['unmatched_goalkeeper_rows'])
+    for report in reports[1:]:
+        unmatched &= Counter(report['unmatched_goalkeeper_rows'])
+    keyed_rows = first['matched'] + len(first['unmatched_goalkeeper_rows'])
+    return {
+        'key': first['key'],
+        'goalkeeper_rows': first['goalkeeper_rows'],
+        'matched': keyed_rows - sum(unmatched.values()),
+        'duplicate_keys': first['duplicate_keys'],
+        'unmatched_goalkeeper_rows': list(unmatched.elements()),
+        'goalkeepers_without_stats': [name for report in reports for name in report['goalkeepers_without_stats']],
+    }
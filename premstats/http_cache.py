@@ -0,0 +1,87 @@
+"""On-disk HTTP response cache for the FBref fetcher.
+
+Bodies are stored with their ETag / Last-Modified validators so re-runs can
+send conditional requests, and a cached copy is served when FBref blocks
+or fails a request. In offline mode nothing touches the network: responses
+come from the cache or from a directory of fixture HTML files.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from collections import namedtuple
+from urllib.parse import urlparse
+
+CacheEntry = namedtuple("CacheEntry", ["url", "body", "etag", "last_modified", "fetched_at"])
+
+
+class CacheMiss(LookupError):
+    pass
+
+
+class ResponseCache:
+    def __init__(self, directory=".fbref_cache", offline=False, fixtures_dir=None):
+        self.directory = directory
+        self.offline = offline
+        self.fixtures_dir = fixtures_dir
+        os.makedirs(directory, exist_ok=True)
+
+    def _base(self, url):
+        return os.path.join(self.directory, hashlib.sha256(url.encode()).hexdigest()[:32])
+
+    @staticmethod
+    def fixture_name(url):
+        # e.g. /en/comps/9/keepers/Premier-League-Stats -> 9_keepers_Premier-League-Stats.html
+        path = urlparse(url).path.split("/comps/", 1)[-1].strip("/")
+        return path.replace("/", "_") + ".html"
+
+    def lookup(self, url):
+        base = self._base(url)
+        try:
+            with open(base + ".json", encoding="utf-8") as fh:
+                meta = json.load(fh)
+            with open(base + ".html", encoding="utf-8") as fh:
+                body = fh.read()
+        except (OSError, ValueError):
+            return None
+        return CacheEntry(url, body, meta.get("etag"), meta.get("last_modified"), meta.get("fetched_at"))
+
+    def _write(self, path, text):
+        # Write-then-rename so concurrent workers never read a partial file
+        fd, tmp = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write(text)
+        os.replace(tmp, path)
+
+    def store(self, url, body, headers):
+        base = self._base(url)
+        meta = {
+            "url": url,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+        }
+        self._write(base + ".html", body)
+        self._write(base + ".json", json.dumps(meta))
+
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def offline_body(self, url):
+        entry = self.lookup(url)
+        if entry is not None:
+            return entry.body
+        if self.fixtures_dir:
+            path = os.path.join(self.fixtures_dir, self.fixture_name(url))
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as fh:
+                    return fh.read()
+        raise CacheMiss(f"offline and no cached response or fixture for {url}")
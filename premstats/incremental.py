@@ -0,0 +1,123 @@
+"""Incremental refresh: diff a new scrape against the last snapshot by player key.
+
+A player is identified by normalized name + birth year + team, so a player
+who moves club mid-season is one removal and one insertion. Each refresh
+appends a changelog entry recording which keys changed. The changelog is an
+audit trail: a new file version still rebuilds every cached index.
+"""
+
+import json
+import os
+import time
+import warnings
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from premstats.search import normalize_all
+
+KEY_COLUMN = "Player_Key"
+
+Changes = namedtuple("Changes", ["inserted", "updated", "removed"])
+
+
+def changelog_path(csv_path):
+    return os.path.splitext(csv_path)[0] + ".changelog.jsonl"
+
+
+def player_keys(df):
+    names = normalize_all(df["Player"])
+    if "Year_Born" in df.columns:
+        born = pd.to_numeric(df["Year_Born"], errors="coerce").astype("Int64").astype(str).replace("<NA>", "")
+    else:
+        born = pd.Series("", index=df.index)
+    teams = normalize_all(df["Team"]) if "Team" in df.columns else ""
+    return names + "|" + born + "|" + teams
+
+
+def _keyed(df):
+    keys = player_keys(df)
+    duplicated = keys.duplicated()
+    if duplicated.any():
+        # Repeats of a key are told apart by their order in the file, so the
+        # n-th "Name|born|team" row is diffed against the n-th one of the old file
+        warnings.warn(f"{int(duplicated.sum())} duplicate player key(s), numbered in file order")
+        ordinal = keys.groupby(keys).cumcount()
+        keys = keys.where(ordinal == 0, keys + "#" + ordinal.astype(str))
+    return df.set_index(keys.rename(KEY_COLUMN))
+
+
+def _row_hashes(keyed, columns):
+    frame = keyed[columns]
+    # Numbers are hashed as float64 at a fixed precision: one NaN turns an int
+    # column into floats after a CSV round-trip, and 5 and 5.0 hash differently
+    numeric = [col for col in columns
+               if pd.api.types.is_numeric_dtype(frame[col]) and not pd.api.types.is_bool_dtype(frame[col])]
+    if numeric:
+        frame = frame.assign(**{
+            col: np.round(frame[col].to_numpy(dtype="float64", na_value=np.nan), 6) for col in numeric
+        })
+    return pd.Series(pd.util.hash_pandas_object(frame, index=False).to_numpy(), index=keyed.index)
+
+
+def diff_frames(old, new):
+    """Keys inserted, updated and removed going from ``old`` to ``new``."""
+    old_keyed = _keyed(old)
+    new_keyed = _keyed(new)
+
+    inserted = new_keyed.index.difference(old_keyed.index)
+    removed = old_keyed.index.difference(new_keyed.index)
+    shared = new_keyed.index.intersection(old_keyed.index)
+
+    if set(old_keyed.columns) != set(new_keyed.columns):
+        # Schema change (e.g. a new stat column): every shared row is an update
+        updated = shared
+    else:
+        # Hash each row once instead of comparing cell by cell
+        columns = sorted(new_keyed.columns)
+        old_hash = _row_hashes(old_keyed.loc[shared], columns)
+        new_hash = _row_hashes(new_keyed.loc[shared], columns)
+        updated = shared[old_hash.to_numpy() != new_hash.to_numpy()]
+
+    return Changes(list(inserted), list(updated), list(removed))
+
+
+def apply_changes(old, new, changes):
+    """``old`` with only the changed rows touched: unchanged rows keep their order."""
+    if not (changes.inserted or changes.updated or changes.removed):
+        return old
+    old_keyed = _keyed(old)
+    new_keyed = _keyed(new)
+    columns = list(new_keyed.columns)
+
+    result = old_keyed.drop(index=changes.removed).reindex(columns=columns)
+    result.loc[changes.updated, columns] = new_keyed.loc[changes.updated, columns]
+    result = pd.concat([result, new_keyed.loc[changes.inserted, columns]])
+    return result.reset_index(drop=True)
+
+
+def read_changelog(csv_path):
+    path = changelog_path(csv_path)
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as fh:
+        return [json.loads(line) for line in fh if line.strip()]
+
+
+def append_changelog(csv_path, changes, versions, source_hash=None, previous_versions=None):
+    """Record a refresh; ``changes`` is None for a full rebuild."""
+    entry = {
+        "timestamp": time.time(),
+        "versions": versions,
+        "previous_versions": previous_versions or [],
+        "source_hash": source_hash,
+        "full": changes is None,
+        "inserted": changes.inserted if changes is not None else [],
+        "updated": changes.updated if changes is not None else [],
+        "removed": changes.removed if changes is not None else [],
+    }
+    with open(changelog_path(csv_path), "a", encoding="utf-8") as fh:
+        fh.write(json.dumps(entry) + "\n")
+    return entry
+
@@ -0,0 +1,59 @@
+"""Streaming ingestion: clean a raw player table chunk by chunk.
+
+Only the columns clean_players keeps are parsed, each chunk is cleaned and
+written out before the next one is read, so peak memory depends on the
+chunk size rather than on the size of the source file.
+"""
+
+import os
+import tempfile
+
+import pandas as pd
+
+from premstats import snapshot
+from premstats.cleaning import clean_players, source_columns
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+def read_header(path):
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def iter_clean_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Cleaned chunks of the raw table at ``path``, reading only the kept columns."""
+    usecols = source_columns(read_header(path))
+    for chunk in pd.read_csv(path, usecols=usecols, chunksize=chunk_size):
+        yield clean_players(chunk)
+
+
+def stream_players(path, output_csv, chunk_size=DEFAULT_CHUNK_SIZE, transform=None):
+    """Clean ``path`` into ``output_csv`` (and its snapshot) chunk by chunk.
+
+    ``transform`` is applied to each cleaned chunk before it is written, e.g.
+    to join goalkeeper stats. Returns ``(rows, snapshot_written)``.
+    """
+    directory = os.path.dirname(os.path.abspath(output_csv))
+    fd, tmp_csv = tempfile.mkstemp(dir=directory, suffix=".csv")
+    os.close(fd)
+    writer = snapshot.SnapshotWriter(snapshot.snapshot_path(output_csv)) if snapshot.available() else None
+
+    rows = 0
+    try:
+        for i, chunk in enumerate(iter_clean_chunks(path, chunk_size)):
+            if transform is not None:
+                chunk = transform(chunk)
+            chunk.to_csv(tmp_csv, mode="w" if i == 0 else "a", header=i == 0, index=False)
+            if writer is not None:
+                writer.write(chunk)
+            rows += len(chunk)
+    except BaseException:
+        os.remove(tmp_csv)
+        if writer is not None:
+            writer.abort()
+        raise
+
+    # CSV first: the loader only prefers a snapshot that is not older than it
+    os.replace(tmp_csv, output_csv)
+    written = writer.close() if writer is not None else False
+    return rows, written
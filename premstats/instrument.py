@@ -0,0 +1,174 @@
+"""Lightweight timing spans and counters for the dashboard hot paths.
+
+A trace covers one unit of work (a Streamlit rerun). Spans opened while it
+is active are recorded in it with their nesting, and also aggregated per
+name across the whole process. Counters track cache hits and misses.
+Traces run in the thread that started them, and Streamlit runs every
+session's script in its own thread, so sessions never see each other's
+spans.
+
+Finished traces are logged as one JSON object per line on the
+``premstats.trace`` logger. Set PREMSTATS_TRACE_LOG=<path> to append them
+to a file.
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("premstats.trace")
+
+_local = threading.local()
+_lock = threading.Lock()
+
+# Process-wide aggregates: span name -> [count, total seconds, max seconds]
+_span_totals = defaultdict(lambda: [0, 0.0, 0.0])
+_counters = defaultdict(int)
+
+if os.environ.get("PREMSTATS_TRACE_LOG"):
+    _handler = logging.FileHandler(os.environ["PREMSTATS_TRACE_LOG"], encoding="utf-8")
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+
+
+class Trace:
+    def __init__(self, label, **fields):
+        self.label = label
+        self.fields = fields
+        self.started = time.time()
+        self.spans = []
+        self.counters = defaultdict(int)
+        self._start = time.perf_counter()
+        self._stack = []
+        self.seconds = None
+
+    def finish(self, **fields):
+        """Close the trace, log it as JSON and return the record."""
+        self.seconds = time.perf_counter() - self._start
+        self.fields.update(fields)
+        if getattr(_local, "trace", None) is self:
+            _local.trace = None
+        record = self.to_dict()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps(record, default=str))
+        return record
+
+    def to_dict(self):
+        return {
+            "trace": self.label,
+            "timestamp": self.started,
+            "ms": round(self.seconds * 1000, 3) if self.seconds is not None else None,
+            "spans": [{"name": name, "depth": depth, "ms": round(seconds * 1000, 3)}
+                      for name, depth, seconds in self.spans],
+            "counters": dict(self.counters),
+            **self.fields,
+        }
+
+
+def start_trace(label, **fields):
+    """Begin a trace for the current thread, replacing any unfinished one."""
+    trace = Trace(label, **fields)
+    _local.trace = trace
+    return trace
+
+
+def current_trace():
+    return getattr(_local, "trace", None)
+
+
+@contextmanager
+def span(name):
+    trace = current_trace()
+    if trace is not None:
+        # Reserve the slot now so spans are listed in the order they opened
+        slot = len(trace.spans)
+        trace.spans.append((name, len(trace._stack), 0.0))
+        trace._stack.append(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        if trace is not None:
+            trace._stack.pop()
+            trace.spans[slot] = (name, trace.spans[slot][1], seconds)
+        with _lock:
+            totals = _span_totals[name]
+            totals[0] += 1
+            totals[1] += seconds
+            totals[2] = max(totals[2], seconds)
+
+
+def count(name, n=1):
+    """Bump a counter, e.g. ``count("chart_cache.hit")``."""
+    trace = current_trace()
+    if trace is not None:
+        trace.counters[name] += n
+    with _lock:
+        _counters[name] += n
+
+
+def span_totals():
+    """Process-wide span aggregates as a frame, slowest total first."""
+    with _lock:
+        rows = [(name, c, total * 1000, total / c * 1000, peak * 1000)
+                for name, (c, total, peak) in _span_totals.items()]
+    frame = pd.DataFrame(rows, columns=["Span", "Calls", "Total ms", "Mean ms", "Max ms"])
+    return frame.sort_values("Total ms", ascending=False, ignore_index=True).round(2)
+
+
+def counters():
+    with _lock:
+        return dict(_counters)
+
+
+def snapshot():
+    """Everything aggregated so far, as a JSON-serializable dict."""
+    return {
+        "timestamp": time.time(),
+        "process_rss_mib": process_rss_mib(),
+        "spans": span_totals().to_dict("records"),
+        "counters": counters(),
+    }
+
+
+def reset():
+    with _lock:
+        _span_totals.clear()
+        _counters.clear()
+
+
+def process_rss_mib():
+    # Current resident set size; /proc is Linux only
+    try:
+        with open("/proc/self/statm") as fh:
+            return round(int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20, 1)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def object_bytes(value):
+    """Approximate memory held by one value (frames and arrays by their buffers)."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=False).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=False))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    return sys.getsizeof(value)
+
+
+def session_bytes(state):
+    """Approximate memory held by one session's state mapping."""
+    return sum(object_bytes(value) for value in state.values())
@@ -0,0 +1,103 @@
+"""Precomputed leaderboard rankings, built once per dataset version."""
+
+import numpy as np
+import pandas as pd
+
+from premstats.filters import FilterIndex, filter_index
+from premstats.instrument import span
+
+# Metrics users can rank by, in the order they are offered in the dashboard
+RANKED_METRICS = [
+    "Goals",
+    "Assists",
+    "Total Contributions",
+    "Goals_per_90",
+    "Assists_per_90",
+    "G+A_per_90",
+    "xG",
+    "xAG",
+    "Progressive_Carries",
+    "Progressive_Passes",
+    "Progressive_Receptions",
+    "Clean_Sheets",
+    "Clean_Sheet_%",
+    "Save_Percentage",
+]
+
+
+class LeaderboardIndex:
+    """Descending row orderings for every ranked metric in a frame.
+
+    Orderings match ``DataFrame.nlargest(keep="first")``: ties keep their
+    original row order and NaN values are never ranked.
+    """
+
+    def __init__(self, frame, filters=None):
+        self.frame = frame
+        self.filters = filters if filters is not None else FilterIndex(frame)
+        self.metrics = [m for m in RANKED_METRICS if m in frame.columns]
+        self._orders = {}
+        for metric in self.metrics:
+            values = frame[metric].to_numpy(dtype="float64", na_value=np.nan)
+            order = np.argsort(-values, kind="stable")
+            self._orders[metric] = order[~np.isnan(values[order])]
+
+        self._minutes = frame["Minutes"].to_numpy() if "Minutes" in frame.columns else None
+
+    def mask(self, team=None, position=None, min_minutes=0):
+        """Boolean row mask for a filter combination, or None when unfiltered."""
+        masks = []
+        if team is not None or position is not None:
+            masks.append(self.filters.mask(team, position))
+        if min_minutes and self._minutes is not None:
+            masks.append(self._minutes >= min_minutes)
+        if not masks:
+            return None
+        return np.logical_and.reduce(masks) if len(masks) > 1 else masks[0]
+
+    def top(self, metric, n=10, mask=None, **filters):
+        """Positional row indices of the top ``n`` rows for ``metric``."""
+        order = self._orders[metric]
+        if mask is None:
+            mask = self.mask(**filters)
+        if mask is None:
+            return order[:n]
+
+        # Walk the ranking in growing chunks: unselective filters finish in the
+        # first chunk without touching the rest of the ordering
+        found = []
+        count = 0
+        start = 0
+        step = max(4 * n, 256)
+        while start < len(order) and count < n:
+            chunk = order[start:start + step]
+            hits = chunk[mask[chunk]]
+            found.append(hits)
+            count += len(hits)
+            start += step
+            step *= 4
+        if not found:
+            return order[:0]
+        return np.concatenate(found)[:n]
+
+    def count(self, metric, mask=None, **filters):
+        """Number of ranked rows for ``metric`` that match the filters."""
+        order = self._orders[metric]
+        if mask is None:
+            mask = self.mask(**filters)
+        return len(order) if mask is None else int(np.count_nonzero(mask[order]))
+
+    def table(self, metric, n=10, columns=None, mask=None, **filters):
+        """Top ``n`` rows as a frame indexed by rank (1, 2, 3...)."""
+        with span("leaderboard.table"):
+            rows = self.top(metric, n, mask=mask, **filters)
+            result = self.frame.iloc[rows]
+            if columns is not None:
+                result = result[[col for col in columns if col in result.columns]]
+            result = result.copy()
+            result.index = pd.RangeIndex(1, len(result) + 1)
+            return result
+
+
+def leaderboards(dataset):
+    return dataset.memo("leaderboards", lambda ds: LeaderboardIndex(ds.frame, filter_index(ds)))
@@ -0,0 +1,156 @@
+"""Process-wide, versioned loading of the player statistics dataset."""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from premstats import snapshot
+from premstats.instrument import count, span
+from premstats.cleaning import position_masks
+from premstats.metrics import add_derived_metrics
+from premstats.schema import NULLABLE_COLUMNS, compact
+
+DEFAULT_PATH = "premier_league_stats.csv"
+
+# Parsed datasets keyed by absolute path, shared by every session in the process.
+# Least recently used first: with one file per league season, only the
+# partitions sessions are actually looking at stay in memory
+MAX_CACHED = 8
+_cache = OrderedDict()
+_lock = threading.Lock()
+# One lock per path, held while that file is hashed and parsed
+_path_locks = {}
+
+
+class Dataset:
+    """An enriched, parsed dataset pinned to one version of the file on disk."""
+
+    def __init__(self, path, frame, version, stat_key):
+        self.path = path
+        self.frame = frame
+        self.version = version
+        self.stat_key = stat_key
+        self._memo = {}
+        # Re-entrant: builders may depend on other memoized structures
+        self._memo_lock = threading.RLock()
+
+    def view(self):
+        # Shallow copy: shares the column data, but columns added or replaced by
+        # a session never leak into the process-wide frame
+        return self.frame.copy(deep=False)
+
+    def memo(self, name, build):
+        # Derived structures (indexes, rankings...) built once per dataset version
+        with self._memo_lock:
+            if name not in self._memo:
+                count("memo.miss")
+                with span(f"build.{name}"):
+                    self._memo[name] = build(self)
+            else:
+                count("memo.hit")
+            return self._memo[name]
+
+
+def enrich(df):
+    # Files written before Position_Mask existed only know the primary position
+    if "Position_Mask" not in df.columns:
+        df["Position_Mask"] = position_masks(df["Position"])
+
+    add_derived_metrics(df)
+
+    # Undefined ratios (0 minutes, 0 goals...) read as 0. Goalkeeper columns
+    # keep NaN so "no goalkeeper stats" stays distinguishable from 0; only
+    # columns that actually hold NaN are rewritten, so memory-mapped snapshot
+    # columns stay zero-copy
+    for col in df.columns:
+        if col in NULLABLE_COLUMNS or isinstance(df[col].dtype, pd.CategoricalDtype):
+            continue
+        if df[col].hasnans:
+            df[col] = df[col].fillna(0)
+
+    # Categoricals, int16/int32 counts and float32 rates
+    compact(df)
+    return df
+
+
+def _resolve_source(path):
+    # Prefer the typed snapshot written next to the CSV, unless the CSV is newer
+    snap = snapshot.snapshot_path(path)
+    if snapshot.available() and os.path.exists(snap):
+        if not os.path.exists(path) or os.stat(snap).st_mtime_ns >= os.stat(path).st_mtime_ns:
+            return snap
+    return path
+
+
+def _stat_key(source):
+    st = os.stat(source)
+    return (source, st.st_mtime_ns, st.st_size)
+
+
+def content_hash(path):
+    digest = hashlib.blake2b(digest_size=8)
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _parse(source):
+    with span("loader.read"):
+        if source.endswith(".feather"):
+            df = snapshot.read_snapshot(source)
+        else:
+            df = pd.read_csv(source)
+    with span("loader.enrich"):
+        return enrich(df)
+
+
+def load_dataset(path=DEFAULT_PATH):
+    """Return the enriched dataset for ``path``, re-parsing only when the file changed."""
+    path = os.path.abspath(path)
+    source = _resolve_source(path)
+    stat_key = _stat_key(source)
+
+    with _lock:
+        cached = _cache.get(path)
+        if cached is not None and cached.stat_key == stat_key:
+            _cache.move_to_end(path)
+            count("dataset_cache.hit")
+            return cached
+        path_lock = _path_locks.setdefault(path, threading.Lock())
+
+    # Hashing and parsing hold only this path's lock: sessions on other
+    # partitions keep hitting the cache, and sessions on this one wait for a
+    # single parse instead of each starting their own
+    with path_lock:
+        with _lock:
+            cached = _cache.get(path)
+            if cached is not None and cached.stat_key == stat_key:
+                _cache.move_to_end(path)
+                count("dataset_cache.hit")
+                return cached
+        count("dataset_cache.miss")
+
+        # The file was touched or rewritten: only re-parse if the content differs
+        version = content_hash(source)
+        if cached is not None and cached.version == version:
+            with _lock:
+                cached.stat_key = stat_key
+                _cache.move_to_end(path)
+            return cached
+
+        dataset = Dataset(path, _parse(source), version, stat_key)
+        with _lock:
+            _cache[path] = dataset
+            _cache.move_to_end(path)
+            while len(_cache) > MAX_CACHED:
+                _cache.popitem(last=False)
+        return dataset
+
+
+def clear_cache():
+    with _lock:
+        _cache.clear()
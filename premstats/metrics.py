@@ -0,0 +1,55 @@
+"""Derived per-player metrics, computed column-wise once per dataset version."""
+
+import numpy as np
+
+
+def _ratio(numerator, denominator, scale=1, decimals=2):
+    # x / 0 is undefined rather than infinite: left as NaN for the caller to fill
+    return (numerator / denominator.where(denominator > 0) * scale).round(decimals)
+
+
+def add_derived_metrics(df):
+    """Add per-90, per-game, efficiency and goalkeeper rate columns to ``df`` in place."""
+    # Calculate advanced statistics (per 90 minutes)
+    df["Goals_per_90"] = _ratio(df["Goals"], df["Minutes"], scale=90)
+    df["Assists_per_90"] = _ratio(df["Assists"], df["Minutes"], scale=90)
+    df["G+A_per_90"] = _ratio(df["Goals"] + df["Assists"], df["Minutes"], scale=90)
+    df["Total Contributions"] = df["Goals"] + df["Assists"]
+
+    # Per game, over matches played
+    df["Minutes_per_Game"] = _ratio(df["Minutes"], df["Appearances"], decimals=0)
+    df["Goals_per_Game"] = _ratio(df["Goals"], df["Appearances"])
+    df["Assists_per_Game"] = _ratio(df["Assists"], df["Appearances"])
+    df["Contributions_per_Game"] = _ratio(df["Total Contributions"], df["Appearances"])
+
+    # Calculate efficiency metrics
+    df["Minutes_per_Goal"] = (df["Minutes"] / df["Goals"]).replace([np.inf, -np.inf], 0).round(0)
+    df["Minutes_per_Contribution"] = (df["Minutes"] / (df["Goals"] + df["Assists"])).replace([np.inf, -np.inf], 0).round(0)
+
+    if "Clean_Sheets" in df.columns:
+        df["Clean_Sheet_%"] = _ratio(df["Clean_Sheets"], df["Appearances"], scale=100, decimals=1)
+    if "Goals_Against" in df.columns:
+        df["Goals_Against_per_Game"] = _ratio(df["Goals_Against"], df["Appearances"])
+    return df
+
+
+# Stored and derived columns shown side by side in a player comparison
+COMPARE_COLUMNS = [
+    "Player", "Team", "Position", "Age", "Appearances", "Minutes", "Goals", "Assists",
+    "Goals_per_Game", "Assists_per_Game", "Goals_per_90", "Assists_per_90", "G+A_per_90",
+    "xG", "xAG", "Clean_Sheets", "Clean_Sheet_%", "Save_Percentage",
+]
+
+
+def comparison_table(frame, rows, percentiles=None):
+    """Comparison rows of the players at positional ``rows``.
+
+    Every ratio is already a column of the enriched frame, so the whole
+    shortlist is one indexed gather. ``percentiles`` (one row per player,
+    e.g. from ``PercentileRanks.players``) is appended as "<metric> %ile".
+    """
+    columns = [col for col in COMPARE_COLUMNS if col in frame.columns]
+    table = frame.iloc[rows, [frame.columns.get_loc(col) for col in columns]].reset_index(drop=True)
+    if percentiles is not None:
+        table = table.join(percentiles.round(0).add_suffix(" %ile"))
+    return table
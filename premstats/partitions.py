@@ -0,0 +1,168 @@
+"""League / season partitioned storage of the player dataset.
+
+Each scrape writes one partition::
+
+    data/league=Premier-League/season=2024-2025/players.csv (+ .feather)
+
+and registers it in ``data/manifest.json``. The dashboard reads the manifest
+to list what is available and only parses the partitions a session selects,
+so ten seasons across five leagues never sit in memory at once.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+from premstats.loader import DEFAULT_PATH, Dataset, load_dataset
+
+DATA_DIR = "data"
+MANIFEST = "manifest.json"
+PARTITION_FILE = "players.csv"
+
+# Default Kaggle source, and what the single-file premier_league_stats.csv holds
+DEFAULT_LEAGUE = "Premier-League"
+DEFAULT_SEASON = "2024-2025"
+
+# Multi-partition datasets built from the per-partition ones, most recent last
+MAX_COMBINED = 4
+_combined = OrderedDict()
+_lock = threading.Lock()
+
+# Parsed manifest per root, re-read only when the file changes
+_manifests = {}
+
+
+def partition_dir(league, season, root=DATA_DIR):
+    return os.path.join(root, f"league={league}", f"season={season}")
+
+
+def partition_path(league, season, root=DATA_DIR):
+    return os.path.join(partition_dir(league, season, root), PARTITION_FILE)
+
+
+def league_label(league):
+    # "Premier-League" -> "Premier League"
+    return league.replace("-", " ")
+
+
+def season_label(season):
+    # "2024-2025" -> "2024-25"
+    start, _, end = season.partition("-")
+    return f"{start}-{end[-2:]}" if end else season
+
+
+def read_manifest(root=DATA_DIR):
+    path = os.path.abspath(os.path.join(root, MANIFEST))
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return {"partitions": []}
+    stat_key = (st.st_mtime_ns, st.st_size)
+    cached = _manifests.get(path)
+    if cached is not None and cached[0] == stat_key:
+        return cached[1]
+    with open(path, encoding="utf-8") as fh:
+        manifest = json.load(fh)
+    _manifests[path] = (stat_key, manifest)
+    return manifest
+
+
+def register_partition(league, season, rows, versions, root=DATA_DIR):
+    """Add or replace the manifest entry of one partition."""
+    return register_partitions([{"league": league, "season": season, "rows": rows, "versions": versions}], root)
+
+
+def register_partitions(entries, root=DATA_DIR):
+    """Add or replace the manifest entries of several partitions in one write.
+
+    Each entry is a dict with league, season, rows and versions.
+    """
+    manifest = dict(read_manifest(root))
+    written = {(e["league"], e["season"]) for e in entries}
+    partitions = [p for p in manifest["partitions"] if (p["league"], p["season"]) not in written]
+    now = time.time()
+    for e in entries:
+        partitions.append({
+            "league": e["league"],
+            "season": e["season"],
+            "path": os.path.relpath(partition_path(e["league"], e["season"], root), root),
+            "rows": int(e["rows"]),
+            "versions": e["versions"],
+            "updated_at": now,
+        })
+    partitions.sort(key=lambda p: (p["league"], p["season"]))
+    manifest["partitions"] = partitions
+
+    # Write-then-rename so a dashboard never reads a partial manifest
+    os.makedirs(root, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=root)
+    with os.fdopen(fd, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2)
+    os.replace(tmp, os.path.join(root, MANIFEST))
+    return manifest
+
+
+def catalog(root=DATA_DIR, legacy_path=DEFAULT_PATH):
+    """Available (league, season) partitions, oldest season first per league.
+
+    Falls back to the single legacy CSV when nothing has been partitioned yet.
+    """
+    entries = [(p["league"], p["season"]) for p in read_manifest(root)["partitions"]]
+    if not entries and os.path.exists(legacy_path):
+        entries = [(DEFAULT_LEAGUE, DEFAULT_SEASON)]
+    return sorted(entries)
+
+
+def _source(league, season, root, legacy_path):
+    path = partition_path(league, season, root)
+    if not os.path.exists(path) and (league, season) == (DEFAULT_LEAGUE, DEFAULT_SEASON):
+        return legacy_path
+    return path
+
+
+def load_partition(league, season, root=DATA_DIR, legacy_path=DEFAULT_PATH):
+    """Dataset of one league season, parsed on first use and cached by version."""
+    return load_dataset(_source(league, season, root, legacy_path))
+
+
+def load_partitions(selection, root=DATA_DIR, legacy_path=DEFAULT_PATH):
+    """One dataset over several (league, season) partitions, with League and Season columns.
+
+    A single partition is returned as loaded, without the extra columns.
+    """
+    selection = sorted(set(selection))
+    if len(selection) == 1:
+        return load_partition(*selection[0], root=root, legacy_path=legacy_path)
+
+    parts = [(league, season, load_partition(league, season, root, legacy_path))
+             for league, season in selection]
+    key = tuple((league, season, ds.version) for league, season, ds in parts)
+
+    with _lock:
+        cached = _combined.get(key)
+        if cached is not None:
+            _combined.move_to_end(key)
+            return cached
+
+    frame = pd.concat(
+        [ds.frame.assign(League=league, Season=season) for league, season, ds in parts],
+        ignore_index=True,
+    )
+    # Categories differ between partitions, so concat falls back to object
+    for col in ("League", "Season", "Team", "Position", "Nationality"):
+        if col in frame.columns:
+            frame[col] = frame[col].astype("category")
+
+    version = "+".join(ds.version for _, _, ds in parts)
+    dataset = Dataset(root, frame, version, key)
+
+    with _lock:
+        _combined[key] = dataset
+        while len(_combined) > MAX_COMBINED:
+            _combined.popitem(last=False)
+    return dataset
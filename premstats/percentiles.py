@@ -0,0 +1,66 @@
+"""Per-position percentile ranks, computed once per dataset version.
+
+Every player is ranked against the players sharing their primary position,
+so a player card or comparison only looks up a row instead of re-ranking
+the whole season. A player without a value (a goalkeeper without goalkeeper
+stats) has no percentile: NaN, never 0.
+"""
+
+import pandas as pd
+
+# Metrics shown on the radar of outfield players and goalkeepers
+OUTFIELD_METRICS = [
+    "Goals_per_90",
+    "Assists_per_90",
+    "G+A_per_90",
+    "xG",
+    "xAG",
+    "Progressive_Carries",
+    "Progressive_Passes",
+    "Progressive_Receptions",
+]
+GOALKEEPER_METRICS = ["Clean_Sheets", "Clean_Sheet_%", "Save_Percentage"]
+
+# Radar axis labels
+LABELS = {
+    "Goals_per_90": "Goals/90",
+    "Assists_per_90": "Assists/90",
+    "G+A_per_90": "G+A/90",
+    "xG": "xG",
+    "xAG": "xAG",
+    "Progressive_Carries": "Prog. Carries",
+    "Progressive_Passes": "Prog. Passes",
+    "Progressive_Receptions": "Prog. Receptions",
+    "Clean_Sheets": "Clean Sheets",
+    "Clean_Sheet_%": "Clean Sheet %",
+    "Save_Percentage": "Save %",
+}
+
+
+class PercentileRanks:
+    def __init__(self, frame):
+        self.metrics = [m for m in OUTFIELD_METRICS + GOALKEEPER_METRICS if m in frame.columns]
+        groups = frame["Position"].astype(str).to_numpy()
+        values = frame[self.metrics].apply(pd.to_numeric, errors="coerce")
+        # One grouped rank over every metric at once: 0-100, ties share the average rank
+        ranks = values.groupby(groups).rank(pct=True) * 100
+        self.table = ranks.astype("float32").reset_index(drop=True)
+
+    def radar_metrics(self, position):
+        metrics = GOALKEEPER_METRICS if position == "GK" else OUTFIELD_METRICS
+        return [m for m in metrics if m in self.metrics]
+
+    def player(self, row, metrics=None):
+        """Percentiles of one positional ``row`` as a Series indexed by metric."""
+        metrics = metrics if metrics is not None else self.metrics
+        return self.table.iloc[row][metrics]
+
+    def players(self, rows, metrics=None):
+        """Percentiles of several positional ``rows`` at once, one row per player."""
+        metrics = metrics if metrics is not None else self.metrics
+        columns = [self.table.columns.get_loc(m) for m in metrics]
+        return self.table.iloc[rows, columns].reset_index(drop=True)
+
+
+def percentile_ranks(dataset):
+    return dataset.memo("percentiles", lambda ds: PercentileRanks(ds.frame))
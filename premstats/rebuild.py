@@ -0,0 +1,132 @@
+"""Parallel rebuild of many league / season partitions.
+
+Each partition is cleaned, joined with its goalkeeper stats and written by
+its own worker process, so a multi-season, multi-league history uses every
+core. Workers only touch their own partition directory; the manifest is
+written once, by the parent, after every worker has finished.
+
+Raw sources are laid out like the partitions themselves::
+
+    <sources>/league=Premier-League/season=2024-2025/<any name>.csv
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from premstats import incremental, ingest, partitions, snapshot
+from premstats.cleaning import clean_players
+from premstats.goalkeepers import combine_reports, merge_goalkeeper_stats
+from premstats.loader import content_hash
+
+JOIN_REPORT = "join_report.json"
+
+
+def find_sources(sources_dir):
+    """(league, season, csv path) of every raw source under ``sources_dir``."""
+    def subdirs(directory, prefix):
+        # Stray files (.DS_Store, notes...) next to the partition directories are skipped
+        return [(name[len(prefix):], os.path.join(directory, name)) for name in sorted(os.listdir(directory))
+                if name.startswith(prefix) and os.path.isdir(os.path.join(directory, name))]
+
+    found = []
+    for league, league_dir in subdirs(sources_dir, "league="):
+        for season, season_dir in subdirs(league_dir, "season="):
+            csv_files = sorted(f for f in os.listdir(season_dir) if f.endswith(".csv"))
+            if csv_files:
+                found.append((league, season, os.path.join(season_dir, csv_files[0])))
+    return found
+
+
+def output_versions(output_csv):
+    return [content_hash(p) for p in (output_csv, snapshot.snapshot_path(output_csv)) if os.path.exists(p)]
+
+
+def write_outputs(df_clean, output_csv):
+    """Write the partition CSV and its typed snapshot; returns whether the snapshot was written."""
+    df_clean.to_csv(output_csv, index=False)
+    return snapshot.write_snapshot(df_clean, snapshot.snapshot_path(output_csv))
+
+
+def write_join_report(report, output_csv):
+    path = os.path.join(os.path.dirname(output_csv), JOIN_REPORT)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+    return path
+
+
+def build_partition(league, season, source, gk_stats=None, root=partitions.DATA_DIR, chunk_size=None):
+    """Clean ``source`` into the (league, season) partition under ``root``.
+
+    Runs in a worker process. Returns the partition's manifest entry plus the
+    goalkeeper join report (None without ``gk_stats``) and the time taken.
+    With ``chunk_size`` the source is streamed instead of read whole.
+    """
+    start = time.perf_counter()
+    output_csv = partitions.partition_path(league, season, root)
+    os.makedirs(os.path.dirname(output_csv), exist_ok=True)
+    previous_versions = output_versions(output_csv)
+
+    reports = []
+    if chunk_size:
+        def join_keepers(chunk):
+            if gk_stats is None:
+                return chunk
+            chunk, chunk_report = merge_goalkeeper_stats(chunk, gk_stats)
+            reports.append(chunk_report)
+            return chunk
+
+        rows, _ = ingest.stream_players(source, output_csv, chunk_size, transform=join_keepers)
+    else:
+        df_clean = clean_players(pd.read_csv(source))
+        if gk_stats is not None:
+            df_clean, report = merge_goalkeeper_stats(df_clean, gk_stats)
+            reports.append(report)
+        write_outputs(df_clean, output_csv)
+        rows = len(df_clean)
+
+    report = combine_reports(reports) if reports else None
+    if report is not None:
+        write_join_report(report, output_csv)
+
+    versions = output_versions(output_csv)
+    incremental.append_changelog(output_csv, None, versions, content_hash(source), previous_versions)
+    return {
+        "entry": {"league": league, "season": season, "rows": rows, "versions": versions},
+        "report": report,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def rebuild(tasks, processes=None, root=partitions.DATA_DIR, chunk_size=None, on_done=None):
+    """Build every partition in ``tasks`` and register them all in one manifest write.
+
+    ``tasks`` are (league, season, source, gk_stats) tuples. ``processes``
+    defaults to the number of cores; 1 builds in this process. ``on_done`` is
+    called with (league, season, result) as each partition finishes.
+    """
+    processes = min(processes or os.cpu_count() or 1, len(tasks)) or 1
+    results = {}
+
+    def done(league, season, result):
+        results[(league, season)] = result
+        if on_done is not None:
+            on_done(league, season, result)
+
+    if processes == 1:
+        for league, season, source, gk_stats in tasks:
+            done(league, season, build_partition(league, season, source, gk_stats, root, chunk_size))
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            futures = {pool.submit(build_partition, league, season, source, gk_stats, root, chunk_size): (league, season)
+                       for league, season, source, gk_stats in tasks}
+            # Reported as each partition finishes; a failed partition raises
+            # here before the manifest is touched
+            for future in as_completed(futures):
+                done(*futures[future], future.result())
+
+    partitions.register_partitions([results[(league, season)]["entry"] for league, season, _, _ in tasks], root)
+    return results
@@ -0,0 +1,58 @@
+"""Column dtypes for the typed player snapshot and the in-memory frame."""
+
+import numpy as np
+import pandas as pd
+
+# Low-cardinality string columns stored as categoricals
+CATEGORICAL_COLUMNS = ["Team", "Position", "Nationality"]
+
+# Integer counts and the smallest dtype that holds a season's worth of them
+COUNT_DTYPES = {
+    "Age": "int8",
+    "Year_Born": "int16",
+    "Goals": "int16",
+    "Assists": "int16",
+    "Total Contributions": "int16",
+    "Appearances": "int16",
+    "Minutes": "int32",
+    "Progressive_Carries": "int16",
+    "Progressive_Passes": "int16",
+    "Progressive_Receptions": "int16",
+    "Position_Mask": "uint8",
+}
+
+# Goalkeeper stats only exist for goalkeepers: everyone else keeps NaN
+# ("no data") instead of a 0 that would read as a real value
+NULLABLE_COLUMNS = ["Clean_Sheets", "Goals_Against", "Save_Percentage", "Clean_Sheet_%", "Goals_Against_per_Game"]
+
+
+def _cast_count(values, dtype):
+    values = pd.to_numeric(values, errors="coerce")
+    # Missing or out-of-range values keep the inferred dtype rather than
+    # being silently zero-filled or wrapped around
+    info = np.iinfo(dtype)
+    if values.isna().any() or values.min() < info.min or values.max() > info.max:
+        return values
+    return values.astype(dtype)
+
+
+def compact(df):
+    """Convert ``df`` in place to categoricals, compact counts and float32 rates."""
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
+
+    for col, dtype in COUNT_DTYPES.items():
+        if col in df.columns and df[col].dtype != dtype:
+            df[col] = _cast_count(df[col], dtype)
+
+    # Rates, per-90s and expected-goal totals need ~3 significant digits
+    for col in df.columns:
+        if df[col].dtype == "float64":
+            df[col] = df[col].astype("float32")
+    return df
+
+
+def apply_schema(df):
+    """Return a copy of ``df`` with the compact in-memory dtypes."""
+    return compact(df.copy())
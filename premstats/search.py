@@ -0,0 +1,246 @@
+"""Player-name search index, built once per dataset version.
+
+Names are folded to lowercase ASCII (so "Odegaard" finds "Ødegaard") and
+indexed two ways: a sorted token list for prefix lookups and trigram
+indexes for substring and fuzzy (typo-tolerant) matches. Fuzzy matching
+scores each query word against the words of a name, so "haalnd" finds
+"Haaland" and "van djik" finds "van Dijk", while "mohamed sal" does not
+match every Mohamed. Queries shorter than three characters match as plain
+substrings.
+"""
+
+import bisect
+import unicodedata
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+# Letters NFKD does not decompose into an ASCII base letter
+_FOLD = str.maketrans({
+    "ø": "o", "æ": "ae", "œ": "oe", "ß": "ss", "đ": "d", "ð": "d",
+    "ł": "l", "ı": "i", "þ": "th", "ħ": "h",
+})
+
+# Match tiers, best first
+EXACT, PREFIX, TOKEN_PREFIX, SUBSTRING, FUZZY = range(5)
+
+# Minimum similarity of a query word to a name word for a fuzzy match
+FUZZY_THRESHOLD = 0.5
+
+# Name words checked by edit distance per query word, most shared trigrams first
+EDIT_CANDIDATES = 200
+
+
+def normalize(text):
+    text = unicodedata.normalize("NFKD", str(text).casefold().translate(_FOLD))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = "".join(ch if ch.isalnum() else " " for ch in text)
+    return " ".join(text.split())
+
+
+def normalize_all(values):
+    """Vectorized ``normalize`` over a Series; missing values read as "nan".
+
+    Each distinct value is normalized once. Plain ASCII ones only need
+    lowercasing and punctuation collapsed, which runs as string kernels; the
+    rest go through ``normalize`` one by one.
+    """
+    codes, uniques = pd.factorize(values)
+    text = pd.Series(uniques, dtype=object).map(str).astype(str)
+    folded = text.str.contains(r"[^\x00-\x7f]", regex=True).to_numpy(dtype=bool)
+    out = text.str.lower().str.replace(r"[^0-9a-z]+", " ", regex=True).str.strip().to_numpy(dtype=object)
+    out[folded] = [normalize(value) for value in text[folded]]
+    # The extra trailing slot is what the NA sentinel (-1) picks up
+    out = np.append(out, normalize(np.nan))
+    return pd.Series(out[codes], index=values.index, dtype=object)
+
+
+def _trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _short_grams(text):
+    # Every one- and two-character substring, so short queries are a lookup
+    return {text[i:i + n] for n in (1, 2) for i in range(len(text) - n + 1)}
+
+
+def _letter_counts(words):
+    # Per-word letter histogram (a-z, anything else in one bucket)
+    counts = np.zeros((len(words), 27), dtype=np.int16)
+    for i, word in enumerate(words):
+        for ch in word:
+            counts[i, min(ord(ch) - 97, 26) if ch >= "a" else 26] += 1
+    return counts
+
+
+def _max_edits(word):
+    return 1 if len(word) <= 5 else 2
+
+
+def _edit_distance(a, b):
+    # Levenshtein distance counting a swap of adjacent letters as one edit
+    previous2, previous = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class SearchIndex:
+    def __init__(self, names):
+        self.names = [normalize(name) for name in names]
+        # Fixed-width copy so comparisons over candidate rows run in numpy
+        self._names = np.array(self.names, dtype=str)
+
+        postings = defaultdict(list)
+        grams = defaultdict(list)
+        for row, name in enumerate(self.names):
+            for token in set(name.split()):
+                postings[token].append(row)
+            for gram in _trigrams(name) | _short_grams(name):
+                grams[gram].append(row)
+
+        # Sorted tokens stand in for a prefix trie: every token starting with a
+        # prefix sits in one contiguous bisect range
+        self._tokens = sorted(postings)
+        self._postings = [np.array(postings[t], dtype=np.int64) for t in self._tokens]
+        self._grams = {g: np.array(rows, dtype=np.int64) for g, rows in grams.items()}
+
+        # Trigrams of each distinct word, for per-word fuzzy matching
+        token_grams = defaultdict(list)
+        self._token_lengths = np.array([len(t) for t in self._tokens], dtype=np.int32)
+        self._token_gram_counts = np.zeros(len(self._tokens), dtype=np.int32)
+        for i, token in enumerate(self._tokens):
+            token_gram_set = _trigrams(token)
+            self._token_gram_counts[i] = len(token_gram_set)
+            for gram in token_gram_set:
+                token_grams[gram].append(i)
+        self._token_grams = {g: np.array(ids, dtype=np.int64) for g, ids in token_grams.items()}
+        self._token_letters = _letter_counts(self._tokens)
+
+    def _prefix_range(self, prefix):
+        return bisect.bisect_left(self._tokens, prefix), bisect.bisect_left(self._tokens, prefix + "\uffff")
+
+    def _prefix_rows(self, prefix):
+        lo, hi = self._prefix_range(prefix)
+        if lo == hi:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(self._postings[lo:hi]))
+
+    def _word_tokens(self, word):
+        """Ids of the name words close to one query ``word``, with a 0-1 similarity."""
+        lo, hi = self._prefix_range(word)
+        ids, scores = [np.arange(lo, hi)], [np.ones(hi - lo)]
+
+        word_grams = _trigrams(word)
+        hits = [self._token_grams[g] for g in word_grams if g in self._token_grams]
+        if len(word) >= 3 and hits:
+            candidates, shared = np.unique(np.concatenate(hits), return_counts=True)
+            close = np.abs(self._token_lengths[candidates] - len(word)) <= _max_edits(word)
+            candidates, shared = candidates[close], shared[close]
+            similarity = 2 * shared / (len(word_grams) + self._token_gram_counts[candidates])
+
+            # Swapped or replaced letters break most trigrams ("djik" / "dijk"),
+            # so the closest candidates are also checked by edit distance. Each
+            # edit changes at most one letter count up and one down, which rules
+            # most candidates out before the distance is computed
+            letters = self._token_letters[candidates] - _letter_counts([word])[0]
+            bound = np.maximum(np.clip(letters, 0, None).sum(axis=1), np.clip(-letters, 0, None).sum(axis=1))
+            checked = np.flatnonzero((bound <= _max_edits(word)) & (similarity < FUZZY_THRESHOLD))
+            for i in checked[np.argsort(-shared[checked], kind="stable")][:EDIT_CANDIDATES]:
+                token = self._tokens[candidates[i]]
+                distance = _edit_distance(word, token)
+                if distance <= _max_edits(word):
+                    similarity[i] = max(similarity[i], 1 - distance / max(len(word), len(token)))
+
+            keep = similarity >= FUZZY_THRESHOLD
+            ids.append(candidates[keep])
+            scores.append(similarity[keep])
+        return np.concatenate(ids), np.concatenate(scores)
+
+    def _fuzzy_rows(self, query):
+        """Rows where every query word is close to some word of the name, with the mean similarity."""
+        rows, total = None, None
+        for word in query.split():
+            ids, scores = self._word_tokens(word)
+            if not len(ids):
+                return np.empty(0, dtype=np.int64), np.empty(0)
+            word_rows = np.concatenate([self._postings[i] for i in ids])
+            word_scores = np.repeat(scores, [len(self._postings[i]) for i in ids])
+            # Best-matching name word per row
+            order = np.argsort(-word_scores, kind="stable")
+            word_rows, first = np.unique(word_rows[order], return_index=True)
+            word_scores = word_scores[order][first]
+            if rows is None:
+                rows, total = word_rows, word_scores
+            else:
+                rows, left, right = np.intersect1d(rows, word_rows, assume_unique=True, return_indices=True)
+                total = total[left] + word_scores[right]
+        return rows, total / len(query.split())
+
+    def search(self, query, limit=None):
+        """Row positions matching ``query``, best match first."""
+        query = normalize(query)
+        if not query:
+            return np.empty(0, dtype=np.int64)
+
+        # Every query token must prefix some token of the name
+        prefix_rows = None
+        for token in query.split():
+            rows = self._prefix_rows(token)
+            prefix_rows = rows if prefix_rows is None else np.intersect1d(prefix_rows, rows, assume_unique=True)
+        names = self._names[prefix_rows]
+        prefix_tiers = np.where(names == query, EXACT,
+                                np.where(np.char.startswith(names, query), PREFIX, TOKEN_PREFIX))
+        found_rows = [prefix_rows]
+        found_tiers = [prefix_tiers]
+        found_scores = [np.ones(len(prefix_rows))]
+
+        if len(query) < 3:
+            # Too short for trigrams: a plain substring lookup
+            rows = self._grams.get(query, np.empty(0, dtype=np.int64))
+            rows = rows[~np.isin(rows, prefix_rows)]
+            found_rows.append(rows)
+            found_tiers.append(np.full(len(rows), SUBSTRING))
+            found_scores.append(np.ones(len(rows)))
+        else:
+            # A substring match needs every unpadded trigram of the query
+            inner = {query[i:i + 3] for i in range(len(query) - 2)}
+            if all(g in self._grams for g in inner):
+                hits = np.concatenate([self._grams[g] for g in inner])
+                rows, shared = np.unique(hits, return_counts=True)
+                rows = rows[(shared == len(inner)) & ~np.isin(rows, prefix_rows)]
+                rows = rows[np.char.find(self._names[rows], query) >= 0]
+            else:
+                rows = np.empty(0, dtype=np.int64)
+            found_rows.append(rows)
+            found_tiers.append(np.full(len(rows), SUBSTRING))
+            found_scores.append(np.ones(len(rows)))
+
+            # Near misses, word by word
+            fuzzy_rows, fuzzy_scores = self._fuzzy_rows(query)
+            keep = ~np.isin(fuzzy_rows, np.concatenate(found_rows))
+            found_rows.append(fuzzy_rows[keep])
+            found_tiers.append(np.full(int(keep.sum()), FUZZY))
+            found_scores.append(fuzzy_scores[keep])
+
+        rows = np.concatenate(found_rows)
+        tiers = np.concatenate(found_tiers)
+        scores = np.concatenate(found_scores)
+        ranked = rows[np.lexsort((rows, -scores, tiers))]
+        return ranked if limit is None else ranked[:limit]
+
+    def filter_rows(self, rows, query):
+        """The subset of ``rows`` matching ``query``, best match first."""
+        found = self.search(query)
+        return found[np.isin(found, rows)]
+
+
+def search_index(dataset):
+    return dataset.memo("search", lambda ds: SearchIndex(ds.frame["Player"].tolist()))
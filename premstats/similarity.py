@@ -0,0 +1,106 @@
+"""Similar-player search: k nearest neighbours over standardized per-90 profiles.
+
+The feature matrix is built once per dataset version. A query is one
+matrix product against the candidate rows, so it stays in milliseconds
+over tens of thousands of player-seasons without a tree index.
+"""
+
+import numpy as np
+
+from premstats.cleaning import POSITION_BITS
+
+# Rate stats, used as they are
+RATE_FEATURES = ["Goals_per_90", "Assists_per_90", "G+A_per_90"]
+
+# Season totals, converted to per-90 so a bench player and a starter with the
+# same profile end up close to each other
+COUNT_FEATURES = ["xG", "xAG", "Progressive_Carries", "Progressive_Passes", "Progressive_Receptions"]
+
+# Per-90 numbers over a handful of minutes are noise: means and spreads are
+# taken over players with at least this many minutes
+SCALE_MIN_MINUTES = 450
+
+# Upper bound on the query x candidate distance block held at once
+BLOCK_CELLS = 1 << 22
+
+
+class SimilarityIndex:
+    def __init__(self, frame):
+        self.features = [f for f in RATE_FEATURES + COUNT_FEATURES if f in frame.columns]
+        self._minutes = frame["Minutes"].to_numpy(dtype="float64") if "Minutes" in frame.columns else np.zeros(len(frame))
+        self._position_mask = frame["Position_Mask"].to_numpy(dtype="uint8")
+
+        per_90 = np.divide(90.0, self._minutes, out=np.zeros(len(frame)), where=self._minutes > 0)
+        columns = []
+        for feature in self.features:
+            values = frame[feature].to_numpy(dtype="float64", na_value=np.nan)
+            columns.append(values * per_90 if feature in COUNT_FEATURES else values)
+        matrix = np.column_stack(columns) if columns else np.zeros((len(frame), 0))
+        matrix = np.nan_to_num(matrix, nan=0.0, posinf=0.0, neginf=0.0)
+
+        regulars = self._minutes >= SCALE_MIN_MINUTES
+        sample = matrix[regulars] if regulars.sum() > 1 else matrix
+        mean = sample.mean(axis=0) if len(sample) else np.zeros(matrix.shape[1])
+        std = sample.std(axis=0) if len(sample) else np.ones(matrix.shape[1])
+        std[std == 0] = 1.0
+
+        self.matrix = ((matrix - mean) / std).astype("float32")
+        self._sq_norms = np.einsum("ij,ij->i", self.matrix, self.matrix)
+
+    def candidates(self, position=None, min_minutes=0):
+        """Rows eligible as neighbours: sharing ``position`` (a label or bitmask) and minutes."""
+        keep = np.ones(len(self.matrix), dtype=bool)
+        if position:
+            bits = POSITION_BITS[position] if isinstance(position, str) else int(position)
+            keep &= (self._position_mask & bits) != 0
+        if min_minutes:
+            keep &= self._minutes >= min_minutes
+        return np.flatnonzero(keep)
+
+    def neighbours(self, rows, k=10, position=None, min_minutes=0):
+        """Nearest ``k`` candidates of every row in ``rows``, closest first.
+
+        Returns one ``(rows, distances)`` pair of arrays per query row; a
+        player is never their own neighbour.
+        """
+        rows = np.atleast_1d(np.asarray(rows, dtype="int64"))
+        candidates = self.candidates(position, min_minutes)
+        if not len(candidates) or not self.features:
+            return [(candidates[:0], np.zeros(0, dtype="float32")) for _ in rows]
+
+        cand_matrix = self.matrix[candidates]
+        cand_norms = self._sq_norms[candidates]
+        # One spare slot: the query row itself may be among the candidates
+        pick = min(k + 1, len(candidates))
+        step = max(1, BLOCK_CELLS // len(candidates))
+
+        results = []
+        for start in range(0, len(rows), step):
+            block = rows[start:start + step]
+            # |a - b|^2 = |a|^2 + |b|^2 - 2 a.b, for the whole block at once
+            dist = self._sq_norms[block][:, None] + cand_norms[None, :] - 2 * (self.matrix[block] @ cand_matrix.T)
+            np.maximum(dist, 0, out=dist)
+            dist[block[:, None] == candidates[None, :]] = np.inf
+
+            if pick < len(candidates):
+                nearest = np.argpartition(dist, pick - 1, axis=1)[:, :pick]
+            else:
+                nearest = np.broadcast_to(np.arange(len(candidates)), (len(block), len(candidates)))
+            for i in range(len(block)):
+                picked = nearest[i]
+                picked_dist = dist[i, picked]
+                # Ties keep row order, so results are deterministic
+                order = np.lexsort((candidates[picked], picked_dist))
+                picked, picked_dist = picked[order], picked_dist[order]
+                finite = np.isfinite(picked_dist)
+                picked, picked_dist = picked[finite][:k], picked_dist[finite][:k]
+                results.append((candidates[picked], np.sqrt(picked_dist)))
+        return results
+
+    def similar(self, row, k=10, position=None, min_minutes=0):
+        """Nearest ``k`` candidates of a single row as ``(rows, distances)``."""
+        return self.neighbours([row], k, position, min_minutes)[0]
+
+
+def similarity_index(dataset):
+    return dataset.memo("similarity", lambda ds: SimilarityIndex(ds.frame))
@@ -0,0 +1,110 @@
+"""Typed columnar (Feather / Arrow IPC) snapshots of the player dataset.
+
+pyarrow is optional: without it the scraper only writes the CSV and the
+dashboard keeps reading the CSV.
+"""
+
+import os
+import tempfile
+
+import pandas as pd
+
+from premstats.schema import COUNT_DTYPES, apply_schema
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover - depends on the environment
+    pa = feather = None
+
+
+def snapshot_path(csv_path):
+    return os.path.splitext(csv_path)[0] + ".feather"
+
+
+def available():
+    return feather is not None
+
+
+def write_snapshot(df, path):
+    if feather is None:
+        return False
+    # Uncompressed so readers can memory-map the file instead of decoding it
+    feather.write_feather(apply_schema(df).reset_index(drop=True), path, compression="uncompressed")
+    return True
+
+
+def read_snapshot(path):
+    table = feather.read_table(path, memory_map=True)
+    # split_blocks lets numeric columns without nulls stay zero-copy views of the map
+    return table.to_pandas(split_blocks=True)
+
+
+def _stream_schema(df):
+    # Fixed per column so every chunk appends to the same file: counts are
+    # nullable Arrow integers (a chunk with a missing value still fits),
+    # strings are plain rather than per-chunk dictionaries
+    fields = []
+    for col in df.columns:
+        dtype = df[col].dtype
+        if col in COUNT_DTYPES:
+            arrow_type = pa.from_numpy_dtype(COUNT_DTYPES[col])
+        elif pd.api.types.is_bool_dtype(dtype):
+            arrow_type = pa.bool_()
+        elif pd.api.types.is_float_dtype(dtype):
+            arrow_type = pa.float32()
+        elif pd.api.types.is_integer_dtype(dtype):
+            arrow_type = pa.int64()
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(col, arrow_type))
+    return pa.schema(fields)
+
+
+class SnapshotWriter:
+    """Append DataFrame chunks to an uncompressed Arrow IPC (Feather v2) file.
+
+    The file is written under a temporary name and moved into place by
+    ``close()``, so readers never see a partial snapshot.
+    """
+
+    def __init__(self, path):
+        if pa is None:
+            raise ImportError("pyarrow is required to stream a snapshot")
+        self.path = path
+        self.rows = 0
+        self.schema = None
+        self._writer = None
+        fd, self._tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".feather")
+        os.close(fd)
+
+    def write(self, df):
+        if self._writer is None:
+            self.schema = _stream_schema(df)
+            self._writer = pa.ipc.new_file(self._tmp, self.schema)
+        table = pa.Table.from_pandas(df, schema=self.schema, preserve_index=False, safe=True)
+        self._writer.write_table(table)
+        self.rows += len(df)
+
+    def close(self):
+        if self._writer is None:
+            os.remove(self._tmp)
+            return False
+        self._writer.close()
+        os.replace(self._tmp, self.path)
+        return True
+
+    def abort(self):
+        if self._writer is not None:
+            self._writer.close()
+        if os.path.exists(self._tmp):
+            os.remove(self._tmp)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
@@ -1,229 +1,301 @@
-import kagglehub
+import argparse
 import pandas as pd
 import os
 import shutil
-import requests
 from io import StringIO
 
-# Download general player stats from Kaggle
-path = kagglehub.dataset_download("siddhrajthakor/fbref-premier-league-202425-player-stats-dataset")
+from premstats import incremental, ingest, partitions, rebuild
+from premstats.cleaning import clean_players
+from premstats.fetch import COMPETITIONS, STAT_TABLES, Fetcher, make_jobs
+from premstats.goalkeepers import extract_goalkeeper_stats, merge_goalkeeper_stats
+from premstats.http_cache import ResponseCache
+from premstats.loader import content_hash
+from premstats.snapshot import snapshot_path
 
-print("Path to dataset files:", path)
+# Default source: FBref Premier League 2024-25 player stats
+KAGGLE_DATASET = "siddhrajthakor/fbref-premier-league-202425-player-stats-dataset"
 
-# Find the CSV file in the downloaded path
-csv_files = [f for f in os.listdir(path) if f.endswith('.csv')]
+# Extra FBref tables (shooting, passing...) are saved here for later merges
+TABLES_DIR = 'fbref_tables'
+
+
+def report_fetch_error(result):
+    # Only loaded when something went wrong; the fetcher imports it on first request
+    import requests
+
+    e = result.error
+    if isinstance(e, requests.exceptions.HTTPError) and e.response is not None:
+        if e.response.status_code == 403:
+            print("⚠️ FBref is blocking automated requests. Goalkeeper stats unavailable.")
+            print("   Alternative: Manually download goalkeeper data from FBref and add to CSV")
+        else:
+            print(f"⚠️ HTTP Error {e.response.status_code}: {str(e)}")
+    else:
+        print(f"⚠️ Could not fetch goalkeeper stats: {str(e)}")
+    print("Continuing with player stats only...")
+
+
+def keepers_job(league, season):
+    # Goalkeeper stats of a league season being written
+    return make_jobs([league], [season], ['keepers'])[0]
+
+
+def fetch_fbref_tables(args, targets):
+    # Goalkeeper stats of every (league, season) written are always needed for
+    # the dashboard; other tables are opt-in
+    keepers = [keepers_job(league, season) for league, season in targets]
+    jobs = list(dict.fromkeys(keepers + make_jobs(args.competitions, args.seasons, args.tables)))
+    print(f"\nFetching {len(jobs)} FBref table(s) with {args.workers} worker(s) at {args.rate} req/s...")
+
+    cache = None
+    if not args.no_cache or args.offline:
+        cache = ResponseCache(args.cache_dir, offline=args.offline, fixtures_dir=args.fixtures)
+
+    fetcher = Fetcher(rate=args.rate, workers=args.workers, timeout=args.timeout, cache=cache)
+    results = fetcher.fetch_all(jobs)
+
+    for job, result in results.items():
+        status = "✓" if result.ok else "⚠️"
+        source = f", {result.source}" if result.source else ""
+        print(f"{status} {job.competition} {job.season or 'current'} {job.table} ({result.seconds:.1f}s{source})")
+        if result.source == "stale":
+            print("   FBref request failed, using the cached copy")
+
+        # Save the opt-in tables for downstream merges
+        if result.ok and job.table != 'keepers':
+            os.makedirs(TABLES_DIR, exist_ok=True)
+            name = f"{job.competition}_{job.season or 'current'}_{job.table}.csv"
+            result.table.to_csv(os.path.join(TABLES_DIR, name), index=False)
+    return results
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Download and clean Premier League player stats")
+    parser.add_argument('--kaggle-dataset', default=KAGGLE_DATASET, help="Kaggle dataset of player stats to clean")
+    parser.add_argument('--league', default=partitions.DEFAULT_LEAGUE, choices=sorted(COMPETITIONS),
+                        help="league the Kaggle dataset covers")
+    parser.add_argument('--season', default=partitions.DEFAULT_SEASON,
+                        help="season the Kaggle dataset covers, e.g. 2024-2025")
+    parser.add_argument('--data-dir', default=partitions.DATA_DIR,
+                        help="root of the league=/season= partitioned output")
+    parser.add_argument('--competitions', nargs='+', default=['Premier-League'], choices=sorted(COMPETITIONS),
+                        help="FBref competitions to fetch tables for")
+    parser.add_argument('--seasons', nargs='+', default=[None],
+                        help="FBref seasons such as 2023-2024 (default: current season)")
+    parser.add_argument('--tables', nargs='*', default=[], choices=sorted(STAT_TABLES),
+                        help="extra FBref stat tables to save to fbref_tables/")
+    parser.add_argument('--workers', type=int, default=4, help="concurrent FBref requests")
+    parser.add_argument('--rate', type=float, default=0.5, help="max FBref requests per second")
+    parser.add_argument('--timeout', type=float, default=60.0, help="per-table deadline in seconds, including retries")
+    parser.add_argument('--cache-dir', default='.fbref_cache', help="on-disk FBref response cache")
+    parser.add_argument('--no-cache', action='store_true', help="always download FBref pages")
+    parser.add_argument('--offline', action='store_true',
+                        help="never hit FBref: use cached responses or --fixtures HTML only")
+    parser.add_argument('--fixtures', help="directory of fixture HTML pages for --offline runs")
+    parser.add_argument('--incremental', action='store_true',
+                        help="only apply rows that changed since the last run and record them in the changelog")
+    parser.add_argument('--stream', action='store_true',
+                        help="clean the source in chunks so peak memory does not grow with its size")
+    parser.add_argument('--chunk-size', type=int, default=ingest.DEFAULT_CHUNK_SIZE,
+                        help="rows per chunk with --stream")
+    parser.add_argument('--rebuild', metavar='SOURCES_DIR',
+                        help="rebuild every league=<league>/season=<season>/*.csv source under SOURCES_DIR "
+                             "in parallel instead of downloading from Kaggle")
+    parser.add_argument('--processes', type=int, help="worker processes for --rebuild (default: one per core)")
+    args = parser.parse_args()
+    if args.rebuild and args.incremental:
+        parser.error("--rebuild rewrites every partition and cannot be combined with --incremental")
+    if args.stream and args.incremental:
+        parser.error("--stream rewrites the whole partition and cannot be combined with --incremental")
+    return args
+
+
+def main():
+    args = parse_args()
+    if args.rebuild:
+        rebuild_partitions(args)
+        return
+
+    # Download general player stats from Kaggle (imported here so --help and
+    # the dashboard's shared imports never pay for it)
+    import kagglehub
+
+    path = kagglehub.dataset_download(args.kaggle_dataset)
+
+    print("Path to dataset files:", path)
+
+    # Find the CSV file in the downloaded path
+    csv_files = [f for f in os.listdir(path) if f.endswith('.csv')]
+
+    if not csv_files:
+        print("No CSV files found in the dataset")
+        return
 
-if csv_files:
     # Use the first CSV file found
     source_file = os.path.join(path, csv_files[0])
-    
-    # Read and process the data
-    df = pd.read_csv(source_file)
-    
-    # Check what columns are available
-    print("Available columns:", df.columns.tolist())
-    
-    # Map to our required format INCLUDING position
-    if 'Player' in df.columns and 'Squad' in df.columns:
-        # Basic columns for all players
-        base_cols = ['Player', 'Nation', 'Pos', 'Squad', 'Age', 'Born', 'Gls', 'Ast', 'MP', 'Min']
-        
-        # Advanced metrics available in dataset
-        advanced_cols = []
-        if 'xG' in df.columns:
-            advanced_cols.append('xG')
-        if 'xAG' in df.columns:
-            advanced_cols.append('xAG')
-        if 'PrgC' in df.columns:  # Progressive Carries
-            advanced_cols.append('PrgC')
-        if 'PrgP' in df.columns:  # Progressive Passes
-            advanced_cols.append('PrgP')
-        if 'PrgR' in df.columns:  # Progressive Receptions
-            advanced_cols.append('PrgR')
-        
-        # Check for goalkeeper-specific columns (if they exist)
-        gk_cols = []
-        if 'CS' in df.columns:  # Clean Sheets
-            gk_cols.append('CS')
-        if 'GA' in df.columns:  # Goals Against
-            gk_cols.append('GA')
-        if 'Save%' in df.columns or 'Saves%' in df.columns:  # Save Percentage
-            gk_cols.append('Save%' if 'Save%' in df.columns else 'Saves%')
-        
-        # Combine columns
-        all_cols = base_cols + advanced_cols + gk_cols
-        available_cols = [col for col in all_cols if col in df.columns]
-        
-        df_clean = df[available_cols].copy()
-        
-        # Rename basic columns
-        rename_map = {
-            'Player': 'Player',
-            'Nation': 'Nationality', 
-            'Pos': 'Position',
-            'Squad': 'Team',
-            'Age': 'Age',
-            'Born': 'Year_Born',
-            'Gls': 'Goals',
-            'Ast': 'Assists',
-            'MP': 'Appearances',
-            'Min': 'Minutes'
-        }
-        
-        # Add advanced metric renames
-        if 'xG' in df_clean.columns:
-            rename_map['xG'] = 'xG'
-        if 'xAG' in df_clean.columns:
-            rename_map['xAG'] = 'xAG'
-        if 'PrgC' in df_clean.columns:
-            rename_map['PrgC'] = 'Progressive_Carries'
-        if 'PrgP' in df_clean.columns:
-            rename_map['PrgP'] = 'Progressive_Passes'
-        if 'PrgR' in df_clean.columns:
-            rename_map['PrgR'] = 'Progressive_Receptions'
-        
-        # Add GK stat renames if they exist
-        if 'CS' in df_clean.columns:
-            rename_map['CS'] = 'Clean_Sheets'
-        if 'GA' in df_clean.columns:
-            rename_map['GA'] = 'Goals_Against'
-        if 'Save%' in df_clean.columns:
-            rename_map['Save%'] = 'Save_Percentage'
-        if 'Saves%' in df_clean.columns:
-            rename_map['Saves%'] = 'Save_Percentage'
-        
-        df_clean = df_clean.rename(columns=rename_map)
-        
-        # Standardize positions - handle multiple separators and classify properly
-        def standardize_position(pos):
-            if pd.isna(pos):
-                return 'Unknown'
-            
-            # Convert to string and clean
-            pos_str = str(pos).strip()
-            
-            # Split by comma or space to get primary position
-            for sep in [',', ' ']:
-                if sep in pos_str:
-                    pos_str = pos_str.split(sep)[0].strip()
-                    break
-            
-            # Categorize versatile players
-            # FW,MF or MF,FW (wingers, attacking mids) -> classify as their primary position
-            pos_upper = pos_str.upper()
-            
-            # Standard positions
-            if pos_upper in ['GK', 'DF', 'MF', 'FW']:
-                return pos_upper
-            
-            # If it's still combined after split, take first 2 characters
-            if len(pos_upper) > 2:
-                return pos_upper[:2]
-            
-            return pos_upper
-        
-        df_clean['Position'] = df_clean['Position'].apply(standardize_position)
-        
-        # Clean nationality - extract just the 3-letter country code
-        def clean_nationality(nat):
-            if pd.isna(nat):
-                return 'Unknown'
-            # Nationality format is like "eng ENG" or "ch SUI" - take the last 3 characters
-            nat_str = str(nat).strip()
-            # Split by space and take the last part (the uppercase code)
-            parts = nat_str.split()
-            if len(parts) > 1:
-                return parts[-1]  # Return the last part (e.g., "ENG", "SUI", "USA")
-            return nat_str.upper()
-        
-        df_clean['Nationality'] = df_clean['Nationality'].apply(clean_nationality)
-        
-        # Scrape goalkeeper stats from FBref
-        print("\nFetching goalkeeper statistics from FBref...")
-        try:
-            import time
-            gk_url = "https://fbref.com/en/comps/9/keepers/Premier-League-Stats"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'DNT': '1',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-                'Sec-Fetch-Dest': 'document',
-                'Sec-Fetch-Mode': 'navigate',
-                'Sec-Fetch-Site': 'none',
-                'Cache-Control': 'max-age=0'
-            }
-            
-            # Add delay to be respectful
-            time.sleep(3)
-            
-            response = requests.get(gk_url, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            # Parse goalkeeper stats table
-            gk_tables = pd.read_html(StringIO(response.text))
-            
-            # The goalkeeper stats table is usually the first one
-            gk_df = gk_tables[0]
-            
-            # Handle multi-level columns if they exist
-            if isinstance(gk_df.columns, pd.MultiIndex):
-                gk_df.columns = ['_'.join(col).strip() if col[1] else col[0] for col in gk_df.columns.values]
-            
-            # Find relevant GK columns (adjust based on actual table structure)
-            # Common columns: Player, CS (Clean Sheets), GA (Goals Against), Save% or SoT% (Save Percentage)
-            gk_cols_map = {}
-            for col in gk_df.columns:
-                col_lower = str(col).lower()
-                if 'player' in col_lower and 'Player' not in gk_cols_map:
-                    gk_cols_map['Player'] = col
-                elif 'cs' in col_lower or 'clean' in col_lower:
-                    gk_cols_map['Clean_Sheets'] = col
-                elif 'ga' in col_lower and 'goal' in col_lower and 'against' in col_lower:
-                    gk_cols_map['Goals_Against'] = col
-                elif 'save%' in col_lower or 'sv%' in col_lower:
-                    gk_cols_map['Save_Percentage'] = col
-            
-            if 'Player' in gk_cols_map and len(gk_cols_map) > 1:
-                # Extract GK stats
-                gk_stats = gk_df[[gk_cols_map[k] for k in gk_cols_map.keys() if k in gk_cols_map]].copy()
-                gk_stats.columns = list(gk_cols_map.keys())
-                
-                # Clean player names (remove any extra characters)
-                gk_stats['Player'] = gk_stats['Player'].str.strip()
-                
-                # Convert numeric columns
-                for col in ['Clean_Sheets', 'Goals_Against', 'Save_Percentage']:
-                    if col in gk_stats.columns:
-                        gk_stats[col] = pd.to_numeric(gk_stats[col], errors='coerce')
-                
-                # Merge with main dataframe
-                df_clean = df_clean.merge(gk_stats, on='Player', how='left')
-                print(f"✓ Added goalkeeper stats for {gk_stats['Player'].nunique()} goalkeepers")
-            else:
-                print("⚠️ Could not find goalkeeper stats columns in expected format")
-                
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 403:
-                print("⚠️ FBref is blocking automated requests. Goalkeeper stats unavailable.")
-                print("   Alternative: Manually download goalkeeper data from FBref and add to CSV")
-            else:
-                print(f"⚠️ HTTP Error {e.response.status_code}: {str(e)}")
-            print("Continuing with player stats only...")
-        except Exception as e:
-            print(f"⚠️ Could not fetch goalkeeper stats: {str(e)}")
-            print("Continuing with player stats only...")
-        
-        # Save to your project directory
-        df_clean.to_csv('premier_league_stats.csv', index=False)
-        print(f"✓ Fetched {len(df_clean)} players!")
-        print(f"✓ Saved to premier_league_stats.csv")
+    source_hash = content_hash(source_file)
+
+    # Every league season is its own partition, with its own changelog
+    output_csv = partitions.partition_path(args.league, args.season, args.data_dir)
+    os.makedirs(os.path.dirname(output_csv), exist_ok=True)
+
+    if args.stream:
+        stream_outputs(args, source_file, source_hash, output_csv)
+        return
+
+    changelog = incremental.read_changelog(output_csv)
+    if args.incremental and changelog and changelog[-1]['source_hash'] == source_hash and os.path.exists(output_csv):
+        # Kaggle source unchanged: reuse last run's cleaned rows, only FBref stats are refreshed
+        print("✓ Kaggle dataset unchanged since the last refresh, skipping cleaning")
+        df_clean = pd.read_csv(output_csv)
+    else:
+        # Read and process the data
+        df = pd.read_csv(source_file)
+
+        # Check what columns are available
+        print("Available columns:", df.columns.tolist())
+
+        # Map to our required format INCLUDING position
+        if 'Player' not in df.columns or 'Squad' not in df.columns:
+            # If column names don't match, just copy the file
+            shutil.copy(source_file, output_csv)
+            partitions.register_partition(args.league, args.season, len(df), rebuild.output_versions(output_csv), args.data_dir)
+            print(f"✓ Downloaded and saved dataset")
+            return
+
+        df_clean = clean_players(df)
+
+    # Scrape goalkeeper (and any extra) stats from FBref
+    gk_stats = fetch_goalkeeper_stats(args)
+    if gk_stats is not None:
+        # Keyed join with main dataframe, replacing any GK stats from a previous run
+        df_clean, report = merge_goalkeeper_stats(df_clean, gk_stats)
+        save_join_report(report, output_csv)
+
+    if args.incremental and os.path.exists(output_csv):
+        versions = save_incremental(df_clean, source_hash, output_csv)
     else:
-        # If column names don't match, just copy the file
-        shutil.copy(source_file, 'premier_league_stats.csv')
+        previous_versions = rebuild.output_versions(output_csv)
+        versions = save_outputs(df_clean, output_csv)
+        # Full rebuild: the dashboard cannot know which rows changed
+        incremental.append_changelog(output_csv, None, versions, source_hash, previous_versions)
+
+    partitions.register_partition(args.league, args.season, len(df_clean), versions, args.data_dir)
+    print(f"✓ Registered {args.league} {args.season} in {os.path.join(args.data_dir, partitions.MANIFEST)}")
+
+
+def fetch_goalkeeper_stats(args):
+    """Scrape FBref (goalkeepers plus any extra tables) and return the GK stats, or None."""
+    results = fetch_fbref_tables(args, [(args.league, args.season)])
+    return goalkeeper_stats(results.get(keepers_job(args.league, args.season)))
+
+
+def goalkeeper_stats(keepers):
+    if keepers is None:
+        return None
+    if not keepers.ok:
+        report_fetch_error(keepers)
+        return None
+
+    gk_stats = extract_goalkeeper_stats(keepers.table)
+    if gk_stats is None:
+        print("⚠️ Could not find goalkeeper stats columns in expected format")
+    return gk_stats
+
+
+def save_join_report(report, output_csv):
+    print_join_report(report)
+    print(f"✓ Join report saved to {rebuild.write_join_report(report, output_csv)}")
+
+
+def print_join_report(report):
+    print(f"✓ Added goalkeeper stats for {report['matched']} of {report['goalkeeper_rows']} goalkeepers")
+    if report['duplicate_keys']:
+        print(f"⚠️ Ignored {len(report['duplicate_keys'])} duplicate goalkeeper row(s)")
+    if report['unmatched_goalkeeper_rows'] or report['goalkeepers_without_stats']:
+        print(f"⚠️ {len(report['unmatched_goalkeeper_rows'])} goalkeeper row(s) unmatched, "
+              f"{len(report['goalkeepers_without_stats'])} GK player(s) without stats")
+
+
+def stream_outputs(args, source_file, source_hash, output_csv):
+    # Large sources: clean, join and write one chunk at a time instead of
+    # holding the whole table in memory
+    columns = ingest.read_header(source_file)
+    print("Available columns:", columns)
+    if 'Player' not in columns or 'Squad' not in columns:
+        shutil.copy(source_file, output_csv)
+        rows = sum(len(chunk) for chunk in pd.read_csv(source_file, usecols=[0], chunksize=args.chunk_size))
+        partitions.register_partition(args.league, args.season, rows, rebuild.output_versions(output_csv), args.data_dir)
         print(f"✓ Downloaded and saved dataset")
-else:
-    print("No CSV files found in the dataset")
\ No newline at end of file
+        return
+
+    gk_stats = fetch_goalkeeper_stats(args)
+    result = rebuild.build_partition(args.league, args.season, source_file, gk_stats, args.data_dir, args.chunk_size)
+    print(f"✓ Fetched {result['entry']['rows']} players in chunks of {args.chunk_size}!")
+    print(f"✓ Saved to {output_csv}")
+    if result['report'] is not None:
+        print_join_report(result['report'])
+
+    partitions.register_partitions([result['entry']], args.data_dir)
+    print(f"✓ Registered {args.league} {args.season} in {os.path.join(args.data_dir, partitions.MANIFEST)}")
+
+
+def rebuild_partitions(args):
+    # Nightly history rebuild: one worker process per partition
+    sources = [(league, season, path) for league, season, path in rebuild.find_sources(args.rebuild)
+               if league in COMPETITIONS]
+    if not sources:
+        print(f"No league=<league>/season=<season>/*.csv sources found under {args.rebuild}")
+        return
+
+    results = fetch_fbref_tables(args, [(league, season) for league, season, _ in sources])
+    tasks = [(league, season, path, goalkeeper_stats(results.get(keepers_job(league, season))))
+             for league, season, path in sources]
+
+    def done(league, season, result):
+        report = result['report']
+        gk = f", goalkeeper stats for {report['matched']} of {report['goalkeeper_rows']}" if report else ""
+        print(f"✓ {league} {season}: {result['entry']['rows']} players{gk} ({result['seconds']:.1f}s)")
+
+    processes = args.processes or os.cpu_count()
+    print(f"\nRebuilding {len(tasks)} partition(s) with {min(processes, len(tasks))} process(es)...")
+    rebuild.rebuild(tasks, processes, args.data_dir, args.chunk_size if args.stream else None, on_done=done)
+    print(f"✓ Registered {len(tasks)} partition(s) in {os.path.join(args.data_dir, partitions.MANIFEST)}")
+
+
+def save_outputs(df_clean, output_csv):
+    # Save to the league season's partition, plus the typed columnar
+    # snapshot the dashboard memory-maps when present
+    wrote_snapshot = rebuild.write_outputs(df_clean, output_csv)
+    print(f"✓ Fetched {len(df_clean)} players!")
+    print(f"✓ Saved to {output_csv}")
+
+    output_snapshot = snapshot_path(output_csv)
+    if wrote_snapshot:
+        print(f"✓ Saved typed snapshot to {output_snapshot}")
+    else:
+        print(f"⚠️ pyarrow not installed, skipping {output_snapshot}")
+    return rebuild.output_versions(output_csv)
+
+
+def save_incremental(df_clean, source_hash, output_csv):
+    previous = pd.read_csv(output_csv)
+    previous_versions = rebuild.output_versions(output_csv)
+
+    # Round-trip through CSV so both sides are compared with the same dtypes
+    new = pd.read_csv(StringIO(df_clean.to_csv(index=False)))
+    changes = incremental.diff_frames(previous, new)
+    print(f"✓ {len(changes.inserted)} inserted, {len(changes.updated)} updated, "
+          f"{len(changes.removed)} removed since the last refresh")
+
+    if changes.inserted or changes.updated or changes.removed:
+        versions = save_outputs(incremental.apply_changes(previous, new, changes), output_csv)
+    else:
+        # Nothing to rewrite, so the dashboard keeps its caches warm
+        print(f"✓ {output_csv} is already up to date")
+        versions = previous_versions
+    incremental.append_changelog(output_csv, changes, versions, source_hash, previous_versions)
+    return versions
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""JSON API responses over a partition written to a temporary directory."""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_players  # noqa: E402
+from premstats import api, loader, partitions  # noqa: E402
+
+
+@pytest.fixture
+def players(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    loader.clear_cache()
+    api._resolved.clear()
+    frame = make_players(400)
+    path = partitions.partition_path(partitions.DEFAULT_LEAGUE, partitions.DEFAULT_SEASON)
+    os.makedirs(os.path.dirname(path))
+    frame.to_csv(path, index=False)
+    partitions.register_partition(partitions.DEFAULT_LEAGUE, partitions.DEFAULT_SEASON, len(frame), [])
+    return frame
+
+
+def get(path, **params):
+    status, body, _ = api.respond(path, {k: v if isinstance(v, list) else [str(v)] for k, v in params.items()})
+    return status, json.loads(body)
+
+
+def test_float32_columns_keep_their_stored_digits(players):
+    status, body = get("/leaderboards/Save_Percentage", per_page=50)
+    assert status == 200
+    stored = set(players["Save_Percentage"].dropna().round(1))
+    for item in body["items"]:
+        assert item["Save_Percentage"] in stored
+
+
+def test_unexpected_errors_are_json_500s(players, monkeypatch):
+    monkeypatch.setitem(api.ROUTES, "/boom", lambda params, dataset: {"value": float("nan")})
+    assert get("/boom") == (500, {"error": "internal error: ValueError"})
+
+
+def test_client_errors(players):
+    assert get("/player")[0] == 400
+    assert get("/player", name="Nobody")[0] == 404
+    assert get("/nope")[0] == 404
+
+
+def test_teams_over_several_partitions(players):
+    others = {("Premier-League", "2023-2024"): make_players(300, seed=1), ("La-Liga", "2024-2025"): make_players(200, seed=2)}
+    for (league, season), frame in others.items():
+        path = partitions.partition_path(league, season)
+        os.makedirs(os.path.dirname(path))
+        frame.to_csv(path, index=False)
+        partitions.register_partition(league, season, len(frame), [])
+    others[(partitions.DEFAULT_LEAGUE, partitions.DEFAULT_SEASON)] = players
+
+    def players_per_partition(**params):
+        status, body = get("/teams", **params)
+        assert status == 200
+        return {(p["league"], p["season"]): sum(team["Players"] for team in p["teams"]) for p in body["partitions"]}
+
+    counts = {key: frame["Team"].notna().sum() for key, frame in others.items()}
+    assert players_per_partition() == {("Premier-League", "2024-2025"): counts[("Premier-League", "2024-2025")]}
+    assert players_per_partition(season=["2023-2024", "2024-2025"]) == \
+        {key: n for key, n in counts.items() if key[0] == "Premier-League"}
+    # Two leagues of the same season are not merged
+    assert players_per_partition(league=["La-Liga", "Premier-League"], season="2024-2025") == \
+        {key: n for key, n in counts.items() if key[1] == "2024-2025"}
+
+    status, body = get("/search", q="a", season=["2023-2024", "2024-2025"])
+    assert status == 200 and "Season" in body["items"][0]
+    assert body["total"] == get("/search", q="a", season="2023-2024")[1]["total"] + get("/search", q="a")[1]["total"]
+    assert get("/teams", league=["La-Liga", "Premier-League"], season="2023-2024")[0] == 404
@@ -0,0 +1,51 @@
+"""Process-wide rendered-chart cache."""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from premstats import charts  # noqa: E402
+
+
+def test_concurrent_misses_draw_once():
+    charts.chart_cache.clear()
+    draws = []
+
+    def draw(fig):
+        draws.append(threading.get_ident())
+        time.sleep(0.2)
+        fig.subplots().plot([1, 2, 3])
+
+    barrier = threading.Barrier(8)
+    results = []
+
+    def session():
+        barrier.wait()
+        results.append(charts.render(("test", "single-flight"), draw, (2, 2)))
+
+    threads = [threading.Thread(target=session) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert len(draws) == 1
+    assert len(results) == 8 and len(set(results)) == 1
+    assert charts.chart_cache._drawing == {}
+
+
+def test_failed_draw_is_retried():
+    charts.chart_cache.clear()
+
+    def broken(fig):
+        raise RuntimeError("no data")
+
+    with pytest.raises(RuntimeError):
+        charts.render(("test", "retry"), broken, (2, 2))
+    assert charts.chart_cache._drawing == {}
+    assert charts.render(("test", "retry"), lambda fig: fig.subplots().plot([1]), (2, 2))
@@ -0,0 +1,75 @@
+"""The vectorized cleaners must match the scalar reference implementations row for row."""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_kaggle_players  # noqa: E402
+from premstats.cleaning import (  # noqa: E402
+    clean_nationalities,
+    clean_nationality,
+    clean_players,
+    position_mask,
+    position_masks,
+    standardize_position,
+    standardize_positions,
+)
+
+POSITION_CASES = [
+    "GK", "DF", "MF", "FW", "FW,MF", "MF,FW", "DF,MF", "fw", " mf ", "FW MF",
+    "FW MF,DF", "MF ,FW", ",MF", " ", "", "GKX", "F", "DFMF", "ß", 5, 3.0,
+    np.nan, None,
+]
+NATIONALITY_CASES = [
+    "eng ENG", "ch SUI", "us USA", "ENG", "eng", " fr FRA ", "a b c", "",
+    "   ", "ci CIV\t", "gb-eng ENG", "ci CIV", "tr TÜR", 7, np.nan, None,
+]
+
+
+def reference_clean_players(df):
+    # clean_players with the row-wise scalar cleaners it replaced. Both keep
+    # the cleaned labels as object; the loader turns them into categoricals
+    df_clean = clean_players(df.assign(Pos="", Nation=""))
+    df_clean["Position_Mask"] = df["Pos"].apply(position_mask).astype("uint8")
+    df_clean["Position"] = pd.Series(df["Pos"].apply(standardize_position).tolist(), index=df.index, dtype=object)
+    df_clean["Nationality"] = pd.Series(df["Nation"].apply(clean_nationality).tolist(), index=df.index, dtype=object)
+    return df_clean
+
+
+def edge_rows():
+    raw = make_kaggle_players(len(POSITION_CASES), seed=1)
+    raw["Pos"] = pd.Series(POSITION_CASES, dtype=object)
+    raw["Nation"] = pd.Series((NATIONALITY_CASES * 2)[:len(raw)], dtype=object)
+    raw["Player"] = ["Martin Ødegaard", "Jhon Durán", "Son Heung-min", "N'Golo Kanté"] + list(raw["Player"][4:])
+    raw["Min"] = raw["Min"].astype("float64")
+    raw.loc[[0, 5, 9], "Min"] = np.nan
+    return raw
+
+
+@pytest.mark.parametrize("vectorized, scalar, values", [
+    (standardize_positions, standardize_position, POSITION_CASES),
+    (position_masks, position_mask, POSITION_CASES),
+    (clean_nationalities, clean_nationality, NATIONALITY_CASES),
+])
+def test_vectorized_cleaners_match_scalar(vectorized, scalar, values):
+    series = pd.Series(values, dtype=object)
+    expected = series.apply(scalar).tolist()
+    assert vectorized(series).tolist() == expected
+
+
+@pytest.mark.parametrize("raw", [make_kaggle_players(5_000), edge_rows()], ids=["synthetic", "edge_rows"])
+def test_clean_players_matches_reference(raw):
+    pd.testing.assert_frame_equal(clean_players(raw), reference_clean_players(raw))
+
+
+def test_clean_players_keeps_secondary_positions():
+    raw = make_kaggle_players(3)
+    raw["Pos"] = ["FW,MF", "DF", None]
+    cleaned = clean_players(raw)
+    assert cleaned["Position"].tolist() == ["FW", "DF", "Unknown"]
+    assert cleaned["Position_Mask"].tolist() == [12, 2, 0]
@@ -0,0 +1,81 @@
+"""FilterIndex and the aggregate cube against plain copy-and-mask filtering."""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_kaggle_players  # noqa: E402
+from premstats.aggregates import AggregateCube  # noqa: E402
+from premstats.cleaning import POSITION_BITS, clean_players  # noqa: E402
+from premstats.filters import FilterIndex  # noqa: E402
+from premstats.loader import enrich  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def frame():
+    # Raw Kaggle positions, so some players also list a secondary position
+    return enrich(clean_players(make_kaggle_players(3_000)))
+
+
+def combos(frame):
+    teams = [None] + sorted(frame["Team"].astype(str).unique()) + ["Nobody"]
+    positions = [None] + list(POSITION_BITS)
+    return [(team, position) for team in teams for position in positions]
+
+
+def copy_and_mask(df, team, position):
+    # What the sidebar did on every rerun before the FilterIndex
+    filtered = df.copy()
+    if team is not None:
+        filtered = filtered[filtered["Team"] == team]
+    if position is not None:
+        filtered = filtered[(filtered["Position_Mask"] & POSITION_BITS[position]) != 0]
+    return filtered
+
+
+def test_rows_and_summary_match_copy_and_mask(frame):
+    engine = FilterIndex(frame)
+    for team, position in combos(frame):
+        expected = copy_and_mask(frame, team, position)
+        rows = engine.rows(team, position)
+        assert frame.index[rows].tolist() == expected.index.tolist(), (team, position)
+        assert engine.summary(rows) == {
+            "players": len(expected),
+            "teams": expected["Team"].nunique(),
+            "goals": int(expected["Goals"].sum()),
+            "assists": int(expected["Assists"].sum()),
+        }, (team, position)
+
+
+def test_cube_summary_matches_filter_index(frame):
+    engine = FilterIndex(frame)
+    cube = AggregateCube(frame)
+    for team, position in combos(frame):
+        assert cube.summary(team, position) == engine.summary(engine.rows(team, position)), (team, position)
+
+
+def test_cube_team_totals_match_groupby(frame):
+    cube = AggregateCube(frame)
+    table = cube.team_totals(position="MF").set_index("Team")
+    midfielders = frame[(frame["Position_Mask"] & POSITION_BITS["MF"]) != 0]
+    expected = midfielders.groupby("Team", observed=True).agg(Players=("Player", "size"), Goals=("Goals", "sum"))
+    assert table["Players"].to_dict() == expected["Players"].to_dict()
+    assert table["Goals"].to_dict() == expected["Goals"].to_dict()
+    assert np.isclose(table["xG"].sum(), midfielders["xG"].astype("float64").sum(), atol=0.5)
+
+
+def test_cube_keeps_leagues_of_the_same_season_apart(frame):
+    parts = [("La-Liga", "2024-2025"), ("Premier-League", "2023-2024"), ("Premier-League", "2024-2025")]
+    combined = pd.concat([frame.assign(League=league, Season=season) for league, season in parts], ignore_index=True)
+    cube = AggregateCube(combined)
+    assert cube.periods == parts
+    single = AggregateCube(frame)
+    for league, season in parts:
+        assert cube.summary(league=league, season=season) == single.summary()
+    assert cube.summary(season="2024-2025")["players"] == 2 * len(frame)
+    assert cube.summary(league="Premier-League", team="Nobody")["players"] == 0
@@ -0,0 +1,80 @@
+"""Incremental refresh: diff a new scrape against the last one and apply only the changes."""
+
+import os
+import sys
+from io import StringIO
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_players  # noqa: E402
+from premstats.incremental import apply_changes, diff_frames, player_keys  # noqa: E402
+
+
+def round_trip(df):
+    # What the scraper compares: both sides as read back from CSV
+    return pd.read_csv(StringIO(df.to_csv(index=False)))
+
+
+@pytest.fixture
+def previous():
+    return round_trip(make_players(50))
+
+
+def test_unchanged_scrape_has_no_changes(previous):
+    changes = diff_frames(previous, round_trip(previous))
+    assert changes == ([], [], [])
+
+
+def test_nan_in_int_column_only_updates_that_row(previous):
+    new = previous.copy()
+    new["Minutes"] = new["Minutes"].astype("float64")
+    new.loc[3, "Minutes"] = np.nan
+    new.loc[7, "Goals"] += 1
+    new = round_trip(new)
+    assert new["Minutes"].dtype == "float64" and previous["Minutes"].dtype == "int64"
+
+    changes = diff_frames(previous, new)
+    keys = player_keys(previous)
+    assert changes.inserted == [] and changes.removed == []
+    assert sorted(changes.updated) == sorted([keys[3], keys[7]])
+
+    applied = apply_changes(previous, new, changes)
+    assert len(applied) == len(previous)
+    assert np.isnan(applied.loc[3, "Minutes"])
+    assert applied.loc[7, "Goals"] == previous.loc[7, "Goals"] + 1
+
+
+def test_transfer_is_a_removal_and_an_insertion(previous):
+    new = previous.copy()
+    new.loc[5, "Team"] = "Arsenal" if previous.loc[5, "Team"] != "Arsenal" else "Chelsea"
+    changes = diff_frames(previous, round_trip(new))
+    assert changes.updated == []
+    assert changes.inserted == [player_keys(new)[5]]
+    assert changes.removed == [player_keys(previous)[5]]
+
+    applied = apply_changes(previous, round_trip(new), changes)
+    assert len(applied) == len(previous)
+    assert applied.iloc[-1]["Team"] == new.loc[5, "Team"]
+
+
+def test_duplicate_keys_are_kept_in_file_order():
+    old = pd.DataFrame({"Player": ["Ben Davies", "Ben Davies", "Son"], "Team": ["Spurs", "Spurs", "Spurs"],
+                        "Goals": [1, 2, 3]})
+    new = old.assign(Goals=[1, 5, 3])
+    with pytest.warns(UserWarning, match="duplicate player key"):
+        changes = diff_frames(old, new)
+        applied = apply_changes(old, new, changes)
+    assert changes == ([], ["ben davies||spurs#1"], [])
+    assert applied["Goals"].tolist() == [1, 5, 3]
+
+
+def test_schema_change_updates_every_shared_row(previous):
+    new = round_trip(previous.assign(Shots=1))
+    changes = diff_frames(previous, new)
+    assert changes.inserted == [] and changes.removed == []
+    assert len(changes.updated) == len(previous)
+    assert "Shots" in apply_changes(previous, new, changes).columns
@@ -0,0 +1,52 @@
+"""LeaderboardIndex against DataFrame.nlargest."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_players  # noqa: E402
+from premstats.leaderboards import LeaderboardIndex  # noqa: E402
+from premstats.loader import enrich  # noqa: E402
+
+QUERIES = [
+    ("Goals", {}),
+    ("Assists", {}),
+    ("G+A_per_90", {"min_minutes": 500}),
+    ("Goals_per_90", {"team": "Arsenal", "min_minutes": 900}),
+    ("Clean_Sheets", {"position": "GK"}),
+    ("Save_Percentage", {"team": "Chelsea", "position": "GK"}),
+    ("Goals", {"team": "Nobody"}),
+]
+
+
+@pytest.fixture(scope="module")
+def frame():
+    return enrich(make_players(5_000))
+
+
+def nlargest(df, metric, n, team=None, position=None, min_minutes=0):
+    if team is not None:
+        df = df[df["Team"] == team]
+    if position is not None:
+        df = df[df["Position"] == position]
+    if min_minutes:
+        df = df[df["Minutes"] >= min_minutes]
+    return df.nlargest(n, metric)
+
+
+@pytest.mark.parametrize("metric, filters", QUERIES)
+@pytest.mark.parametrize("n", [1, 10, 300])
+def test_top_matches_nlargest(frame, metric, filters, n):
+    index = LeaderboardIndex(frame)
+    expected = nlargest(frame, metric, n, **filters).index.tolist()
+    assert frame.index[index.top(metric, n, **filters)].tolist() == expected
+
+
+@pytest.mark.parametrize("metric, filters", QUERIES)
+def test_count_matches_filtered_rows(frame, metric, filters):
+    index = LeaderboardIndex(frame)
+    expected = nlargest(frame, metric, len(frame), **filters)
+    assert index.count(metric, **filters) == len(expected)
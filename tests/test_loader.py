@@ -0,0 +1,66 @@
+"""Process-wide dataset cache: versioning and locking."""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_players  # noqa: E402
+from premstats import loader  # noqa: E402
+
+
+def write_players(tmp_path, name, rows=50):
+    path = tmp_path / name
+    make_players(rows).to_csv(path, index=False)
+    return str(path)
+
+
+def test_reload_only_when_content_changes(tmp_path):
+    loader.clear_cache()
+    path = write_players(tmp_path, "a.csv")
+    first = loader.load_dataset(path)
+    assert loader.load_dataset(path) is first
+
+    # Touched but identical: same dataset, same version
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 10_000_000))
+    assert loader.load_dataset(path) is first
+
+    make_players(60).to_csv(path, index=False)
+    second = loader.load_dataset(path)
+    assert second is not first and len(second.frame) == 60
+
+
+def test_cold_parse_does_not_block_other_paths(tmp_path, monkeypatch):
+    loader.clear_cache()
+    slow_path = write_players(tmp_path, "slow.csv")
+    warm_path = write_players(tmp_path, "warm.csv")
+    warm = loader.load_dataset(warm_path)
+
+    parse = loader._parse
+    started, release = threading.Event(), threading.Event()
+    parses = []
+
+    def slow_parse(source):
+        parses.append(source)
+        started.set()
+        release.wait(5)
+        return parse(source)
+
+    monkeypatch.setattr(loader, "_parse", slow_parse)
+    threads = [threading.Thread(target=loader.load_dataset, args=(slow_path,)) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    assert started.wait(5)
+
+    # The slow parse holds only its own path's lock
+    start = time.perf_counter()
+    assert loader.load_dataset(warm_path) is warm
+    assert time.perf_counter() - start < 1
+
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    # Sessions waiting on the same path share one parse
+    assert parses == [slow_path]
@@ -0,0 +1,35 @@
+"""Per-position percentile ranks."""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_players  # noqa: E402
+from premstats.percentiles import GOALKEEPER_METRICS, PercentileRanks  # noqa: E402
+
+
+def test_missing_stats_have_no_percentile():
+    frame = make_players(500)
+    keepers = np.flatnonzero(frame["Position"] == "GK")
+    frame.loc[keepers[0], ["Clean_Sheets", "Goals_Against", "Save_Percentage"]] = np.nan
+    frame["Clean_Sheet_%"] = frame["Clean_Sheets"] / frame["Appearances"] * 100
+    ranks = PercentileRanks(frame)
+
+    assert ranks.player(keepers[0], GOALKEEPER_METRICS).isna().all()
+    assert ranks.player(keepers[1], GOALKEEPER_METRICS).notna().all()
+    table = ranks.players(keepers[:2], GOALKEEPER_METRICS)
+    assert table.iloc[0].isna().all() and table.iloc[1].between(0, 100).all()
+
+
+def test_ranks_are_within_position():
+    frame = make_players(500)
+    forwards = np.flatnonzero(frame["Position"] == "FW")
+    frame.loc[forwards[0], "Progressive_Carries"] = 10_000
+    ranks = PercentileRanks(frame)
+    assert ranks.player(forwards[0], ["Progressive_Carries"]).iloc[0] == 100
+    # Defenders are ranked among themselves, so the outlier forward does not squash them
+    defenders = np.flatnonzero(frame["Position"] == "DF")
+    assert ranks.players(defenders, ["Progressive_Carries"]).max().iloc[0] > 99
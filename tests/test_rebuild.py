@@ -0,0 +1,54 @@
+"""Parallel rebuild of league / season partitions from raw sources."""
+
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_kaggle_players  # noqa: E402
+from premstats import partitions, rebuild  # noqa: E402
+
+SOURCES = [("La-Liga", "2023-2024"), ("La-Liga", "2024-2025"), ("Premier-League", "2024-2025")]
+
+
+def write_sources(root):
+    for i, (league, season) in enumerate(SOURCES):
+        directory = root / f"league={league}" / f"season={season}"
+        directory.mkdir(parents=True)
+        make_kaggle_players(300, seed=i).to_csv(directory / "players.csv", index=False)
+    # Stray files at both levels of the layout
+    (root / ".DS_Store").write_text("")
+    (root / "league=La-Liga" / ".DS_Store").write_text("")
+    (root / "league=La-Liga" / "season=notes.txt").write_text("")
+    return root
+
+
+def test_find_sources_skips_stray_files(tmp_path):
+    sources = write_sources(tmp_path / "sources")
+    found = rebuild.find_sources(sources)
+    assert [(league, season) for league, season, _ in found] == SOURCES
+    assert all(path.endswith("players.csv") for _, _, path in found)
+
+
+def test_parallel_rebuild_matches_serial(tmp_path):
+    sources = write_sources(tmp_path / "sources")
+    tasks = [(league, season, path, None) for league, season, path in rebuild.find_sources(sources)]
+
+    finished = []
+    serial = rebuild.rebuild(tasks, processes=1, root=str(tmp_path / "serial"))
+    parallel = rebuild.rebuild(tasks, processes=3, root=str(tmp_path / "parallel"),
+                               on_done=lambda league, season, result: finished.append((league, season)))
+
+    assert sorted(finished) == SOURCES
+    for league, season in SOURCES:
+        assert serial[(league, season)]["entry"] == parallel[(league, season)]["entry"]
+        pd.testing.assert_frame_equal(
+            pd.read_csv(partitions.partition_path(league, season, str(tmp_path / "serial"))),
+            pd.read_csv(partitions.partition_path(league, season, str(tmp_path / "parallel"))),
+        )
+
+    manifests = [partitions.read_manifest(str(tmp_path / name))["partitions"] for name in ("serial", "parallel")]
+    assert [(p["league"], p["season"], p["rows"], p["versions"]) for p in manifests[0]] == \
+           [(p["league"], p["season"], p["rows"], p["versions"]) for p in manifests[1]]
@@ -0,0 +1,44 @@
+"""Name normalization and the player search index."""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from premstats.search import SearchIndex, normalize, normalize_all  # noqa: E402
+
+NAMES = [
+    "Erling Haaland", "Cole Palmer", "Virgil van Dijk", "Alexander Isak", "Mohamed Salah",
+    "Mohamed Elneny", "Mohammed Kudus", "Ahmed Ahmedov", "Noah Okafor", "Bukayo Saka",
+    "Martin Ødegaard", "Jhon Durán", "N'Golo Kanté", "Son Heung-min", "Łukasz Fabiański",
+]
+
+
+def test_normalize_all_matches_normalize():
+    values = NAMES + ["  Son   Heung-min ", "ABC_def", "a--b", "", "ß", "Жоао", np.nan, "Martin Ødegaard"]
+    series = pd.Series(values, dtype=object)
+    assert normalize_all(series).tolist() == [normalize(value) for value in values]
+    assert normalize_all(series.iloc[:0]).tolist() == []
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("odegaard", ["Martin Ødegaard"]),
+    ("haalnd", ["Erling Haaland"]),
+    ("palmar", ["Cole Palmer"]),
+    ("van djik", ["Virgil van Dijk"]),
+    ("isac", ["Alexander Isak"]),
+    ("mohamed sal", ["Mohamed Salah"]),
+    ("ah", ["Ahmed Ahmedov", "Mohamed Salah", "Noah Okafor"]),
+])
+def test_search(query, expected):
+    index = SearchIndex(NAMES)
+    assert [NAMES[row] for row in index.search(query)] == expected
+
+
+def test_filter_rows_keeps_only_given_rows():
+    index = SearchIndex(NAMES)
+    assert index.filter_rows(np.array([5, 6]), "mohamed").tolist() == [5, 6]
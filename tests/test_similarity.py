@@ -0,0 +1,43 @@
+"""SimilarityIndex nearest neighbours against a brute-force search."""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_players  # noqa: E402
+from premstats.loader import enrich  # noqa: E402
+from premstats.similarity import SimilarityIndex  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def index():
+    return SimilarityIndex(enrich(make_players(3_000)))
+
+
+def brute_force(index, row, k, candidates):
+    # float64 distances to every candidate, fully sorted
+    diff = index.matrix[candidates].astype("float64") - index.matrix[row].astype("float64")
+    dist = np.sqrt((diff ** 2).sum(axis=1))
+    dist[candidates == row] = np.inf
+    return np.sort(dist)[:k]
+
+
+@pytest.mark.parametrize("position, min_minutes", [("MF", 900), (None, 0), ("GK", 450)])
+def test_similar_matches_brute_force(index, position, min_minutes):
+    candidates = index.candidates(position, min_minutes)
+    for row in np.random.default_rng(1).choice(len(index.matrix), 20, replace=False):
+        rows, dist = index.similar(row, k=10, position=position, min_minutes=min_minutes)
+        assert row not in rows
+        assert np.isin(rows, candidates).all()
+        assert np.allclose(dist, brute_force(index, row, 10, candidates), atol=1e-3), row
+
+
+def test_batched_neighbours_match_brute_force(index):
+    sample = np.arange(0, 300, 7)
+    candidates = index.candidates("DF", 450)
+    for row, (rows, dist) in zip(sample, index.neighbours(sample, k=5, position="DF", min_minutes=450)):
+        assert np.allclose(dist, brute_force(index, row, 5, candidates), atol=1e-3), row